@@ -6,64 +6,363 @@ AutoClicker for Ubuntu - Finds and clicks on user-defined images or text
 import sys
 import time
 import argparse
-import cv2
-import numpy as np
-import pytesseract
-from PIL import Image
+import importlib.util
 import os
+import queue
+import re
 import subprocess
 import tempfile
 import threading
-import keyboard
-import pygame
-from pynput import keyboard as pynput_keyboard
 
-# Try to import pyautogui and handle display connection errors
+from autoclicker_events import EventLog, CallbackSink, StreamSink, JsonLinesSink, DEBUG, INFO, WARNING, ERROR
+
+# Keep pygame quiet when sound feedback first loads it
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+def lazy_import(name):
+    """Import a module lazily: it is only loaded on first attribute access
+
+    The returned module is registered in sys.modules, so a later regular import
+    (or a test patch) gets the same object. Raises ImportError if it is not installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'")
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+# Heavy dependencies are deferred until the mode that needs them actually runs:
+# OpenCV for image matching, Tesseract for text/mixed, pygame only with sound feedback
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+pygame = lazy_import('pygame')
+autoclicker_recording = lazy_import('autoclicker_recording')
+autoclicker_input = lazy_import('autoclicker_input')
+autoclicker_config = lazy_import('autoclicker_config')
+autoclicker_ocr = lazy_import('autoclicker_ocr')
+autoclicker_text = lazy_import('autoclicker_text')
+autoclicker_patterns = lazy_import('autoclicker_patterns')
+autoclicker_timing = lazy_import('autoclicker_timing')
+autoclicker_macro = lazy_import('autoclicker_macro')
+autoclicker_workflow = lazy_import('autoclicker_workflow')
+autoclicker_schedule = lazy_import('autoclicker_schedule')
+autoclicker_damage = lazy_import('autoclicker_damage')
+
+# Clickers sharing one process (daemon jobs) take turns driving the mouse, so a
+# move and the click that follows it, or a whole click pattern, are never split
+# by another clicker's input
+INPUT_LOCK = threading.RLock()
+
+# PyAutoGUI connects to the display on import, so it is loaded by load_pyautogui()
+PYAUTOGUI_AVAILABLE = None  # Unknown until load_pyautogui() runs
 try:
-    import pyautogui
-    PYAUTOGUI_AVAILABLE = True
-except Exception as e:
-    print(f"PyAutoGUI Error: {e}")
-    PYAUTOGUI_AVAILABLE = False
+    pyautogui = lazy_import('pyautogui')
+except ImportError:
     pyautogui = None
 
-    # Try to fix common X11 authentication issues
-    if "Authorization required" in str(e):
-        print("\n🔧 Attempting to fix X11 authentication...")
-        print("This is a common issue. Trying solutions:")
+def load_pyautogui():
+    """Import PyAutoGUI on first use and handle display connection errors"""
+    global pyautogui, PYAUTOGUI_AVAILABLE
+
+    if PYAUTOGUI_AVAILABLE is not None:
+        return PYAUTOGUI_AVAILABLE
+
+    try:
+        if pyautogui is None:
+            raise ImportError("No module named 'pyautogui'")
+        pyautogui.FAILSAFE  # Accessing an attribute runs the deferred import
+        PYAUTOGUI_AVAILABLE = True
+    except Exception as e:
+        # A failed deferred import leaves a half-initialized module behind
+        sys.modules.pop('pyautogui', None)
+        print(f"PyAutoGUI Error: {e}")
+        PYAUTOGUI_AVAILABLE = False
+        pyautogui = None
+
+        # Try to fix common X11 authentication issues
+        if "Authorization required" in str(e):
+            print("\n🔧 Attempting to fix X11 authentication...")
+            print("This is a common issue. Trying solutions:")
+
+            # Try to disable X11 authentication for local connections
+            try:
+                # Check if we're running locally
+                display = os.environ.get('DISPLAY', '')
+                if display.startswith(':'):
+                    print("1. Trying to allow local X11 connections...")
+                    subprocess.run(['xhost', '+local:'], check=False, capture_output=True)
+
+                    # Try importing again
+                    try:
+                        import pyautogui
+                        PYAUTOGUI_AVAILABLE = True
+                        print("✅ Fixed! PyAutoGUI is now available.")
+                    except:
+                        print("❌ Fix attempt failed.")
+            except:
+                print("❌ Could not apply X11 authentication fix.")
+
+            if not PYAUTOGUI_AVAILABLE:
+                print("\n📋 Manual solutions:")
+                print("• Run: xhost +local:")
+                print("• Or: export XAUTHORITY=~/.Xauthority")
+                print("• Or use: ssh -X user@localhost")
+                print("• Or set: export DISPLAY=:0.0")
+
+    return PYAUTOGUI_AVAILABLE
 
-        # Try to disable X11 authentication for local connections
-        import os
-        import subprocess
+class SoundFeedback:
+    """Low-priority audio worker that plays pre-rendered feedback sounds"""
 
+    # Sound bank: name -> (frequency in Hz, duration in seconds)
+    SOUNDS = {
+        'success': (800, 0.1),
+        'miss': (400, 0.1),
+        'safety': (250, 0.25),
+    }
+    PLAY_ORDER = ['safety', 'miss', 'success']  # Most important first when a burst is merged
+    COALESCE_WINDOW = 0.15  # Requests arriving within this time after a sound are merged
+    NICE_INCREMENT = 10  # Scheduling priority reduction for the worker thread (Linux)
+
+    def __init__(self, logger=None):
+        self.logger = logger
+        self.sounds = {}
+        self.requests = queue.SimpleQueue()
+        self.thread = None
+
+    def start(self):
+        """Start the worker thread, which initializes the mixer and renders the sound bank"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="sound-feedback", daemon=True)
+            self.thread.start()
+
+    def play(self, name='success'):
+        """Request a sound without blocking the caller"""
+        self.requests.put(name)
+
+    def close(self, timeout=1.0):
+        """Play any pending sounds and stop the worker"""
+        if self.thread is not None:
+            self.requests.put(None)
+            self.thread.join(timeout)
+            self.thread = None
+
+    def load(self):
+        """Initialize the mixer once and pre-render every sound in the bank"""
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=44100, size=-16, channels=1)
+        sample_rate, _, channels = pygame.mixer.get_init() or (44100, -16, 1)
+
+        for name, (frequency, duration) in self.SOUNDS.items():
+            t = np.arange(int(sample_rate * duration)) / sample_rate
+            wave = (np.sin(frequency * 2 * np.pi * t) * 32767).astype(np.int16)
+            if channels > 1:
+                wave = np.ascontiguousarray(np.repeat(wave[:, np.newaxis], channels, axis=1))
+            self.sounds[name] = pygame.sndarray.make_sound(wave)
+
+    def _lower_priority(self):
+        # Linux applies priorities per thread, so only the audio worker is affected
+        if sys.platform.startswith('linux'):
+            try:
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self.NICE_INCREMENT)
+            except (AttributeError, OSError):
+                pass
+
+    def _run(self):
+        self._lower_priority()
         try:
-            # Check if we're running locally
-            display = os.environ.get('DISPLAY', '')
-            if display.startswith(':'):
-                print("1. Trying to allow local X11 connections...")
-                subprocess.run(['xhost', '+local:'], check=False, capture_output=True)
+            self.load()
+        except Exception as e:
+            if self.logger:
+                self.logger(f"Sound feedback error: {e}")
 
-                # Try importing again
+        stopping = False
+        while not stopping:
+            # Drain everything requested meanwhile so a burst plays each sound once
+            names = {self.requests.get()}
+            while True:
                 try:
-                    import pyautogui
-                    PYAUTOGUI_AVAILABLE = True
-                    print("✅ Fixed! PyAutoGUI is now available.")
-                except:
-                    print("❌ Fix attempt failed.")
-        except:
-            print("❌ Could not apply X11 authentication fix.")
-
-        if not PYAUTOGUI_AVAILABLE:
-            print("\n📋 Manual solutions:")
-            print("• Run: xhost +local:")
-            print("• Or: export XAUTHORITY=~/.Xauthority")
-            print("• Or use: ssh -X user@localhost")
-            print("• Or set: export DISPLAY=:0.0")
+                    names.add(self.requests.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = None in names
+
+            for name in self.PLAY_ORDER:
+                if name in names and name in self.sounds:
+                    try:
+                        self.sounds[name].play()
+                    except Exception as e:
+                        if self.logger:
+                            self.logger(f"Sound feedback error: {e}")
+
+            if not stopping:
+                time.sleep(self.COALESCE_WINDOW)
+
+class DebugScreenshotWriter:
+    """Background writer for debug screenshots with a bounded queue, rate limit and disk quota"""
+
+    FILENAME_PREFIX = "debug_screenshot_"
+
+    def __init__(self, directory=None, max_queue=8, drop_policy='newest', compression=1,
+                 min_interval=1.0, disk_quota=100 * 1024 * 1024, logger=None):
+        if drop_policy not in ('newest', 'oldest'):
+            raise ValueError("Drop policy must be 'newest' or 'oldest'")
+        if not (0 <= compression <= 9):
+            raise ValueError("Compression level must be between 0 and 9")
+        if min_interval < 0:
+            raise ValueError("Minimum interval must be non-negative")
+
+        self.directory = directory or os.getcwd()
+        self.drop_policy = drop_policy  # Which screenshot to discard when the queue is full
+        self.compression = compression  # PNG compression level, low values encode fastest
+        self.min_interval = min_interval  # Seconds between screenshots with the same suffix
+        self.disk_quota = disk_quota  # Bytes of debug screenshots allowed in the directory
+        self.logger = logger
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.thread = None
+        self.last_submit = {}  # Filename suffix -> time of last accepted screenshot
+
+        # Counters
+        self.saved = 0
+        self.dropped = 0
+        self.rate_limited = 0
+        self.quota_exceeded = False
+        self.bytes_used = self.existing_usage()
+
+    def existing_usage(self):
+        """Bytes already used by debug screenshots in the output directory"""
+        try:
+            return sum(entry.stat().st_size for entry in os.scandir(self.directory)
+                       if entry.name.startswith(self.FILENAME_PREFIX) and entry.is_file())
+        except OSError:
+            return 0
+
+    def start(self):
+        """Start the writer thread"""
+        if self.thread is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.thread = threading.Thread(target=self._run, name="debug-screenshots", daemon=True)
+            self.thread.start()
+
+    def close(self, timeout=5.0):
+        """Write queued screenshots and stop the writer thread"""
+        if self.thread is not None:
+            try:
+                self.queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self.thread.join(timeout)
+            self.thread = None
+
+    def make_filename(self, filename_suffix):
+        """Build a unique, filesystem-safe screenshot path"""
+        now = time.time()
+        timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now)) + f"_{int(now * 1000) % 1000:03d}"
+        suffix = re.sub(r'[^\w.-]+', '_', filename_suffix)
+        return os.path.join(self.directory, f"{self.FILENAME_PREFIX}{timestamp}_{suffix}.png")
+
+    def submit(self, image, filename_suffix="debug", crop=None):
+        """Queue a screenshot for writing, returning False if it was dropped
+
+        crop is an optional (x, y, width, height) rectangle to save instead of the whole image.
+        """
+        if self.quota_exceeded:
+            self.dropped += 1
+            return False
+
+        now = time.monotonic()
+        last = self.last_submit.get(filename_suffix)
+        if last is not None and now - last < self.min_interval:
+            self.rate_limited += 1
+            return False
+
+        if crop:
+            x, y, w, h = crop
+            x, y = max(int(x), 0), max(int(y), 0)
+            image = image[y:y + int(h), x:x + int(w)].copy()  # Copy so the full frame can be freed
+            if image.size == 0:
+                return False
+
+        item = (self.make_filename(filename_suffix), image)
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            if self.drop_policy == 'newest':
+                self.dropped += 1
+                return False
+            # Make room by discarding the oldest queued screenshot
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(item)
+            except queue.Full:
+                self.dropped += 1
+                return False
+
+        self.last_submit[filename_suffix] = now
+        return True
+
+    def write(self, filename, image):
+        """Encode and write one screenshot, respecting the disk quota"""
+        ok, encoded = cv2.imencode('.png', image, [cv2.IMWRITE_PNG_COMPRESSION, self.compression])
+        if not ok:
+            raise RuntimeError("Could not encode screenshot")
+
+        if self.bytes_used + len(encoded) > self.disk_quota:
+            self.dropped += 1
+            if not self.quota_exceeded:
+                self.quota_exceeded = True
+                if self.logger:
+                    self.logger(f"Debug screenshot quota of {self.disk_quota // (1024 * 1024)} MB reached, "
+                                "no more screenshots will be saved")
+            return
+
+        with open(filename, 'wb') as f:
+            f.write(encoded.tobytes())
+        self.bytes_used += len(encoded)
+        self.saved += 1
+        if self.logger:
+            self.logger(f"Debug screenshot saved: {filename}")
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                self.write(*item)
+            except Exception as e:
+                if self.logger:
+                    self.logger(f"Failed to save debug screenshot: {e}")
 
 class AutoClicker:
+    # Pattern step verification looks only at this region around the step's position:
+    # the template plus a margin on each side, or a fixed box for text
+    VERIFY_MARGIN = 16
+    VERIFY_TEXT_SIZE = (320, 96)
+    MIN_CYCLE_SLEEP = 0.01  # Scheduled runs never poll faster than this, even with deferred targets
+    DAMAGE_TEXT_MARGIN = (96, 16)  # Pixels OCR'd left/right and above/below a damaged area
+
     def __init__(self, confidence=0.8, interval=1.0, region=None, cache_duration=0.5, logger=None,
                  safety_zones=None, max_runtime=None, emergency_stop_keys=None, click_patterns=None,
-                 keyboard_inputs=None, sound_feedback=False, screenshot_debug=False, hotkeys=None):
+                 keyboard_inputs=None, sound_feedback=False, screenshot_debug=False, hotkeys=None,
+                 record_path=None, replay_path=None, replay_speed='recorded', debug_dir=None,
+                 debug_crop='full', debug_min_interval=1.0, debug_quota_mb=100, event_sinks=None,
+                 preview=None, templates=None, ocr_backend='pytesseract', text_regions=False, ocr_cache=False,
+                 text_max_errors=0, ocr_profile=None, ocr_profiles=None, pattern_spin_ms=2.0, pattern_cpu=None,
+                 pattern_fifo_priority=None, target_schedules=None, cycle_budget_ms=None, capture_source=None,
+                 template_cache=None, ocr_engine=None, damage_events=False):
         # Input validation
         if not (0.0 <= confidence <= 1.0):
             raise ValueError("Confidence must be between 0.0 and 1.0")
@@ -77,6 +376,26 @@ class AutoClicker:
             raise ValueError("Region coordinates must be non-negative")
         if max_runtime is not None and max_runtime <= 0:
             raise ValueError("Max runtime must be positive")
+        if replay_speed not in ('recorded', 'max'):
+            raise ValueError("Replay speed must be 'recorded' or 'max'")
+        if debug_crop not in ('full', 'region', 'patch'):
+            raise ValueError("Debug crop must be 'full', 'region' or 'patch'")
+        if debug_quota_mb <= 0:
+            raise ValueError("Debug screenshot quota must be positive")
+        if pattern_spin_ms < 0:
+            raise ValueError("Pattern spin time must be non-negative")
+        if pattern_fifo_priority is not None and not 1 <= pattern_fifo_priority <= 99:
+            raise ValueError("SCHED_FIFO priority must be between 1 and 99")
+        if text_max_errors < 0:
+            raise ValueError("Text max errors must be non-negative")
+        if cycle_budget_ms is not None and cycle_budget_ms <= 0:
+            raise ValueError("Cycle budget must be positive")
+        if damage_events and replay_path:
+            raise ValueError("Damage events need a live display and cannot be used with replay")
+        if damage_events and (target_schedules or cycle_budget_ms is not None):
+            raise ValueError("Damage events cannot be combined with target schedules or a cycle budget")
+        if ocr_backend not in autoclicker_ocr.BACKENDS:
+            raise ValueError(f"OCR backend must be one of: {', '.join(autoclicker_ocr.BACKENDS)}")
 
         self.confidence = confidence
         self.interval = interval
@@ -84,13 +403,33 @@ class AutoClicker:
         self.stop_flag = False  # Flag to signal stopping
         self.pause_flag = False  # Flag to signal pausing
         self.logger = logger  # Logger callback function
+        # Structured events: the logger callback is one sink next to any extra ones (stdout, JSON lines)
+        self.events = EventLog(event_sinks)
+        if logger:
+            self.events.add_sink(CallbackSink(logger))
         # Screenshot caching to reduce flickering
         self.last_screenshot = None
         self.last_screenshot_time = 0
         self.screenshot_cache_duration = cache_duration  # Cache screenshots for specified duration
+        # Optional capture shared with other clickers, called with capture_screen_flicker_free to take a new frame
+        self.capture_source = capture_source
+        # Event-driven runs: wait for X DAMAGE reports instead of sleeping an interval and only search what changed
+        self.damage_events = damage_events
+        self.damage = None  # autoclicker_damage.DamageMonitor, opened on first capture
+        self.damage_version = None  # Monitor frame version of last_screenshot
+        self.damage_clicks = 0  # click_count when the last change was awaited
+        self.search_areas = None  # (x, y, width, height) rectangles to search this cycle; None for the whole screen
 
         # Safety features
-        self.safety_zones = safety_zones or []  # List of (x, y, w, h) tuples to avoid
+        # Safety zones as (x, y, w, h) tuples to avoid, indexed for fast lookups;
+        # a precompiled autoclicker_config.SafetyZoneIndex is used as-is
+        if hasattr(safety_zones, 'contains'):
+            self.safety_zone_index = safety_zones
+            self.safety_zones = list(safety_zones)
+        else:
+            self.safety_zones = safety_zones or []
+            self.safety_zone_index = (autoclicker_config.SafetyZoneIndex(self.safety_zones)
+                                      if self.safety_zones else None)
         self.max_runtime = max_runtime  # Maximum runtime in seconds
         self.start_time = None
         self.emergency_stop_keys = emergency_stop_keys or ['ctrl', 'alt', 'shift']  # Default emergency stop combo
@@ -99,38 +438,116 @@ class AutoClicker:
         self.click_patterns = click_patterns or []  # List of click sequences
         self.keyboard_inputs = keyboard_inputs or []  # List of keyboard inputs to simulate
         self.sound_feedback = sound_feedback  # Enable sound feedback
+        self.sound_player = None  # Started once the checks below have passed
         self.screenshot_debug = screenshot_debug  # Save screenshots for debugging
+        self.debug_crop = debug_crop  # 'full' screen, search 'region' or template-sized 'patch'
+        self.screenshot_writer = None  # Started once the checks below have passed
         self.hotkeys = hotkeys or {'start': 'f6', 'stop': 'f7', 'pause': 'f8'}  # Custom hotkeys
 
+        # OCR engine, created on first use so persistent backends only load when text is searched
+        self.ocr_backend = ocr_backend
+        self.ocr = ocr_engine  # A shared engine is used as-is and left open by finish_run()
+        self.owns_ocr = ocr_engine is None
+        # Only OCR likely text regions, packed into one mosaic per frame
+        self.text_regions = text_regions
+        self.text_region_cache = (None, None)  # (frame, RegionMosaic) for the latest capture
+        # Reuse OCR results for screen tiles whose content hash is unchanged (full-screen OCR only)
+        self.ocr_tiles = autoclicker_ocr.TileOcrCache() if ocr_cache else None
+        self.ocr_pixels = 0  # Pixels sent to OCR outside the tile cache
+        self.ocr_pixels_saved = 0  # Screen pixels left out by text region proposals
+        # Text targets match phrases across OCR words, tolerating up to this many misread characters
+        self.text_max_errors = text_max_errors
+        # Tesseract settings (autoclicker_ocr.OcrProfile) per text target, and for targets without one
+        self.ocr_profile = ocr_profile or autoclicker_ocr.DEFAULT_PROFILE
+        self.ocr_profiles = dict(ocr_profiles) if ocr_profiles else {}
+
+        # Pattern playback: deadlines are slept to within pattern_spin_ms, then spun;
+        # optionally pinned to one CPU and/or run under SCHED_FIFO
+        self.pattern_spin_ns = int(pattern_spin_ms * 1_000_000)
+        self.pattern_cpu = pattern_cpu
+        self.pattern_fifo_priority = pattern_fifo_priority
+        self.pattern_timing = {}  # (pattern index, name) -> autoclicker_timing.TimingHistogram per action
+        self.workflow_state = None  # Name of the active state while a workflow runs
+
+        # Per-target check periods, priorities and cost budgets; with any of them, or a
+        # per-cycle detection budget, image/text/mixed runs use run_scheduled_clicker()
+        self.target_schedules = dict(target_schedules) if target_schedules else {}
+        self.cycle_budget = cycle_budget_ms / 1000 if cycle_budget_ms is not None else None
+        self.scheduler = None
+
+        # Decoded templates by path, optionally pre-decoded by autoclicker_config.ConfigCompiler;
+        # a template_cache dict is shared with other clickers and filled in place
+        self.templates = template_cache if template_cache is not None else {}
+        if templates:
+            self.templates.update(templates)
+
         # Statistics
         self.click_count = 0
         self.success_count = 0
         self.start_time_stats = None
 
-        # Keyboard listener for hotkeys
-        self.keyboard_listener = None
-        self.setup_hotkeys()
-
-        if PYAUTOGUI_AVAILABLE:
-            pyautogui.FAILSAFE = True
-            pyautogui.PAUSE = 0.5
-        else:
-            error_msg = "Error: PyAutoGUI not available. Cannot initialize AutoClicker."
-            if self.logger:
-                self.logger(error_msg)
+        # Live throughput counters, only ever written by the detection thread so
+        # observers such as the GUI dashboard can read them without locking
+        self.cycle_count = 0
+        self.capture_count = 0
+        self.match_latency = {}  # Target -> seconds taken by its most recent detection
+
+        # Optional live preview (e.g. autoclicker_preview.DetectionPreview), fed once per cycle
+        self.preview = preview
+        self.preview_boxes = []  # (kind, (x, y, width, height), label, matched) found this cycle
+
+        # Frame recording and deterministic replay for offline profiling
+        self.recorder = autoclicker_recording.FrameRecorder(record_path) if record_path else None
+        self.replay = (autoclicker_recording.FrameReplay(replay_path, realtime=(replay_speed == 'recorded'))
+                       if replay_path else None)
+
+        if self.replay is None:  # Replay runs offline and never touches the display
+            if load_pyautogui():
+                with INPUT_LOCK:  # Not while another clicker's pattern has PAUSE disabled
+                    pyautogui.FAILSAFE = True
+                    pyautogui.PAUSE = 0.5
             else:
-                print(error_msg)
-            raise RuntimeError("PyAutoGUI not available")
+                error_msg = "Error: PyAutoGUI not available. Cannot initialize AutoClicker."
+                if self.events.enabled(ERROR):
+                    self.events.error('pyautogui_unavailable', error_msg)
+                else:
+                    print(error_msg)
+                raise RuntimeError("PyAutoGUI not available")
+
+        # Worker threads start last so a clicker that fails to initialize leaves none behind
+        if sound_feedback:
+            self.sound_player = SoundFeedback(self.events.logger('sound_feedback', WARNING))
+            self.sound_player.start()
+        if screenshot_debug:
+            self.screenshot_writer = DebugScreenshotWriter(
+                directory=debug_dir,
+                min_interval=debug_min_interval,
+                disk_quota=int(debug_quota_mb * 1024 * 1024),
+                logger=self.events.logger('debug_screenshot')
+            )
+            self.screenshot_writer.start()
+
+        # Hotkeys come from the process-wide keyboard listener until close()
+        self.hotkey_subscription = None
+        self.setup_hotkeys()
 
     def setup_hotkeys(self):
         """Setup custom hotkeys for start/stop/pause"""
+        if self.hotkey_subscription is not None:
+            return
         try:
-            # Use pynput for better cross-platform hotkey support
-            self.keyboard_listener = pynput_keyboard.Listener(on_press=self.on_hotkey_press)
-            self.keyboard_listener.start()
+            # One pynput listener serves every clicker in the process
+            self.hotkey_subscription = autoclicker_input.subscribe(self.on_hotkey_press)
         except Exception as e:
-            if self.logger:
-                self.logger(f"Failed to setup hotkeys: {e}")
+            self.events.warning('hotkey_setup_failed', "Failed to setup hotkeys: {error}", error=e)
+
+    def close(self):
+        """Release the hotkey subscription and close the frame recording; call once the clicker will not run again"""
+        if self.hotkey_subscription is not None:
+            autoclicker_input.unsubscribe(self.hotkey_subscription)
+            self.hotkey_subscription = None
+        if self.recorder:
+            self.recorder.close()
 
     def on_hotkey_press(self, key):
         """Handle hotkey presses"""
@@ -144,8 +561,7 @@ class AutoClicker:
             elif key_str == self.hotkeys.get('pause', 'f8'):
                 self.toggle_pause()
         except Exception as e:
-            if self.logger:
-                self.logger(f"Hotkey error: {e}")
+            self.events.warning('hotkey_error', "Hotkey error: {error}", error=e)
 
     def start_autoclicker(self):
         """Start the autoclicker (for hotkey use)"""
@@ -155,60 +571,36 @@ class AutoClicker:
     def toggle_pause(self):
         """Toggle pause/resume functionality"""
         self.pause_flag = not self.pause_flag
-        if self.logger:
-            if self.pause_flag:
-                self.logger("Autoclicker paused")
-            else:
-                self.logger("Autoclicker resumed")
+        if self.pause_flag:
+            self.events.info('paused', "Autoclicker paused")
+        else:
+            self.events.info('resumed', "Autoclicker resumed")
 
     def stop(self):
         """Signal the autoclicker to stop"""
         self.stop_flag = True
 
-    def play_sound_feedback(self):
-        """Play sound feedback for successful clicks"""
-        if self.sound_feedback:
-            try:
-                # Initialize pygame mixer if not already initialized
-                if not pygame.mixer.get_init():
-                    pygame.mixer.init()
-
-                # Generate a simple beep sound using pygame
-                sample_rate = 44100
-                duration = 0.1  # 100ms beep
-                frequency = 800  # 800Hz beep
-
-                # Generate sine wave
-                t = np.linspace(0, duration, int(sample_rate * duration), False)
-                wave = np.sin(frequency * 2 * np.pi * t)
-
-                # Convert to 16-bit signed integers
-                wave = (wave * 32767).astype(np.int16)
-
-                # Create pygame sound object
-                sound = pygame.sndarray.make_sound(wave)
-
-                # Play the sound (non-blocking)
-                sound.play()
-            except Exception as e:
-                if self.logger:
-                    self.logger(f"Sound feedback error: {e}")
-
-    def save_debug_screenshot(self, screenshot, filename_suffix="debug"):
-        """Save screenshot for debugging failed detections"""
-        if self.screenshot_debug:
-            try:
-                timestamp = time.strftime("%Y%m%d_%H%M%S")
-                filename = f"debug_screenshot_{timestamp}_{filename_suffix}.png"
-                cv2.imwrite(filename, screenshot)
-                if self.logger:
-                    self.logger(f"Debug screenshot saved: {filename}")
-            except Exception as e:
-                if self.logger:
-                    self.logger(f"Failed to save debug screenshot: {e}")
+    def play_sound_feedback(self, sound='success'):
+        """Queue sound feedback ('success', 'miss' or 'safety') on the audio worker"""
+        if self.sound_feedback and self.sound_player:
+            self.sound_player.play(sound)
+
+    def save_debug_screenshot(self, screenshot, filename_suffix="debug", patch=None):
+        """Queue a screenshot for debugging failed detections on the background writer
+
+        patch is the (x, y, width, height) of the best candidate match, saved instead
+        of the whole screen when debug_crop is 'patch'.
+        """
+        if self.screenshot_debug and self.screenshot_writer:
+            crop = None
+            if self.debug_crop == 'patch' and patch:
+                crop = patch
+            elif self.debug_crop != 'full' and self.region:
+                crop = self.region
+            self.screenshot_writer.submit(screenshot, filename_suffix, crop=crop)
 
     def capture_screen_flicker_free(self):
-        """Capture screen using flicker-free methods (scrot/ImageMagick)"""
+        """Capture the screen of $DISPLAY using flicker-free methods (scrot/ImageMagick)"""
         try:
             # Try scrot first (usually flicker-free)
             with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
@@ -216,7 +608,7 @@ class AutoClicker:
 
             # Try scrot with different options
             result = subprocess.run(['scrot', '--quality', '100', tmp_path],
-                                  capture_output=True, timeout=3, env=dict(os.environ, DISPLAY=':0'))
+                                  capture_output=True, timeout=3)
 
             if result.returncode == 0 and os.path.exists(tmp_path) and os.path.getsize(tmp_path) > 0:
                 time.sleep(0.1)  # Small delay to ensure file is fully written
@@ -226,8 +618,8 @@ class AutoClicker:
                     return screenshot
 
         except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError, Exception) as e:
-            if self.logger:
-                self.logger(f"Scrot failed: {e}")
+            if self.events.debug_enabled:
+                self.events.debug('capture_failed', "Scrot failed: {error}", tool='scrot', error=e)
             pass
 
         try:
@@ -236,7 +628,7 @@ class AutoClicker:
                 tmp_path = tmp_file.name
 
             result = subprocess.run(['import', '-window', 'root', '-quality', '100', tmp_path],
-                                  capture_output=True, timeout=3, env=dict(os.environ, DISPLAY=':0'))
+                                  capture_output=True, timeout=3)
 
             if result.returncode == 0 and os.path.exists(tmp_path) and os.path.getsize(tmp_path) > 0:
                 time.sleep(0.1)  # Small delay to ensure file is fully written
@@ -246,36 +638,148 @@ class AutoClicker:
                     return screenshot
 
         except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError, Exception) as e:
-            if self.logger:
-                self.logger(f"ImageMagick import failed: {e}")
+            if self.events.debug_enabled:
+                self.events.debug('capture_failed', "ImageMagick import failed: {error}", tool='import', error=e)
             pass
 
         # Final fallback to PyAutoGUI
-        if self.logger:
-            self.logger("Warning: Using PyAutoGUI screenshot (may cause flicker)")
+        self.events.warning('capture_fallback', "Warning: Using PyAutoGUI screenshot (may cause flicker)")
         screenshot = pyautogui.screenshot()
         return cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
 
+    def capture_replay_frame(self):
+        """Capture the next frame from the replay recording"""
+        screenshot = self.replay.next_frame()
+
+        if screenshot is None:
+            # Recording exhausted: stop the run and keep serving the final frame
+            if not self.stop_flag:
+                self.events.info('replay_finished', "Replay finished after {frames} frame(s)", frames=len(self.replay))
+            self.stop_flag = True
+            if self.last_screenshot is None:
+                raise RuntimeError(f"Replay recording contains no frames: {self.replay.path}")
+            return self.last_screenshot.copy()
+
+        self.last_screenshot = screenshot
+        self.capture_count += 1
+        return screenshot.copy()
+
     def capture_screen(self):
         """Capture the current screen with caching to reduce flickering"""
+        # Replay serves exactly one recorded capture per call, independent of wall-clock caching
+        if self.replay:
+            return self.capture_replay_frame()
+
+        if self.damage_events:
+            return self.capture_damaged_frame()
+
         current_time = time.time()
 
         # Use cached screenshot if it's recent enough
         if (self.last_screenshot is not None and
             current_time - self.last_screenshot_time < self.screenshot_cache_duration):
+            if self.recorder:
+                self.recorder.record_repeat()
             return self.last_screenshot.copy()
 
         # Take new screenshot using flicker-free method
-        self.last_screenshot = self.capture_screen_flicker_free()
+        if self.capture_source:
+            self.last_screenshot = self.capture_source(self.capture_screen_flicker_free)
+        else:
+            self.last_screenshot = self.capture_screen_flicker_free()
         self.last_screenshot_time = current_time
+        self.capture_count += 1
+
+        if self.recorder:
+            self.recorder.record_frame(self.last_screenshot)
 
         return self.last_screenshot.copy()
 
-    def find_image(self, template_path):
-        """Find image template on screen using OpenCV template matching"""
+    def get_damage_monitor(self):
+        """Return the X DAMAGE monitor, opening it on first use"""
+        if self.damage is None:
+            self.damage = autoclicker_damage.DamageMonitor(region=self.region)
+            self.events.info('damage_events', "Waiting for screen damage events instead of polling every {interval}s",
+                             interval=self.interval, region=self.region)
+        return self.damage
+
+    def capture_damaged_frame(self):
+        """Return the screen as kept current by damage events, taking a new copy only after it changed"""
+        monitor = self.get_damage_monitor()
+        if self.last_screenshot is not None and self.damage_version == monitor.version:
+            if self.recorder:
+                self.recorder.record_repeat()
+            return self.last_screenshot.copy()
+
+        self.last_screenshot = monitor.frame.copy()
+        self.damage_version = monitor.version
+        self.capture_count += 1
+        if self.recorder:
+            self.recorder.record_frame(self.last_screenshot)
+        return self.last_screenshot.copy()
+
+    def set_search_areas(self, areas):
+        """Limit the next detections to these screen rectangles; None searches the whole screen"""
+        self.search_areas = areas
+        self.text_region_cache = (None, None)
+
+    def wait_for_next_cycle(self, until=None):
+        """Sleep one interval or, with damage events, block until the screen changes
+
+        The damaged rectangles become the search areas of the next cycle; after
+        a click the whole screen is searched again, since a target found but not
+        clicked would otherwise not be looked at until its area changed. Returns
+        early on stop, pause or max runtime, and at until (a time.monotonic()
+        deadline) with nothing to search.
+        """
+        if not self.damage_events:
+            time.sleep(self.interval)
+            return
+
+        monitor = self.get_damage_monitor()
+        clicked = self.click_count != self.damage_clicks
+        self.damage_clicks = self.click_count
+        while not self.stop_flag and not self.pause_flag:
+            timeout = self.interval if until is None else min(self.interval, until - time.monotonic())
+            changed = monitor.wait(max(0, timeout))
+            if changed or clicked:
+                self.set_search_areas(None if clicked else changed)
+                return
+            if self.max_runtime and self.start_time and time.time() - self.start_time >= self.max_runtime:
+                break
+            if until is not None and time.monotonic() >= until:
+                break
+        self.set_search_areas([])
+
+    def match_search_areas(self, screen, template):
+        """Return the best (score, top-left) template match within the search areas, (-1.0, (0, 0)) if none fits"""
+        template_height, template_width = template.shape[:2]
+        bounds = (0, 0, screen.shape[1], screen.shape[0])
+        best = (-1.0, (0, 0))
+        for area in self.search_areas:
+            # A match overlapping the change can start up to a template size before it
+            roi = autoclicker_damage.expand_rect(area, template_width - 1, template_height - 1, bounds)
+            if roi is None or roi[2] < template_width or roi[3] < template_height:
+                continue
+            x, y, width, height = roi
+            result = cv2.matchTemplate(screen[y:y + height, x:x + width], template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            if max_val > best[0]:
+                best = (max_val, (x + max_loc[0], y + max_loc[1]))
+        return best
+
+    def record_detection(self, kind, target, position, **fields):
+        """Record a detection result when frame recording is enabled"""
+        if self.recorder:
+            try:
+                self.recorder.record_detection(kind, target, position, **fields)
+            except Exception as e:
+                self.events.warning('record_failed', "Failed to record detection: {error}", error=e)
+
+    def get_template(self, template_path):
+        """Return a decoded template image, loading it on first use; None (logged) if it cannot be used"""
         if not os.path.exists(template_path):
-            if self.logger:
-                self.logger(f"Template image not found: {template_path}")
+            self.events.warning('template_missing', "Template image not found: {path}", path=template_path)
             return None
 
         # Check supported image formats
@@ -283,50 +787,63 @@ class AutoClicker:
         file_ext = os.path.splitext(template_path)[1].lower()
 
         if file_ext not in supported_extensions:
-            if self.logger:
-                self.logger(f"Unsupported image format: {file_ext}. Supported: {', '.join(supported_extensions)}")
+            self.events.warning('template_unsupported', "Unsupported image format: {extension}. Supported: {supported}",
+                                extension=file_ext, supported=', '.join(supported_extensions))
             return None
 
-        screen = self.capture_screen()
-
-        # Try different flags for different image formats
-        template = None
-        load_flags = [cv2.IMREAD_COLOR, cv2.IMREAD_GRAYSCALE, cv2.IMREAD_UNCHANGED]
-
-        for flag in load_flags:
-            template = cv2.imread(template_path, flag)
-            if template is not None:
-                # Convert to 3-channel color image if necessary
-                if len(template.shape) == 2:  # Grayscale
-                    template = cv2.cvtColor(template, cv2.COLOR_GRAY2BGR)
-                elif len(template.shape) == 3 and template.shape[2] == 4:  # RGBA
-                    template = cv2.cvtColor(template, cv2.COLOR_BGRA2BGR)
-                break
+        # Decode each template once per run; no need to capture if it cannot be loaded
+        template = self.templates.get(template_path)
+        if template is None:
+            template = autoclicker_config.load_template(template_path)
+            if template is None:
+                self.events.warning('template_unreadable', "Could not load template image: {path}", path=template_path)
+                return None
+            self.templates[template_path] = template
+        return template
 
+    def find_image(self, template_path):
+        """Find image template on screen using OpenCV template matching"""
+        template = self.get_template(template_path)
         if template is None:
-            if self.logger:
-                self.logger(f"Could not load template image: {template_path}")
             return None
 
+        screen = self.capture_screen()
+
         # Perform template matching
-        result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        if self.search_areas is not None:
+            max_val, max_loc = self.match_search_areas(screen, template)
+        else:
+            result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+
+        if self.preview is not None:
+            template_height, template_width = template.shape[:2]
+            self.preview_boxes.append(('image', (max_loc[0], max_loc[1], template_width, template_height),
+                                       f"{os.path.basename(template_path)} {max_val:.2f}", max_val >= self.confidence))
 
         if max_val >= self.confidence:
             # Get center of the matched region
             template_height, template_width = template.shape[:2]
             center_x = max_loc[0] + template_width // 2
             center_y = max_loc[1] + template_height // 2
+            self.record_detection('image', template_path, (center_x, center_y), score=float(max_val))
             return (center_x, center_y)
 
+        self.record_detection('image', template_path, None, score=float(max_val))
+
         # Save debug screenshot if enabled
         if self.screenshot_debug:
-            self.save_debug_screenshot(screen, f"failed_match_{os.path.basename(template_path)}")
+            template_height, template_width = template.shape[:2]
+            self.save_debug_screenshot(screen, f"failed_match_{os.path.basename(template_path)}",
+                                       patch=(max_loc[0], max_loc[1], template_width, template_height))
 
         return None
 
-    def preprocess_image_for_ocr(self, image):
-        """Apply preprocessing to improve OCR accuracy"""
+    def preprocess_image_for_ocr(self, image, methods=None):
+        """Apply preprocessing to improve OCR accuracy, computing only the named methods if given"""
+        def wanted(name):
+            return methods is None or name in methods
+
         # Convert to grayscale
         if len(image.shape) == 3:
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
@@ -337,93 +854,174 @@ class AutoClicker:
         preprocessed_images = []
 
         # Original grayscale
-        preprocessed_images.append(('original', gray))
+        if wanted('original'):
+            preprocessed_images.append(('original', gray))
 
         # Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-        preprocessed_images.append(('blurred', blurred))
+        if wanted('blurred'):
+            blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+            preprocessed_images.append(('blurred', blurred))
 
         # Thresholding - Otsu's method
-        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        preprocessed_images.append(('threshold', thresh))
+        if wanted('threshold') or wanted('morphology'):
+            _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            if wanted('threshold'):
+                preprocessed_images.append(('threshold', thresh))
 
         # Adaptive thresholding
-        adaptive_thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                               cv2.THRESH_BINARY, 11, 2)
-        preprocessed_images.append(('adaptive_threshold', adaptive_thresh))
+        if wanted('adaptive_threshold'):
+            adaptive_thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                                   cv2.THRESH_BINARY, 11, 2)
+            preprocessed_images.append(('adaptive_threshold', adaptive_thresh))
 
         # Morphological operations to clean up text
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-        morphed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-        preprocessed_images.append(('morphology', morphed))
+        if wanted('morphology'):
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+            morphed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+            preprocessed_images.append(('morphology', morphed))
 
         # Contrast enhancement
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        enhanced = clahe.apply(gray)
-        preprocessed_images.append(('enhanced', enhanced))
+        if wanted('enhanced'):
+            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+            enhanced = clahe.apply(gray)
+            preprocessed_images.append(('enhanced', enhanced))
 
         # Bilateral filter for noise reduction while keeping edges
-        bilateral = cv2.bilateralFilter(gray, 9, 75, 75)
-        preprocessed_images.append(('bilateral', bilateral))
+        if wanted('bilateral'):
+            bilateral = cv2.bilateralFilter(gray, 9, 75, 75)
+            preprocessed_images.append(('bilateral', bilateral))
 
         return preprocessed_images
 
+    def get_ocr(self):
+        """Return the OCR backend, loading it on first use"""
+        if self.ocr is None:
+            self.ocr = autoclicker_ocr.create_backend(self.ocr_backend)
+            if self.ocr.name != self.ocr_backend:
+                self.events.info('ocr_backend', "Using {backend} OCR backend", backend=self.ocr.name)
+        return self.ocr
+
+    def text_search_image(self, screen):
+        """Return the image to OCR and, with text region proposals, the mosaic that maps it back to the screen"""
+        if not self.text_regions and self.search_areas is None:
+            return screen, None
+
+        # Regions are computed once per captured frame and shared by all text targets
+        frame, mosaic = self.text_region_cache
+        if frame is None or frame is not self.last_screenshot:
+            if self.search_areas is not None:
+                # Changed areas, grown to take in the rest of the words and lines they touch
+                bounds = (0, 0, screen.shape[1], screen.shape[0])
+                margin_x, margin_y = self.DAMAGE_TEXT_MARGIN
+                boxes = autoclicker_damage.merge_rects(
+                    [box for box in (autoclicker_damage.expand_rect(area, margin_x, margin_y, bounds)
+                                     for area in self.search_areas) if box])
+            else:
+                boxes = autoclicker_ocr.propose_text_regions(screen)
+            mosaic = autoclicker_ocr.RegionMosaic(screen, boxes)
+            self.text_region_cache = (self.last_screenshot, mosaic)
+            if self.events.debug_enabled:
+                self.events.debug('text_regions', "{count} text region(s), {percent:.1f}% of the screen sent to OCR",
+                                  count=len(mosaic.placements),
+                                  percent=mosaic.pixels / (screen.shape[0] * screen.shape[1]) * 100)
+        return mosaic.image, mosaic
+
+    def run_ocr(self, image, mosaic=None, profile=None):
+        """Run OCR on an image with an OCR profile, mapping word boxes back to screen coordinates"""
+        profile = profile or self.ocr_profile
+        scale = profile.scale
+        if scale != 1:
+            # Upscaling helps Tesseract with small fonts; boxes are scaled back afterwards
+            image = cv2.resize(image, None, fx=scale, fy=scale,
+                               interpolation=cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA)
+
+        if mosaic is not None:
+            self.ocr_pixels += image.shape[0] * image.shape[1]
+            self.ocr_pixels_saved += max(0, mosaic.source_pixels - mosaic.pixels)
+            data = self.get_ocr().image_to_data(image, profile)
+        elif self.ocr_tiles is not None:
+            data = self.ocr_tiles.image_to_data(self.get_ocr(), image, profile)
+        else:
+            self.ocr_pixels += image.shape[0] * image.shape[1]
+            data = self.get_ocr().image_to_data(image, profile)
+
+        if scale != 1:
+            data = autoclicker_ocr.scale_boxes(data, 1 / scale)
+        return mosaic.to_screen(data) if mosaic is not None else data
+
     def find_text(self, target_text, use_preprocessing=True):
         """Find text on screen using OCR with optional preprocessing"""
         screen = self.capture_screen()
+        ocr_image, mosaic = self.text_search_image(screen)
+        profile = self.ocr_profiles.get(target_text, self.ocr_profile)
+
+        if mosaic is not None and not mosaic.placements:
+            # Nothing on screen looks like text
+            self.record_detection('text', target_text, None)
+            return None
 
         if use_preprocessing:
             # Try different preprocessing methods
-            preprocessed_images = self.preprocess_image_for_ocr(screen)
+            preprocessed_images = self.preprocess_image_for_ocr(ocr_image, profile.preprocess)
 
             for method_name, processed_img in preprocessed_images:
                 try:
-                    # Use pytesseract to get text data with bounding boxes
-                    data = pytesseract.image_to_data(processed_img, output_type=pytesseract.Output.DICT)
-
-                    for i, text in enumerate(data['text']):
-                        if target_text.lower() in text.lower():
-                            # Get bounding box
-                            x = data['left'][i]
-                            y = data['top'][i]
-                            w = data['width'][i]
-                            h = data['height'][i]
-
-                            # Calculate center
-                            center_x = x + w // 2
-                            center_y = y + h // 2
-
-                            if self.logger:
-                                self.logger(f"Found text '{target_text}' using {method_name} preprocessing at {center_x}, {center_y}")
-                            return (center_x, center_y)
+                    # Get text data with bounding boxes
+                    data = self.run_ocr(processed_img, mosaic, profile)
+                    if self.preview is not None and method_name == 'original':
+                        self.add_ocr_preview_boxes(data)
+
+                    match = autoclicker_text.find_phrase(data, target_text, self.text_max_errors)
+                    if match:
+                        # Get bounding box of the words covering the match
+                        x, y, w, h, distance = match
+
+                        # Calculate center
+                        center_x = x + w // 2
+                        center_y = y + h // 2
+
+                        if self.preview is not None:
+                            self.preview_boxes.append(('text', (x, y, w, h), target_text, True))
+
+                        if self.events.debug_enabled:
+                            self.events.debug('ocr_match', "Found text '{target}' using {method} preprocessing at {x}, {y}",
+                                              target=target_text, method=method_name, x=center_x, y=center_y,
+                                              distance=distance)
+                        self.record_detection('text', target_text, (center_x, center_y), method=method_name)
+                        return (center_x, center_y)
                 except Exception as e:
-                    if self.logger:
-                        self.logger(f"OCR preprocessing method '{method_name}' failed: {e}")
+                    if self.events.debug_enabled:
+                        self.events.debug('ocr_failed', "OCR preprocessing method '{method}' failed: {error}",
+                                          method=method_name, error=e)
                     continue
 
             # If no preprocessing method worked, fall back to basic method
-            if self.logger:
-                self.logger("All OCR preprocessing methods failed, using basic OCR")
+            if self.events.debug_enabled:
+                self.events.debug('ocr_fallback', "All OCR preprocessing methods failed, using basic OCR", target=target_text)
 
         # Basic OCR without preprocessing
-        gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(ocr_image, cv2.COLOR_BGR2GRAY)
 
-        # Use pytesseract to get text data with bounding boxes
-        data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
+        # Get text data with bounding boxes
+        data = self.run_ocr(gray, mosaic, profile)
+        if self.preview is not None and not use_preprocessing:
+            self.add_ocr_preview_boxes(data)
 
-        for i, text in enumerate(data['text']):
-            if target_text.lower() in text.lower():
-                # Get bounding box
-                x = data['left'][i]
-                y = data['top'][i]
-                w = data['width'][i]
-                h = data['height'][i]
+        match = autoclicker_text.find_phrase(data, target_text, self.text_max_errors)
+        if match:
+            # Get bounding box of the words covering the match
+            x, y, w, h, _ = match
+
+            # Calculate center
+            center_x = x + w // 2
+            center_y = y + h // 2
 
-                # Calculate center
-                center_x = x + w // 2
-                center_y = y + h // 2
+            if self.preview is not None:
+                self.preview_boxes.append(('text', (x, y, w, h), target_text, True))
+            self.record_detection('text', target_text, (center_x, center_y), method='basic')
+            return (center_x, center_y)
 
-                return (center_x, center_y)
+        self.record_detection('text', target_text, None)
 
         # Save debug screenshot if enabled
         if self.screenshot_debug:
@@ -431,64 +1029,224 @@ class AutoClicker:
 
         return None
 
+    def add_ocr_preview_boxes(self, data):
+        """Add the non-empty words of an image_to_data result to the preview boxes"""
+        for i, text in enumerate(data['text']):
+            if text.strip():
+                self.preview_boxes.append(('ocr', (data['left'][i], data['top'][i], data['width'][i], data['height'][i]),
+                                           text, False))
+
+    def publish_preview(self):
+        """Hand the latest frame and this cycle's boxes to the live preview, if any"""
+        preview = self.preview
+        if preview is not None and self.last_screenshot is not None:
+            # last_screenshot is replaced, never modified, on each capture so no copy is needed
+            preview.publish(self.last_screenshot, self.preview_boxes)
+        self.preview_boxes = []
+
     def is_in_safety_zone(self, position):
         """Check if position is within any safety zone"""
-        if not position or not self.safety_zones:
+        if not position or not self.safety_zone_index:
             return False
 
         x, y = position
-        for zone in self.safety_zones:
-            zx, zy, zw, zh = zone
-            if zx <= x <= zx + zw and zy <= y <= zy + zh:
-                return True
-        return False
+        return self.safety_zone_index.contains(x, y)
 
     def check_time_limit(self):
         """Check if max runtime has been exceeded"""
         if self.max_runtime and self.start_time:
             elapsed = time.time() - self.start_time
             if elapsed >= self.max_runtime:
-                if self.logger:
-                    self.logger(f"Max runtime of {self.max_runtime}s exceeded")
+                self.events.info('max_runtime', "Max runtime of {max_runtime}s exceeded", max_runtime=self.max_runtime)
                 return True
         return False
 
     def simulate_keyboard_input(self, key_input):
         """Simulate keyboard input"""
         try:
-            if isinstance(key_input, str):
-                pyautogui.press(key_input)
-            elif isinstance(key_input, list):
-                pyautogui.hotkey(*key_input)
-            if self.logger:
-                self.logger(f"Simulated keyboard input: {key_input}")
+            with INPUT_LOCK:
+                if isinstance(key_input, str):
+                    pyautogui.press(key_input)
+                elif isinstance(key_input, list):
+                    pyautogui.hotkey(*key_input)
+            self.events.info('keyboard_input', "Simulated keyboard input: {keys}", keys=key_input)
         except Exception as e:
-            if self.logger:
-                self.logger(f"Keyboard input failed: {e}")
+            self.events.warning('keyboard_failed', "Keyboard input failed: {error}", keys=key_input, error=e)
 
-    def execute_click_pattern(self, pattern):
-        """Execute a click pattern sequence"""
-        for step in pattern:
-            if self.stop_flag:
-                break
-            if isinstance(step, dict):
-                if 'position' in step:
-                    self.click_at(step['position'])
-                if 'keyboard' in step:
-                    self.simulate_keyboard_input(step['keyboard'])
-                if 'delay' in step:
-                    time.sleep(step['delay'])
-            time.sleep(0.1)  # Small delay between pattern steps
-
-    def click_at(self, position):
+    def type_text(self, text):
+        """Type a string of text"""
+        try:
+            with INPUT_LOCK:
+                pyautogui.write(text)
+            self.events.info('keyboard_input', "Typed text ({length} characters)", length=len(text))
+        except Exception as e:
+            self.events.warning('keyboard_failed', "Typing text failed: {error}", error=e)
+
+    def move_mouse(self, position):
+        """Move the mouse without clicking, e.g. along a recorded path"""
+        if self.replay:
+            return
+        try:
+            with INPUT_LOCK:
+                pyautogui.moveTo(position[0], position[1])
+        except Exception as e:
+            self.events.warning('move_failed', "Mouse move to {position} failed: {error}", position=position, error=e)
+
+    def press_mouse(self, position, button='left', down=True):
+        """Press or release a mouse button at a position, for drags; presses are safety checked"""
+        if down and self.is_in_safety_zone(position):
+            self.events.warning('safety_zone', "Safety zone violation at {position}, skipping mouse down", position=position)
+            self.play_sound_feedback('safety')
+            return False
+        if self.replay:
+            return True
+        try:
+            with INPUT_LOCK:
+                if down:
+                    pyautogui.mouseDown(position[0], position[1], button=button)
+                else:
+                    pyautogui.mouseUp(position[0], position[1], button=button)
+            return True
+        except Exception as e:
+            self.events.warning('click_failed', "Mouse {action} failed at {position}: {error}",
+                                action='down' if down else 'up', position=position, error=e)
+            return False
+
+    def perform_action(self, action):
+        """Perform one compiled pattern action"""
+        if action.kind == 'click':
+            if action.button == 'left':
+                self.click_at(action.value)
+            else:
+                self.click_at(action.value, button=action.button)
+        elif action.kind == 'move':
+            self.move_mouse(action.value)
+        elif action.kind in ('down', 'up'):
+            self.press_mouse(action.value, action.button, down=action.kind == 'down')
+        elif action.kind == 'type':
+            self.type_text(action.value)
+        else:  # 'key' or 'hotkey'
+            self.simulate_keyboard_input(action.value if action.kind == 'key' else list(action.value))
+
+    def verify_target(self, kind, target, position):
+        """Check that an image or text target is at a screen position, looking only at a small ROI around it"""
+        screen = self.capture_screen()
+        x, y = position
+        if kind == 'image':
+            template = self.get_template(target)
+            if template is None:
+                return False
+            height, width = template.shape[:2]
+            width, height = width + 2 * self.VERIFY_MARGIN, height + 2 * self.VERIFY_MARGIN
+        else:
+            width, height = self.VERIFY_TEXT_SIZE
+        left, top = max(0, x - width // 2), max(0, y - height // 2)
+        roi = screen[top:top + height, left:left + width]
+
+        if kind == 'image':
+            if roi.shape[0] < template.shape[0] or roi.shape[1] < template.shape[1]:
+                return False
+            score = cv2.minMaxLoc(cv2.matchTemplate(roi, template, cv2.TM_CCOEFF_NORMED))[1]
+            return score >= self.confidence
+        profile = self.ocr_profiles.get(target, self.ocr_profile)
+        data = self.run_ocr(cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY), profile=profile)
+        return autoclicker_text.find_phrase(data, target, self.text_max_errors) is not None
+
+    def execute_click_pattern(self, pattern, index=None):
+        """Execute a click pattern, compiled or as a list of steps, at the pace it was designed for
+
+        Each action runs at its offset from the start of the pattern as a
+        perf_counter_ns deadline, slept to within pattern_spin_ms and then spun,
+        so time spent performing an action is not added to the next wait. How
+        late each action started is added to its step's timing histogram,
+        kept per pattern index and name so unnamed patterns are not mixed.
+        PyAutoGUI's per-call PAUSE is disabled while the pattern runs, and
+        other clickers in the process send no input until it is over.
+
+        A pattern with an anchor is resolved from one detection of the anchor;
+        steps with a verify target are checked in a small region around their
+        position first. Returns False if the anchor is not found or a check
+        fails, which ends the pattern.
+        """
+        compiled = autoclicker_patterns.compile_pattern(pattern)
+        if compiled.anchor:
+            kind, target = compiled.anchor
+            origin = self.find_target(kind, target)
+            if origin is None:
+                self.events.info('pattern_anchor_missing', "Anchor {target} of pattern '{name}' not found",
+                                 name=compiled.name, target=target)
+                return False
+            try:
+                compiled = compiled.resolve(origin)
+            except ValueError as e:
+                self.events.warning('pattern_anchor_invalid', "{error}", name=compiled.name, error=e)
+                return False
+        timings = self.pattern_timing.setdefault((index, compiled.name), [])
+        while len(timings) < len(compiled.actions):
+            timings.append(autoclicker_timing.TimingHistogram())
+
+        # Other clickers in the process (daemon jobs) wait for the whole pattern: PAUSE is
+        # process-wide, and a drag must not be split by another clicker's click
+        with INPUT_LOCK:
+            pause = pyautogui.PAUSE if self.replay is None else None
+            if pause is not None:
+                pyautogui.PAUSE = 0
+            try:
+                timer = autoclicker_timing.DeadlineTimer(self.pattern_spin_ns)
+                timer.start()
+                for step_index, action in enumerate(compiled.actions):
+                    if self.stop_flag:
+                        return False
+                    error = timer.wait_until(compiled.offsets_ns[step_index])
+                    if self.stop_flag:
+                        return False
+                    timings[step_index].add(error)
+                    if action.verify:
+                        if step_index:
+                            self.last_screenshot_time = 0  # Earlier actions may have changed the screen
+                        if not self.verify_target(*action.verify, action.value):
+                            self.events.warning('pattern_verify_failed', "Pattern '{name}' stopped: {target} not found "
+                                                "at {position}", name=compiled.name, target=action.verify[1],
+                                                position=action.value)
+                            return False
+                    self.perform_action(action)
+                if not self.stop_flag:
+                    timer.wait_until(compiled.duration_ns)  # Trailing wait of the last step
+                return not self.stop_flag
+            finally:
+                if pause is not None:
+                    pyautogui.PAUSE = pause
+
+    def report_pattern_timing(self):
+        """Log how late pattern actions started: a summary per pattern, histograms per step at debug level"""
+        for (index, name), steps in self.pattern_timing.items():
+            steps = [step for step in steps if step.count]
+            if not steps:
+                continue
+            if index is not None:
+                name = f"{name} #{index + 1}"
+            count = sum(step.count for step in steps)
+            self.events.info('pattern_timing', "Pattern '{name}' timing error: mean {mean_us:.0f} us, "
+                             "worst p99 <= {p99_us:.0f} us, max {max_us:.0f} us over {count} actions",
+                             name=name, count=count,
+                             mean_us=sum(step.total_ns for step in steps) / count / 1000,
+                             p99_us=max(step.percentile_us(99) for step in steps),
+                             max_us=max(step.max_ns for step in steps) / 1000)
+            if self.events.debug_enabled:
+                for step_number, step in enumerate(steps, 1):
+                    self.events.debug('pattern_step_timing', "  Step {step}: mean {mean_us:.0f} us, max {max_us:.0f} us [{histogram}]",
+                                      name=name, step=step_number, mean_us=step.mean_us, max_us=step.max_ns / 1000,
+                                      histogram=step.format())
+
+    def click_at(self, position, button='left'):
         """Click at the specified position with safety checks"""
         if not position:
             return False
 
         # Check safety zones
         if self.is_in_safety_zone(position):
-            if self.logger:
-                self.logger(f"Safety zone violation at {position}, skipping click")
+            self.events.warning('safety_zone', "Safety zone violation at {position}, skipping click", position=position)
+            self.play_sound_feedback('safety')
             return False
 
         # Check time limit
@@ -496,44 +1254,114 @@ class AutoClicker:
             self.stop_flag = True
             return False
 
+        # Replayed sessions are offline: count the click without touching the display
+        if self.replay:
+            self.click_count += 1
+            self.success_count += 1
+            self.record_detection('click', None, position)
+            return True
+
         try:
-            pyautogui.moveTo(position[0], position[1])
-            pyautogui.click()
+            with INPUT_LOCK:
+                pyautogui.moveTo(position[0], position[1])
+                if button == 'left':
+                    pyautogui.click()
+                else:
+                    pyautogui.click(button=button)
             self.click_count += 1
             self.success_count += 1
             self.play_sound_feedback()  # Play sound feedback
             return True
         except Exception as e:
-            if self.logger:
-                self.logger(f"Click failed at {position}: {e}")
+            self.events.warning('click_failed', "Click failed at {position}: {error}", position=position, error=e)
             self.click_count += 1
+            self.play_sound_feedback('miss')
             return False
 
+    def finish_run(self):
+        """Release per-run resources when a run loop exits"""
+        if self.recorder:
+            self.recorder.flush()
+        if self.sound_player:
+            self.sound_player.close()
+            self.sound_player = None
+        if self.screenshot_writer:
+            self.screenshot_writer.close()
+            self.screenshot_writer = None
+        if self.ocr and self.owns_ocr:
+            self.ocr.close()
+            self.ocr = None
+        if self.damage:
+            self.events.info('damage_stats', "Damage events: {reports} report(s), {pixels} pixel(s) captured",
+                             reports=self.damage.reports, pixels=self.damage.pixels_grabbed)
+            self.damage.close()
+            self.damage = None
+            self.set_search_areas(None)
+        if self.ocr_tiles and self.ocr_tiles.hits + self.ocr_tiles.misses:
+            self.events.info('ocr_cache', "OCR tile cache: {hit_rate:.1f}% hits, {pixels_saved} pixels not OCR'd again",
+                             hit_rate=self.ocr_tiles.hit_rate, pixels_saved=self.ocr_tiles.pixels_saved)
+
+    def find_target(self, kind, target):
+        """Run the image or text detector for a target, timing it for the live stats"""
+        start = time.perf_counter()
+        position = self.find_image(target) if kind == 'image' else self.find_text(target)
+        self.match_latency[target] = time.perf_counter() - start
+        return position
+
+    def stats_snapshot(self):
+        """Return a point-in-time copy of the live throughput counters
+
+        Safe to call from another thread while a run loop is active: the counters
+        are plain attributes replaced atomically, so no lock is taken and the
+        detection thread is never blocked. Rates are derived by the caller from
+        the difference between two snapshots.
+        """
+        return {
+            'time': time.monotonic(),
+            'cycles': self.cycle_count,
+            'captures': self.capture_count,
+            'clicks': self.click_count,
+            'successful_clicks': self.success_count,
+            'match_latency': dict(self.match_latency),
+            'elapsed_time': time.time() - self.start_time_stats if self.start_time_stats else 0,
+            'paused': self.pause_flag
+        }
+
     def get_statistics(self):
         """Get current statistics"""
         elapsed = time.time() - self.start_time_stats if self.start_time_stats else 0
         success_rate = (self.success_count / self.click_count * 100) if self.click_count > 0 else 0
+        tiles = self.ocr_tiles
         return {
             'total_clicks': self.click_count,
             'successful_clicks': self.success_count,
             'success_rate': success_rate,
-            'elapsed_time': elapsed
+            'elapsed_time': elapsed,
+            'ocr_pixels': self.ocr_pixels + (tiles.pixels_sent if tiles else 0),
+            'ocr_pixels_saved': self.ocr_pixels_saved + (tiles.pixels_saved if tiles else 0),
+            'ocr_cache_hit_rate': tiles.hit_rate if tiles else 0.0
         }
 
+    def scheduling_enabled(self):
+        """Whether targets are checked by the scheduler rather than all of them every interval"""
+        return bool(self.target_schedules) or self.cycle_budget is not None
+
     def run_image_clicker(self, template_paths):
         """Main loop for image-based clicking with multiple templates"""
         if isinstance(template_paths, str):
             template_paths = [template_paths]
+        if self.scheduling_enabled():
+            return self.run_scheduled_clicker('image', [('image', path) for path in template_paths])
 
         # Initialize timing
         self.start_time = time.time()
         self.start_time_stats = time.time()
 
-        if self.logger:
-            self.logger(f"Starting image autoclicker with {len(template_paths)} template(s)")
-            for i, path in enumerate(template_paths):
-                self.logger(f"  {i+1}. {path}")
-            self.logger("Press Ctrl+C to stop")
+        self.events.info('run_started', "Starting image autoclicker with {count} template(s)",
+                         mode='image', count=len(template_paths))
+        for i, path in enumerate(template_paths):
+            self.events.info('run_target', "  {index}. {target}", index=i + 1, target=path)
+        self.events.info('run_hint', "Press Ctrl+C to stop")
 
         try:
             while not self.stop_flag:
@@ -544,48 +1372,52 @@ class AutoClicker:
                 # Handle pause
                 while self.pause_flag and not self.stop_flag:
                     time.sleep(0.1)
+                self.cycle_count += 1
 
                 for template_path in template_paths:
                     if self.stop_flag:
                         break
-                    position = self.find_image(template_path)
+                    position = self.find_target('image', template_path)
                     if position:
-                        if self.logger:
-                            self.logger(f"Found target '{os.path.basename(template_path)}' at {position}, clicking...")
+                        self.events.info('target_found', "Found target '{name}' at {position}, clicking...",
+                                         kind='image', target=template_path, name=os.path.basename(template_path),
+                                         position=position)
                         self.click_at(position)
                         break  # Click the first found target
                 else:
-                    if not self.stop_flag:
-                        if self.logger:
-                            self.logger("No targets found, waiting...")
+                    if not self.stop_flag and self.events.debug_enabled:
+                        self.events.debug('no_targets', "No targets found, waiting...")
 
+                self.publish_preview()
                 if not self.stop_flag:
-                    time.sleep(self.interval)
+                    self.wait_for_next_cycle()
 
         except KeyboardInterrupt:
-            if self.logger:
-                self.logger("\nStopped by user")
+            self.events.info('interrupted', "\nStopped by user")
         finally:
-            if self.logger:
-                stats = self.get_statistics()
-                self.logger(f"Image autoclicker stopped - Stats: {stats['total_clicks']} clicks, {stats['success_rate']:.1f}% success rate, {stats['elapsed_time']:.1f}s elapsed")
-            if self.logger:
-                self.logger("Image autoclicker stopped")
+            if self.events.enabled(INFO):
+                self.events.info('run_stats', "Image autoclicker stopped - Stats: {total_clicks} clicks, "
+                                 "{success_rate:.1f}% success rate, {elapsed_time:.1f}s elapsed",
+                                 mode='image', **self.get_statistics())
+            self.events.info('run_stopped', "Image autoclicker stopped", mode='image')
+            self.finish_run()
 
     def run_text_clicker(self, target_texts):
         """Main loop for text-based clicking with multiple targets"""
         if isinstance(target_texts, str):
             target_texts = [target_texts]
+        if self.scheduling_enabled():
+            return self.run_scheduled_clicker('text', [('text', text) for text in target_texts])
 
         # Initialize timing
         self.start_time = time.time()
         self.start_time_stats = time.time()
 
-        if self.logger:
-            self.logger(f"Starting text autoclicker for {len(target_texts)} target(s)")
-            for i, text in enumerate(target_texts):
-                self.logger(f"  {i+1}. '{text}'")
-            self.logger("Press Ctrl+C to stop")
+        self.events.info('run_started', "Starting text autoclicker for {count} target(s)",
+                         mode='text', count=len(target_texts))
+        for i, text in enumerate(target_texts):
+            self.events.info('run_target', "  {index}. '{target}'", index=i + 1, target=text)
+        self.events.info('run_hint', "Press Ctrl+C to stop")
 
         try:
             while not self.stop_flag:
@@ -596,33 +1428,34 @@ class AutoClicker:
                 # Handle pause
                 while self.pause_flag and not self.stop_flag:
                     time.sleep(0.1)
+                self.cycle_count += 1
 
                 for target_text in target_texts:
                     if self.stop_flag:
                         break
-                    position = self.find_text(target_text)
+                    position = self.find_target('text', target_text)
                     if position:
-                        if self.logger:
-                            self.logger(f"Found text '{target_text}' at {position}, clicking...")
+                        self.events.info('target_found', "Found text '{target}' at {position}, clicking...",
+                                         kind='text', target=target_text, position=position)
                         self.click_at(position)
                         break  # Click the first found target
                 else:
-                    if not self.stop_flag:
-                        if self.logger:
-                            self.logger("No targets found, waiting...")
+                    if not self.stop_flag and self.events.debug_enabled:
+                        self.events.debug('no_targets', "No targets found, waiting...")
 
+                self.publish_preview()
                 if not self.stop_flag:
-                    time.sleep(self.interval)
+                    self.wait_for_next_cycle()
 
         except KeyboardInterrupt:
-            if self.logger:
-                self.logger("\nStopped by user")
+            self.events.info('interrupted', "\nStopped by user")
         finally:
-            if self.logger:
-                stats = self.get_statistics()
-                self.logger(f"Text autoclicker stopped - Stats: {stats['total_clicks']} clicks, {stats['success_rate']:.1f}% success rate, {stats['elapsed_time']:.1f}s elapsed")
-            if self.logger:
-                self.logger("Text autoclicker stopped")
+            if self.events.enabled(INFO):
+                self.events.info('run_stats', "Text autoclicker stopped - Stats: {total_clicks} clicks, "
+                                 "{success_rate:.1f}% success rate, {elapsed_time:.1f}s elapsed",
+                                 mode='text', **self.get_statistics())
+            self.events.info('run_stopped', "Text autoclicker stopped", mode='text')
+            self.finish_run()
 
     def run_mixed_clicker(self, targets):
         """Main loop for mixed image and text targets"""
@@ -630,26 +1463,29 @@ class AutoClicker:
         texts = []
 
         for target in targets:
-            if target.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif', '.webp')) and os.path.exists(target):
+            if autoclicker_config.is_image_target(target) and os.path.exists(target):
                 images.append(target)
             else:
                 texts.append(target)
+        if self.scheduling_enabled():
+            return self.run_scheduled_clicker('mixed', [('image', image) for image in images] +
+                                              [('text', text) for text in texts])
 
         # Initialize timing
         self.start_time = time.time()
         self.start_time_stats = time.time()
 
-        if self.logger:
-            self.logger(f"Starting mixed autoclicker with {len(images)} image(s) and {len(texts)} text target(s)")
-            if images:
-                self.logger("Images:")
-                for i, img in enumerate(images):
-                    self.logger(f"  {i+1}. {img}")
-            if texts:
-                self.logger("Texts:")
-                for i, text in enumerate(texts):
-                    self.logger(f"  {i+1}. '{text}'")
-            self.logger("Press Ctrl+C to stop")
+        self.events.info('run_started', "Starting mixed autoclicker with {images} image(s) and {texts} text target(s)",
+                         mode='mixed', images=len(images), texts=len(texts))
+        if images:
+            self.events.info('run_targets', "Images:")
+            for i, img in enumerate(images):
+                self.events.info('run_target', "  {index}. {target}", index=i + 1, target=img)
+        if texts:
+            self.events.info('run_targets', "Texts:")
+            for i, text in enumerate(texts):
+                self.events.info('run_target', "  {index}. '{target}'", index=i + 1, target=text)
+        self.events.info('run_hint', "Press Ctrl+C to stop")
 
         try:
             while not self.stop_flag:
@@ -660,15 +1496,17 @@ class AutoClicker:
                 # Handle pause
                 while self.pause_flag and not self.stop_flag:
                     time.sleep(0.1)
+                self.cycle_count += 1
 
                 # Check images first
                 for image_path in images:
                     if self.stop_flag:
                         break
-                    position = self.find_image(image_path)
+                    position = self.find_target('image', image_path)
                     if position:
-                        if self.logger:
-                            self.logger(f"Found image '{os.path.basename(image_path)}' at {position}, clicking...")
+                        self.events.info('target_found', "Found image '{name}' at {position}, clicking...",
+                                         kind='image', target=image_path, name=os.path.basename(image_path),
+                                         position=position)
                         self.click_at(position)
                         break
                 else:
@@ -676,29 +1514,29 @@ class AutoClicker:
                     for target_text in texts:
                         if self.stop_flag:
                             break
-                        position = self.find_text(target_text)
+                        position = self.find_target('text', target_text)
                         if position:
-                            if self.logger:
-                                self.logger(f"Found text '{target_text}' at {position}, clicking...")
+                            self.events.info('target_found', "Found text '{target}' at {position}, clicking...",
+                                             kind='text', target=target_text, position=position)
                             self.click_at(position)
                             break
                     else:
-                        if not self.stop_flag:
-                            if self.logger:
-                                self.logger("No targets found, waiting...")
+                        if not self.stop_flag and self.events.debug_enabled:
+                            self.events.debug('no_targets', "No targets found, waiting...")
 
+                self.publish_preview()
                 if not self.stop_flag:
-                    time.sleep(self.interval)
+                    self.wait_for_next_cycle()
 
         except KeyboardInterrupt:
-            if self.logger:
-                self.logger("\nStopped by user")
+            self.events.info('interrupted', "\nStopped by user")
         finally:
-            if self.logger:
-                stats = self.get_statistics()
-                self.logger(f"Mixed autoclicker stopped - Stats: {stats['total_clicks']} clicks, {stats['success_rate']:.1f}% success rate, {stats['elapsed_time']:.1f}s elapsed")
-            if self.logger:
-                self.logger("Mixed autoclicker stopped")
+            if self.events.enabled(INFO):
+                self.events.info('run_stats', "Mixed autoclicker stopped - Stats: {total_clicks} clicks, "
+                                 "{success_rate:.1f}% success rate, {elapsed_time:.1f}s elapsed",
+                                 mode='mixed', **self.get_statistics())
+            self.events.info('run_stopped', "Mixed autoclicker stopped", mode='mixed')
+            self.finish_run()
 
     def run_pattern_clicker(self, patterns):
         """Main loop for click pattern sequences"""
@@ -709,9 +1547,77 @@ class AutoClicker:
         self.start_time = time.time()
         self.start_time_stats = time.time()
 
-        if self.logger:
-            self.logger(f"Starting pattern autoclicker with {len(patterns)} pattern(s)")
-            self.logger("Press Ctrl+C to stop")
+        self.events.info('run_started', "Starting pattern autoclicker with {count} pattern(s)",
+                         mode='pattern', count=len(patterns))
+        self.events.info('run_hint', "Press Ctrl+C to stop")
+
+        try:
+            # Validate and compile every pattern once, before anything is clicked
+            try:
+                compiled = [autoclicker_patterns.compile_pattern(pattern) for pattern in patterns]
+            except ValueError as e:
+                self.events.error('pattern_invalid', "Invalid pattern: {error}", error=e)
+                return
+
+            with autoclicker_timing.realtime(self.pattern_cpu, self.pattern_fifo_priority,
+                                             self.events.logger('pattern_realtime', WARNING)):
+                while not self.stop_flag:
+                    # Check time limit
+                    if self.check_time_limit():
+                        break
+
+                    # Handle pause
+                    while self.pause_flag and not self.stop_flag:
+                        time.sleep(0.1)
+                    self.cycle_count += 1
+
+                    for index, pattern in enumerate(compiled):
+                        if self.stop_flag:
+                            break
+                        self.events.info('pattern_started', "Executing pattern: {name}", name=pattern.name)
+                        self.execute_click_pattern(pattern, index)
+                        break  # Execute one pattern per cycle
+
+                    self.publish_preview()
+                    if not self.stop_flag:
+                        time.sleep(self.interval)
+
+        except KeyboardInterrupt:
+            self.events.info('interrupted', "\nStopped by user")
+        finally:
+            if self.events.enabled(INFO):
+                self.events.info('run_stats', "Pattern autoclicker stopped - Stats: {total_clicks} clicks, "
+                                 "{success_rate:.1f}% success rate, {elapsed_time:.1f}s elapsed",
+                                 mode='pattern', **self.get_statistics())
+            self.report_pattern_timing()
+            self.events.info('run_stopped', "Pattern autoclicker stopped", mode='pattern')
+            self.finish_run()
+
+    def run_scheduled_clicker(self, mode, targets):
+        """Main loop checking (kind, target) pairs as the scheduler decides
+
+        Each target is checked on its own period (the interval by default),
+        most urgent first, and as many as fit the cycle budget by their
+        measured cost; the first one found is clicked. Between cycles the loop
+        sleeps until the next target is due.
+        """
+        self.scheduler = autoclicker_schedule.Scheduler(self.interval, self.cycle_budget)
+        for kind, target in targets:
+            self.scheduler.add(kind, target, self.target_schedules.get(target))
+
+        # Initialize timing
+        self.start_time = time.time()
+        self.start_time_stats = time.time()
+
+        self.events.info('run_started', "Starting scheduled {mode} autoclicker for {count} target(s)",
+                         mode=mode, count=len(targets), cycle_budget=self.cycle_budget)
+        for i, entry in enumerate(self.scheduler.targets):
+            schedule = entry.schedule
+            self.events.info('run_target', "  {index}. {target} (every {period:g}s, priority {priority}{budget})",
+                             index=i + 1, target=entry.target, period=self.scheduler.period(entry),
+                             priority=schedule.priority,
+                             budget=f", budget {schedule.budget:g} ms/s" if schedule.budget else "")
+        self.events.info('run_hint', "Press Ctrl+C to stop")
 
         try:
             while not self.stop_flag:
@@ -722,36 +1628,164 @@ class AutoClicker:
                 # Handle pause
                 while self.pause_flag and not self.stop_flag:
                     time.sleep(0.1)
+                self.cycle_count += 1
 
-                for pattern in patterns:
+                for entry in self.scheduler.plan(time.monotonic()):
                     if self.stop_flag:
                         break
-                    if self.logger:
-                        self.logger(f"Executing pattern: {pattern.get('name', 'Unnamed')}")
-                    self.execute_click_pattern(pattern.get('steps', []))
-                    break  # Execute one pattern per cycle
+                    position = self.find_target(entry.kind, entry.target)
+                    self.scheduler.record(entry, self.match_latency[entry.target], time.monotonic())
+                    if position:
+                        self.events.info('target_found', "Found {kind} '{target}' at {position}, clicking...",
+                                         kind=entry.kind, target=entry.target, position=position)
+                        self.click_at(position)
+                        break  # Click the first found target
+                else:
+                    if not self.stop_flag and self.events.debug_enabled:
+                        self.events.debug('no_targets', "No targets found, waiting...")
 
+                self.publish_preview()
                 if not self.stop_flag:
-                    time.sleep(self.interval)
+                    time.sleep(max(self.MIN_CYCLE_SLEEP, self.scheduler.next_due() - time.monotonic()))
 
         except KeyboardInterrupt:
-            if self.logger:
-                self.logger("\nStopped by user")
+            self.events.info('interrupted', "\nStopped by user")
         finally:
-            if self.logger:
-                stats = self.get_statistics()
-                self.logger(f"Pattern autoclicker stopped - Stats: {stats['total_clicks']} clicks, {stats['success_rate']:.1f}% success rate, {stats['elapsed_time']:.1f}s elapsed")
-            if self.logger:
-                self.logger("Pattern autoclicker stopped")
+            if self.events.enabled(INFO):
+                self.events.info('run_stats', "Scheduled autoclicker stopped - Stats: {total_clicks} clicks, "
+                                 "{success_rate:.1f}% success rate, {elapsed_time:.1f}s elapsed",
+                                 mode=mode, **self.get_statistics())
+                for entry in self.scheduler.targets:
+                    self.events.info('schedule_stats', "  {target}: {checks} checks, {cost_ms:.1f} ms each, "
+                                     "deferred {deferred} time(s) by the cycle budget", target=entry.target,
+                                     checks=entry.checks, cost_ms=(entry.cost or 0) * 1000, deferred=entry.deferred)
+            self.events.info('run_stopped', "Scheduled autoclicker stopped", mode=mode)
+            self.finish_run()
+
+    def enter_state(self, workflow, name, reason):
+        """Make a workflow state active"""
+        self.events.info('workflow_state', "State '{state}' ({reason})", workflow=workflow.name,
+                         state=name, previous=self.workflow_state, reason=reason)
+        self.workflow_state = name
+        self.set_search_areas(None)  # Targets of the new state may already be on screen
+        return workflow.states[name], time.monotonic()
+
+    def run_workflow(self, workflow):
+        """Main loop for a workflow state machine
+
+        Each cycle evaluates only the active state's rules, in order: the first
+        match is clicked and/or runs its steps relative to the match, then the
+        workflow moves to the rule's next state. A state without a match for
+        its timeout moves to on_timeout; entering a final state ends the run.
+        """
+        self.start_time = time.time()
+        self.start_time_stats = time.time()
+
+        self.events.info('run_started', "Starting workflow '{name}' with {count} state(s)",
+                         mode='workflow', name=workflow.name, count=len(workflow.states))
+        self.events.info('run_hint', "Press Ctrl+C to stop")
+
+        try:
+            state, entered = self.enter_state(workflow, workflow.start, 'start')
+            while not self.stop_flag:
+                if state.final:
+                    self.events.info('workflow_finished', "Workflow '{name}' finished in state '{state}'",
+                                     name=workflow.name, state=state.name)
+                    break
+                # Check time limit
+                if self.check_time_limit():
+                    break
+
+                # Handle pause; time spent paused does not count towards a state's timeout
+                if self.pause_flag:
+                    paused = time.monotonic()
+                    while self.pause_flag and not self.stop_flag:
+                        time.sleep(0.1)
+                    entered += time.monotonic() - paused
+                self.cycle_count += 1
+
+                for rule in state.rules:
+                    if self.stop_flag:
+                        break
+                    position = self.find_target(rule.kind, rule.target)
+                    if position:
+                        self.events.info('target_found', "Found {kind} '{target}' at {position}",
+                                         kind=rule.kind, target=rule.target, position=position, state=state.name)
+                        if rule.click:
+                            self.click_at(position)
+                        if rule.pattern and not self.stop_flag:
+                            try:
+                                self.execute_click_pattern(rule.pattern.resolve(position))
+                            except ValueError as e:
+                                self.events.warning('pattern_anchor_invalid', "{error}", error=e)
+                        if rule.goto is not None:
+                            state, entered = self.enter_state(workflow, rule.goto, f"matched {rule.target}")
+                        else:
+                            entered = time.monotonic()  # Activity in the state restarts its timeout
+                        break
+                else:
+                    if state.timeout is not None and time.monotonic() - entered >= state.timeout:
+                        state, entered = self.enter_state(workflow, state.on_timeout,
+                                                          f"no match for {state.timeout:g}s")
+                        continue
+                    if not self.stop_flag and self.events.debug_enabled:
+                        self.events.debug('no_targets', "No targets of state '{state}' found, waiting...",
+                                          state=state.name)
+
+                self.publish_preview()
+                if not self.stop_flag:
+                    self.wait_for_next_cycle(entered + state.timeout if state.timeout is not None else None)
+
+        except KeyboardInterrupt:
+            self.events.info('interrupted', "\nStopped by user")
+        finally:
+            if self.events.enabled(INFO):
+                self.events.info('run_stats', "Workflow stopped - Stats: {total_clicks} clicks, "
+                                 "{success_rate:.1f}% success rate, {elapsed_time:.1f}s elapsed",
+                                 mode='workflow', **self.get_statistics())
+            self.report_pattern_timing()
+            self.events.info('run_stopped', "Workflow stopped", mode='workflow', state=self.workflow_state)
+            self.workflow_state = None
+            self.finish_run()
+
+def record_macro(path, stop_key='f7', tolerance=3.0):
+    """Record mouse and keyboard input until stop_key is pressed and save it as a pattern file"""
+    if not path.lower().endswith(autoclicker_patterns.PATTERN_EXTENSIONS):
+        print(f"Error: Pattern file must end in {', '.join(autoclicker_patterns.PATTERN_EXTENSIONS)}: {path}")
+        sys.exit(1)
+    recorder = autoclicker_macro.MacroRecorder(stop_key=stop_key)
+    recorder.start()
+    print(f"Recording mouse and keyboard input, press {stop_key} to stop (Ctrl+C also stops)")
+    try:
+        recorder.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorder.stop()
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    pattern = recorder.to_pattern(name, tolerance)
+    try:
+        autoclicker_patterns.compile_pattern(pattern)  # Never write a file the executor would reject
+        autoclicker_patterns.save_pattern_file(path, pattern)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not save pattern to {path}: {e}")
+        sys.exit(1)
+    print(f"Saved {len(pattern['steps'])} steps from {len(recorder.events)} recorded events to {path}")
+    print(f"Replay with: --mode pattern --target {path} [--time-scale FACTOR]")
+
 
 def main():
     # Check if help is requested first
     if len(sys.argv) > 1 and sys.argv[1] in ['-h', '--help']:
         parser = argparse.ArgumentParser(description='AutoClicker for Ubuntu')
-        parser.add_argument('--mode', choices=['image', 'text', 'mixed', 'pattern'], required=True,
-                           help='Mode: image for template matching, text for OCR, mixed for both, pattern for sequences')
+        parser.add_argument('--mode', choices=['image', 'text', 'mixed', 'pattern', 'record', 'workflow'], required=True,
+                           help='Mode: image for template matching, text for OCR, mixed for both, pattern for sequences, '
+                                'record to record a pattern from your own mouse and keyboard input, workflow for a '
+                                'state machine file')
         parser.add_argument('--target', action='append', required=True,
-                           help='Target(s): path to template image or target text (can be used multiple times)')
+                           help='Target(s): path to template image or target text (can be used multiple times); '
+                                'in record mode the .json/.yaml pattern file to write, in workflow mode the workflow file')
         parser.add_argument('--confidence', type=float, default=0.8,
                            help='Confidence threshold for image matching (0.0-1.0)')
         parser.add_argument('--interval', type=float, default=1.0,
@@ -762,27 +1796,67 @@ def main():
                            help='Enable sound feedback for successful clicks')
         parser.add_argument('--screenshot-debug', action='store_true',
                            help='Save screenshots for debugging failed detections')
+        parser.add_argument('--debug-dir', type=str, metavar='DIR',
+                           help='Directory for debug screenshots (default: current directory)')
+        parser.add_argument('--debug-crop', choices=['full', 'region', 'patch'], default='full',
+                           help='Save the full screen, the search region or a template-sized patch at the best match')
+        parser.add_argument('--debug-quota', type=float, default=100, metavar='MB',
+                           help='Stop saving debug screenshots once they use this much disk space')
         parser.add_argument('--hotkey-start', type=str, default='f6',
                            help='Hotkey to start autoclicker')
         parser.add_argument('--hotkey-stop', type=str, default='f7',
                            help='Hotkey to stop autoclicker')
         parser.add_argument('--hotkey-pause', type=str, default='f8',
                            help='Hotkey to pause/resume autoclicker')
+        parser.add_argument('--record', type=str, metavar='FILE',
+                           help='Record captured frames and detection results to FILE for offline profiling')
+        parser.add_argument('--replay', type=str, metavar='FILE',
+                           help='Replay frames from a recording instead of capturing the screen')
+        parser.add_argument('--replay-speed', choices=['recorded', 'max'], default='recorded',
+                           help='Replay at the recorded pace or as fast as frames are requested')
+        parser.add_argument('--ocr-backend', choices=['auto', 'pytesseract', 'tesserocr', 'capi'], default='pytesseract',
+                           help='OCR engine: pytesseract (one tesseract process per call), tesserocr or capi '
+                                '(persistent in-process Tesseract), auto picks the fastest installed')
+        parser.add_argument('--text-regions', action='store_true',
+                           help='Only OCR likely text regions found by a fast proposal stage, batched into one image')
+        parser.add_argument('--ocr-cache', action='store_true',
+                           help='Cache OCR results per screen tile by content hash so only changed tiles are OCR\'d again')
+        parser.add_argument('--text-errors', type=int, default=0, metavar='N',
+                           help='Allow up to N misread characters when matching text targets (at most a quarter of the target length)')
+        parser.add_argument('--ocr-profile', type=str, default='', metavar='OPTIONS',
+                           help='OCR settings for text targets without their own, e.g. "psm=7 whitelist=0123456789 scale=2 '
+                                'preprocess=original,threshold" (a target can carry its own after " | ")')
+        parser.add_argument('--pattern-spin', type=float, default=2.0, metavar='MS',
+                           help='Busy-wait the last MS milliseconds before each pattern action instead of sleeping (0 to only sleep)')
+        parser.add_argument('--pattern-cpu', type=int, metavar='CPU',
+                           help='Pin pattern playback to this CPU core')
+        parser.add_argument('--pattern-fifo', type=int, metavar='PRIORITY',
+                           help='Play patterns under the SCHED_FIFO real-time policy at PRIORITY (1-99, needs CAP_SYS_NICE)')
+        parser.add_argument('--cycle-budget', type=float, metavar='MS',
+                           help='Check only as many targets per cycle as fit in MS milliseconds of detection, most urgent '
+                                'first (targets can carry "every=SECONDS priority=N budget=MS_PER_S" after " | ")')
+        parser.add_argument('--on-damage', action='store_true',
+                           help='Wait for X DAMAGE screen change events instead of polling every interval and only search the '
+                                'changed areas (needs python-xlib and the DAMAGE extension, e.g. Xorg or Xvfb)')
+        parser.add_argument('--time-scale', type=float, default=1.0, metavar='FACTOR',
+                           help='Multiply pattern timing by FACTOR (0.5 plays twice as fast, 2 half as fast)')
+        parser.add_argument('--move-tolerance', type=float, default=3.0, metavar='PX',
+                           help='Record mode: simplify mouse paths until they stray at most PX pixels from the recorded path')
+        parser.add_argument('--log-level', choices=['debug', 'info', 'warning', 'error'], default='info',
+                           help='Minimum level of events to log (debug includes per-cycle messages)')
+        parser.add_argument('--log-file', type=str, metavar='FILE',
+                           help='Also append structured events to FILE as JSON lines')
         parser.print_help()
         return
 
-    # Check PyAutoGUI availability for actual operation
-    if not PYAUTOGUI_AVAILABLE:
-        print("Error: Cannot run AutoClicker without display access.")
-        print("Please run this in a graphical environment or with proper X forwarding.")
-        print("For help, run: ./run.sh --help")
-        sys.exit(1)
-
     parser = argparse.ArgumentParser(description='AutoClicker for Ubuntu')
-    parser.add_argument('--mode', choices=['image', 'text', 'mixed', 'pattern'], required=True,
-                       help='Mode: image for template matching, text for OCR, mixed for both, pattern for sequences')
+    parser.add_argument('--mode', choices=['image', 'text', 'mixed', 'pattern', 'record', 'workflow'], required=True,
+                       help='Mode: image for template matching, text for OCR, mixed for both, pattern for sequences, '
+                            'record to record a pattern from your own mouse and keyboard input, workflow for a '
+                            'state machine file')
     parser.add_argument('--target', action='append', required=True,
-                       help='Target(s): path to template image or target text (can be used multiple times)')
+                       help='Target(s): path to template image or target text (can be used multiple times); '
+                            'in record mode the .json/.yaml pattern file to write, in workflow mode the workflow file')
     parser.add_argument('--confidence', type=float, default=0.8,
                        help='Confidence threshold for image matching (0.0-1.0)')
     parser.add_argument('--interval', type=float, default=1.0,
@@ -793,20 +1867,99 @@ def main():
                        help='Enable sound feedback for successful clicks')
     parser.add_argument('--screenshot-debug', action='store_true',
                        help='Save screenshots for debugging failed detections')
+    parser.add_argument('--debug-dir', type=str, metavar='DIR',
+                       help='Directory for debug screenshots (default: current directory)')
+    parser.add_argument('--debug-crop', choices=['full', 'region', 'patch'], default='full',
+                       help='Save the full screen, the search region or a template-sized patch at the best match')
+    parser.add_argument('--debug-quota', type=float, default=100, metavar='MB',
+                       help='Stop saving debug screenshots once they use this much disk space')
     parser.add_argument('--hotkey-start', type=str, default='f6',
                        help='Hotkey to start autoclicker')
     parser.add_argument('--hotkey-stop', type=str, default='f7',
                        help='Hotkey to stop autoclicker')
     parser.add_argument('--hotkey-pause', type=str, default='f8',
                        help='Hotkey to pause/resume autoclicker')
+    parser.add_argument('--record', type=str, metavar='FILE',
+                       help='Record captured frames and detection results to FILE for offline profiling')
+    parser.add_argument('--replay', type=str, metavar='FILE',
+                       help='Replay frames from a recording instead of capturing the screen')
+    parser.add_argument('--replay-speed', choices=['recorded', 'max'], default='recorded',
+                       help='Replay at the recorded pace or as fast as frames are requested')
+    parser.add_argument('--ocr-backend', choices=['auto', 'pytesseract', 'tesserocr', 'capi'], default='pytesseract',
+                       help='OCR engine: pytesseract (one tesseract process per call), tesserocr or capi '
+                            '(persistent in-process Tesseract), auto picks the fastest installed')
+    parser.add_argument('--text-regions', action='store_true',
+                       help='Only OCR likely text regions found by a fast proposal stage, batched into one image')
+    parser.add_argument('--ocr-cache', action='store_true',
+                       help='Cache OCR results per screen tile by content hash so only changed tiles are OCR\'d again')
+    parser.add_argument('--text-errors', type=int, default=0, metavar='N',
+                       help='Allow up to N misread characters when matching text targets (at most a quarter of the target length)')
+    parser.add_argument('--ocr-profile', type=str, default='', metavar='OPTIONS',
+                       help='OCR settings for text targets without their own, e.g. "psm=7 whitelist=0123456789 scale=2 '
+                            'preprocess=original,threshold" (a target can carry its own after " | ")')
+    parser.add_argument('--pattern-spin', type=float, default=2.0, metavar='MS',
+                       help='Busy-wait the last MS milliseconds before each pattern action instead of sleeping (0 to only sleep)')
+    parser.add_argument('--pattern-cpu', type=int, metavar='CPU',
+                       help='Pin pattern playback to this CPU core')
+    parser.add_argument('--pattern-fifo', type=int, metavar='PRIORITY',
+                       help='Play patterns under the SCHED_FIFO real-time policy at PRIORITY (1-99, needs CAP_SYS_NICE)')
+    parser.add_argument('--cycle-budget', type=float, metavar='MS',
+                       help='Check only as many targets per cycle as fit in MS milliseconds of detection, most urgent '
+                            'first (targets can carry "every=SECONDS priority=N budget=MS_PER_S" after " | ")')
+    parser.add_argument('--on-damage', action='store_true',
+                       help='Wait for X DAMAGE screen change events instead of polling every interval and only search the '
+                            'changed areas (needs python-xlib and the DAMAGE extension, e.g. Xorg or Xvfb)')
+    parser.add_argument('--time-scale', type=float, default=1.0, metavar='FACTOR',
+                       help='Multiply pattern timing by FACTOR (0.5 plays twice as fast, 2 half as fast)')
+    parser.add_argument('--move-tolerance', type=float, default=3.0, metavar='PX',
+                       help='Record mode: simplify mouse paths until they stray at most PX pixels from the recorded path')
+    parser.add_argument('--log-level', choices=['debug', 'info', 'warning', 'error'], default='info',
+                       help='Minimum level of events to log (debug includes per-cycle messages)')
+    parser.add_argument('--log-file', type=str, metavar='FILE',
+                       help='Also append structured events to FILE as JSON lines')
 
     args = parser.parse_args()
 
+    # Check PyAutoGUI availability for actual operation (replay runs offline)
+    if not args.replay and not load_pyautogui():
+        print("Error: Cannot run AutoClicker without display access.")
+        print("Please run this in a graphical environment or with proper X forwarding.")
+        print("For help, run: ./run.sh --help")
+        sys.exit(1)
+
+    if args.time_scale <= 0:
+        parser.error("--time-scale must be positive")
+    if args.mode == 'record':
+        record_macro(args.target[0], args.hotkey_stop, args.move_tolerance)
+        return
+
     # Parse targets (flatten if needed)
     targets = []
+    ocr_profiles = {}
+    target_schedules = {}
     for target in args.target:
-        # Split comma-separated values
-        targets.extend([t.strip() for t in target.split(',') if t.strip()])
+        profile = schedule = None
+        if args.mode not in ('pattern', 'workflow'):
+            # Options after ' | ' apply to every target of the argument
+            try:
+                target, profile, schedule = autoclicker_config.split_target_options(target)
+            except ValueError as e:
+                parser.error(f"Invalid options in target '{target}': {e}")
+        # Split comma-separated values; pattern definitions contain commas of their own
+        if args.mode in ('pattern', 'workflow'):
+            split = [target.strip()] if target.strip() else []
+        else:
+            split = [t.strip() for t in target.split(',') if t.strip()]
+        targets.extend(split)
+        if profile is not None:
+            ocr_profiles.update((t, profile) for t in split)
+        if schedule is not None:
+            target_schedules.update((t, schedule) for t in split)
+
+    try:
+        ocr_profile = autoclicker_ocr.parse_profile(args.ocr_profile)
+    except ValueError as e:
+        parser.error(f"Invalid --ocr-profile: {e}")
 
     print(f"Targets: {targets}")
 
@@ -823,31 +1976,66 @@ def main():
         'pause': args.hotkey_pause
     }
 
+    # Structured event sinks: stdout plus an optional JSON lines file
+    event_sinks = [StreamSink(level=args.log_level)]
+    if args.log_file:
+        event_sinks.append(JsonLinesSink(args.log_file, level=args.log_level))
+
     clicker = AutoClicker(
         confidence=args.confidence,
         interval=args.interval,
         region=region,
         sound_feedback=args.sound_feedback,
         screenshot_debug=args.screenshot_debug,
-        hotkeys=hotkeys
+        debug_dir=args.debug_dir,
+        debug_crop=args.debug_crop,
+        debug_quota_mb=args.debug_quota,
+        hotkeys=hotkeys,
+        record_path=args.record,
+        replay_path=args.replay,
+        replay_speed=args.replay_speed,
+        ocr_backend=args.ocr_backend,
+        text_regions=args.text_regions,
+        ocr_cache=args.ocr_cache,
+        text_max_errors=args.text_errors,
+        ocr_profile=ocr_profile,
+        ocr_profiles=ocr_profiles,
+        pattern_spin_ms=args.pattern_spin,
+        pattern_cpu=args.pattern_cpu,
+        pattern_fifo_priority=args.pattern_fifo,
+        target_schedules=target_schedules,
+        cycle_budget_ms=args.cycle_budget,
+        damage_events=args.on_damage,
+        event_sinks=event_sinks
     )
 
-    if args.mode == 'image':
-        clicker.run_image_clicker(targets)
-    elif args.mode == 'text':
-        clicker.run_text_clicker(targets)
-    elif args.mode == 'mixed':
-        clicker.run_mixed_clicker(targets)
-    elif args.mode == 'pattern':
-        # For pattern mode, targets should be pattern definitions
-        patterns = []
-        for target in targets:
+    try:
+        if args.mode == 'image':
+            clicker.run_image_clicker(targets)
+        elif args.mode == 'text':
+            clicker.run_text_clicker(targets)
+        elif args.mode == 'mixed':
+            clicker.run_mixed_clicker(targets)
+        elif args.mode == 'pattern':
+            # For pattern mode, targets are pattern files or inline pattern definitions
+            patterns = []
+            for target in targets:
+                try:
+                    patterns.append(autoclicker_patterns.parse_pattern(target, args.time_scale))
+                except (OSError, ValueError) as e:
+                    print(f"Invalid pattern {target}: {e}")
+            if patterns:
+                clicker.run_pattern_clicker(patterns)
+        elif args.mode == 'workflow':
             try:
-                pattern = eval(target)  # Simple eval for pattern dict
-                patterns.append(pattern)
-            except:
-                print(f"Invalid pattern format: {target}")
-        clicker.run_pattern_clicker(patterns)
+                workflow = autoclicker_workflow.load_workflow(targets[0])
+            except (OSError, ValueError) as e:
+                print(f"Invalid workflow {targets[0]}: {e}")
+            else:
+                clicker.run_workflow(workflow)
+    finally:
+        clicker.close()
+        clicker.events.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Run configuration compiler for AutoClicker - Validates targets and safety zones ahead of a run
+"""
+
+import os
+import threading
+
+from autoclicker_slot import LatestSlot
+from autoclicker_ocr import PROFILE_KEYS, parse_profile
+from autoclicker_schedule import SCHEDULE_KEYS, parse_schedule
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif', '.webp')
+
+
+def parse_lines(content):
+    """Split text widget content into targets, skipping empty lines and comments"""
+    lines = []
+    for line in content.split('\n'):
+        line = line.strip()
+        if line and not line.startswith('#'):
+            lines.append(line)
+    return lines
+
+
+def parse_safety_zone(line):
+    """Parse an 'x,y,width,height' line into a zone tuple, raising ValueError if invalid"""
+    parts = line.split(',')
+    if len(parts) != 4:
+        raise ValueError(f"Invalid safety zone format: {line}")
+    try:
+        x, y, w, h = map(int, [p.strip() for p in parts])
+    except ValueError as e:
+        raise ValueError(f"Error parsing safety zone '{line}': {e}")
+    if x < 0 or y < 0 or w <= 0 or h <= 0:
+        raise ValueError(f"Invalid safety zone coordinates: {line}")
+    return (x, y, w, h)
+
+
+def split_target_options(line):
+    """Split a target line into (target, OcrProfile or None, TargetSchedule or None)
+
+    Targets may end with ' | ' followed by options: OCR profile options for
+    text targets, e.g. 'Total | psm=7 whitelist=0123456789 scale=2', and
+    schedule options for any target, e.g. 'icon.png | every=5 priority=2
+    budget=50'. A suffix that is not made of known key=value options is part
+    of the target text. Raises ValueError if an option has an invalid value.
+    """
+    target, separator, options = line.rpartition(' | ')
+    tokens = options.split()
+    if (not separator or not tokens
+            or not all('=' in token and token.partition('=')[0] in PROFILE_KEYS + SCHEDULE_KEYS for token in tokens)):
+        return line, None, None
+    profile = [token for token in tokens if token.partition('=')[0] in PROFILE_KEYS]
+    schedule = [token for token in tokens if token.partition('=')[0] in SCHEDULE_KEYS]
+    return (target.strip(), parse_profile(' '.join(profile)) if profile else None,
+            parse_schedule(' '.join(schedule)) if schedule else None)
+
+
+def split_target(line):
+    """Split a target line into (target, OcrProfile or None), ignoring schedule options"""
+    target, profile, _ = split_target_options(line)
+    return target, profile
+
+
+def is_image_target(target):
+    """Check whether a target names an image file by its extension"""
+    return target.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def load_template(path):
+    """Decode a template image as 3-channel BGR, returning None if it cannot be read"""
+    import cv2  # Imported on first use so the GUI starts without OpenCV
+
+    template = cv2.imread(path, cv2.IMREAD_COLOR)
+    if template is None:
+        return None
+    # IMREAD_COLOR already yields BGR; guard against loaders that return other layouts
+    if len(template.shape) == 2:
+        template = cv2.cvtColor(template, cv2.COLOR_GRAY2BGR)
+    elif len(template.shape) == 3 and template.shape[2] == 4:
+        template = cv2.cvtColor(template, cv2.COLOR_BGRA2BGR)
+    return template
+
+
+class SafetyZoneIndex:
+    """Uniform grid over safety zones so point lookups only test nearby zones
+
+    Zones covering more than MAX_CELLS_PER_ZONE grid cells are kept in a short
+    list that is always checked instead of being spread over the grid.
+    """
+    CELL_SIZE = 128
+    MAX_CELLS_PER_ZONE = 256
+
+    def __init__(self, zones, cell_size=CELL_SIZE):
+        self.zones = list(zones)
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> list of zones overlapping that cell
+        self.large_zones = []
+
+        for zone in self.zones:
+            x, y, w, h = zone
+            first_col, last_col = x // cell_size, (x + w) // cell_size
+            first_row, last_row = y // cell_size, (y + h) // cell_size
+            if (last_col - first_col + 1) * (last_row - first_row + 1) > self.MAX_CELLS_PER_ZONE:
+                self.large_zones.append(zone)
+                continue
+            for col in range(first_col, last_col + 1):
+                for row in range(first_row, last_row + 1):
+                    self.cells.setdefault((col, row), []).append(zone)
+
+    def __len__(self):
+        return len(self.zones)
+
+    def __iter__(self):
+        return iter(self.zones)
+
+    def contains(self, x, y):
+        """Check if a point is inside any zone (edges included)"""
+        candidates = self.cells.get((x // self.cell_size, y // self.cell_size), ())
+        for zx, zy, zw, zh in candidates:
+            if zx <= x <= zx + zw and zy <= y <= zy + zh:
+                return True
+        for zx, zy, zw, zh in self.large_zones:
+            if zx <= x <= zx + zw and zy <= y <= zy + zh:
+                return True
+        return False
+
+
+class CompiledConfig:
+    """Validated targets, decoded templates and indexed safety zones for one run"""
+    def __init__(self, source, targets, existing, templates, zones, zone_index, errors, profiles=None,
+                 schedules=None):
+        self.source = source  # (targets_text, zones_text) this configuration was compiled from
+        self.targets = targets
+        self.profiles = profiles or {}  # Text target -> OcrProfile declared after it
+        self.schedules = schedules or {}  # Target -> TargetSchedule declared after it
+        self.existing = existing  # Targets that name existing files
+        self.templates = templates  # Image path -> decoded template
+        self.zones = zones
+        self.zone_index = zone_index
+        self.errors = errors  # Messages for lines that failed validation
+
+
+class ConfigCompiler:
+    """Compile target and safety zone text into a CompiledConfig on a background thread
+
+    submit() is cheap and may be called on every edit; only the latest text is
+    compiled. Per-line parse results and decoded templates are cached, so a
+    recompile after a small edit only does work for the lines that changed.
+    """
+    def __init__(self, logger=None):
+        self.logger = logger
+        self.pending = LatestSlot()
+        self.lock = threading.Lock()  # Serializes compiles and guards the caches
+        self.zone_cache = {}  # Line -> zone tuple or error message
+        self.template_cache = {}  # Path -> (mtime, template or None)
+        self.compiled = None  # Latest CompiledConfig, replaced atomically
+        self.compile_count = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        """Start the compile worker"""
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name="ConfigCompiler", daemon=True)
+            self.thread.start()
+
+    def close(self):
+        """Stop the compile worker"""
+        self.running = False
+        if self.thread is not None:
+            self.pending.put(None)
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def submit(self, targets_text, zones_text):
+        """Queue the current editor contents for compilation"""
+        self.pending.put((targets_text, zones_text))
+
+    def current(self, targets_text, zones_text):
+        """Return the compiled configuration if it matches the given contents, else None"""
+        compiled = self.compiled
+        if compiled is not None and compiled.source == (targets_text, zones_text):
+            return compiled
+        return None
+
+    def get(self, targets_text, zones_text):
+        """Return a configuration for the given contents, compiling now if needed"""
+        return self.current(targets_text, zones_text) or self.compile(targets_text, zones_text)
+
+    def compile(self, targets_text, zones_text):
+        """Compile the given contents and publish the result"""
+        with self.lock:
+            compiled = self.current(targets_text, zones_text)
+            if compiled is not None:
+                return compiled  # Already compiled while waiting for the lock
+
+            targets = []
+            profiles = {}
+            schedules = {}
+            errors = []
+            for line in parse_lines(targets_text):
+                try:
+                    target, profile, schedule = split_target_options(line)
+                except ValueError as e:
+                    errors.append(f"Invalid options for target '{line}': {e}")
+                    continue
+                targets.append(target)
+                if schedule is not None:
+                    schedules[target] = schedule
+                if profile is not None:
+                    if is_image_target(target):
+                        errors.append(f"OCR profile ignored for image target: {target}")
+                    else:
+                        profiles[target] = profile
+
+            existing = set()
+            templates = {}
+            template_cache = {}
+            for target in targets:
+                try:
+                    mtime = os.stat(target).st_mtime
+                except (OSError, ValueError):
+                    continue
+                existing.add(target)
+                if not is_image_target(target):
+                    continue
+                cached = self.template_cache.get(target)
+                if cached is None or cached[0] != mtime:
+                    cached = (mtime, load_template(target))
+                template_cache[target] = cached
+                if cached[1] is None:
+                    errors.append(f"Could not load template image: {target}")
+                else:
+                    templates[target] = cached[1]
+            self.template_cache = template_cache  # Drop templates no longer referenced
+
+            zones = []
+            zone_cache = {}
+            for line in parse_lines(zones_text):
+                result = self.zone_cache.get(line)
+                if result is None:
+                    try:
+                        result = parse_safety_zone(line)
+                    except ValueError as e:
+                        result = str(e)
+                zone_cache[line] = result
+                if isinstance(result, tuple):
+                    zones.append(result)
+                else:
+                    errors.append(result)
+            self.zone_cache = zone_cache
+
+            compiled = CompiledConfig((targets_text, zones_text), targets, existing, templates,
+                                      zones, SafetyZoneIndex(zones), errors, profiles, schedules)
+            self.compiled = compiled
+            self.compile_count += 1
+            return compiled
+
+    def _run(self):
+        while self.running:
+            item = self.pending.take(timeout=0.5)
+            if item is None:
+                continue
+            try:
+                self.compile(*item)
+            except Exception as e:
+                if self.logger:
+                    self.logger(f"Failed to compile run configuration: {e}")
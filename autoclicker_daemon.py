@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+Daemon mode for AutoClicker - Runs many clicker jobs in one process behind a local JSON-RPC socket
+"""
+
+import argparse
+import inspect
+import itertools
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+
+import autoclicker
+import autoclicker_config
+import autoclicker_ocr
+import autoclicker_patterns
+import autoclicker_workflow
+from autoclicker_events import INFO, StreamSink
+
+MODES = ('image', 'text', 'mixed', 'pattern', 'workflow')
+
+# AutoClicker settings a job may choose; everything else is owned by the daemon
+JOB_OPTIONS = ('confidence', 'interval', 'region', 'safety_zones', 'max_runtime', 'cache_duration',
+               'text_max_errors', 'text_regions', 'ocr_cache', 'ocr_profile', 'cycle_budget_ms', 'damage_events',
+               'time_scale')
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+JOB_NOT_FOUND = -32000
+
+LOG_LINES = 100  # Most recent events kept per job
+
+
+def default_socket_path():
+    """Per-user socket in the runtime directory, falling back to the temp directory"""
+    directory = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(directory, f'autoclicker-{os.getuid()}.sock')
+
+
+def job_settings(mode, targets, options=None):
+    """Validate a job and return (AutoClicker settings, what its run method is called with)
+
+    targets use the --target syntax of the mode: image paths and texts with
+    optional ' | ' options, pattern files or definitions, or one workflow file
+    or definition. options may hold any of JOB_OPTIONS. Raises ValueError.
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of: {', '.join(MODES)}")
+    if isinstance(targets, (str, dict)):
+        targets = [targets]
+    if not isinstance(targets, list) or not targets:
+        raise ValueError("targets must be a non-empty list")
+    options = dict(options or {})
+    unknown = set(options) - set(JOB_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown option(s): {', '.join(sorted(unknown))}")
+    time_scale = options.pop('time_scale', 1.0)
+
+    settings = {}
+    for key, value in options.items():
+        if key == 'region':
+            value = tuple(value) if value else None
+        elif key == 'safety_zones':
+            value = [tuple(zone) for zone in value]
+        elif key == 'ocr_profile':
+            value = autoclicker_ocr.parse_profile(value)
+        settings[key] = value
+
+    if mode == 'workflow':
+        if len(targets) != 1:
+            raise ValueError("A workflow job takes exactly one workflow")
+        workflow = targets[0]
+        if isinstance(workflow, dict):
+            return settings, autoclicker_workflow.compile_workflow(workflow)
+        return settings, autoclicker_workflow.load_workflow(workflow)
+    if mode == 'pattern':
+        return settings, [autoclicker_patterns.compile_pattern(target, time_scale) if isinstance(target, dict)
+                          else autoclicker_patterns.parse_pattern(target, time_scale)
+                          for target in targets]
+
+    split = []
+    profiles = {}
+    schedules = {}
+    for target in targets:
+        if not isinstance(target, str):
+            raise ValueError(f"{mode} targets must be strings")
+        # Same target syntax as --target: comma-separated, options after ' | '
+        target, profile, schedule = autoclicker_config.split_target_options(target)
+        names = [t.strip() for t in target.split(',') if t.strip()]
+        split.extend(names)
+        if profile is not None:
+            profiles.update((t, profile) for t in names)
+        if schedule is not None:
+            schedules.update((t, schedule) for t in names)
+    if not split:
+        raise ValueError("targets must not be empty")
+    settings.update(ocr_profiles=profiles, target_schedules=schedules)
+    return settings, split
+
+
+def run_job(clicker, mode, run_targets):
+    """Run a clicker in the given mode until it stops"""
+    run = {
+        'image': clicker.run_image_clicker,
+        'text': clicker.run_text_clicker,
+        'mixed': clicker.run_mixed_clicker,
+        'pattern': clicker.run_pattern_clicker,
+        'workflow': clicker.run_workflow,
+    }[mode]
+    run(run_targets)
+
+
+class RpcError(Exception):
+    """JSON-RPC error with its code, raised by methods and by the client for error responses"""
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class SharedCapture:
+    """One screen capture stream for all jobs
+
+    A frame younger than max_age is handed to every job that asks for one, so
+    jobs polling at the same time share a single capture instead of each
+    running scrot. Jobs pass their own capture function; whichever job finds
+    the frame stale takes the next one while the others wait for it.
+    """
+    def __init__(self, max_age=0.25):
+        if max_age < 0:
+            raise ValueError("Frame age must be non-negative")
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.frame = None
+        self.frame_time = 0.0
+        self.captures = 0
+        self.reused = 0
+
+    def __call__(self, capture):
+        with self.lock:
+            now = time.monotonic()
+            if self.frame is None or now - self.frame_time >= self.max_age:
+                self.frame = capture()
+                self.frame_time = time.monotonic()
+                self.captures += 1
+            else:
+                self.reused += 1
+            return self.frame
+
+
+class SharedOcr:
+    """OCR backend shared by all jobs, created when the first job reads text
+
+    Persistent backends keep a pool of engine handles, one caller per handle,
+    so jobs share the daemon's workers instead of loading Tesseract each.
+    """
+    def __init__(self, backend='pytesseract', workers=2):
+        self.backend_name = backend
+        self.workers = workers
+        self.lock = threading.Lock()
+        self.backend = None
+
+    def get(self):
+        with self.lock:
+            if self.backend is None:
+                self.backend = autoclicker_ocr.create_backend(self.backend_name, workers=self.workers)
+            return self.backend
+
+    @property
+    def name(self):
+        return self.backend.name if self.backend else self.backend_name
+
+    def image_to_data(self, *args, **kwargs):
+        return self.get().image_to_data(*args, **kwargs)
+
+    def close(self):
+        with self.lock:
+            if self.backend is not None:
+                self.backend.close()
+                self.backend = None
+
+
+class JobLogSink:
+    """Sink that keeps a job's most recent events for query()"""
+    def __init__(self, level=INFO, size=LOG_LINES):
+        self.level = level
+        self.records = deque(maxlen=size)
+
+    def write(self, event):
+        self.records.append(event.to_dict())
+
+    def close(self):
+        pass
+
+
+class Job:
+    """One clicker run inside the daemon"""
+    def __init__(self, job_id, name, mode, targets, clicker, run, log):
+        self.id = job_id
+        self.name = name
+        self.mode = mode
+        self.targets = targets
+        self.clicker = clicker
+        self.log = log
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self.thread = threading.Thread(target=self._run, args=(run,), name=f'autoclicker-job-{job_id}',
+                                       daemon=True)
+
+    def _run(self, run):
+        try:
+            run()
+        except Exception as e:
+            self.error = str(e)
+            self.clicker.events.error('job_failed', "Job failed: {error}", error=e)
+        finally:
+            self.clicker.close()
+            self.finished = time.time()
+
+    @property
+    def state(self):
+        if self.thread.is_alive():
+            if self.clicker.stop_flag:
+                return 'stopping'
+            return 'paused' if self.clicker.pause_flag else 'running'
+        return 'failed' if self.error else 'finished'
+
+    def status(self, log=False):
+        status = {
+            'job': self.id,
+            'name': self.name,
+            'mode': self.mode,
+            'targets': self.targets,
+            'state': self.state,
+            'error': self.error,
+            'created': self.created,
+            'finished': self.finished,
+            'stats': dict(self.clicker.get_statistics(), **self.clicker.stats_snapshot()),
+        }
+        if log:
+            status['log'] = list(self.log.records)
+        return status
+
+
+class ClickerDaemon:
+    """Run clicker jobs in threads and serve a JSON-RPC 2.0 API on a Unix socket
+
+    Requests and responses are single JSON objects, one per line. Methods:
+      submit(mode, targets, options={}, name=None)  start a job, returns its status
+      pause(job), resume(job), stop(job)            control a job, returns its status
+      query(job=None, log=False)                    one job's status, or all jobs and shared stats
+      shutdown()                                    stop every job and exit
+    All jobs share one capture stream, one template cache and one OCR backend.
+    """
+    def __init__(self, socket_path=None, frame_age=0.25, ocr_backend='pytesseract', ocr_workers=2,
+                 clicker_class=None, event_sinks=None):
+        if ocr_backend not in autoclicker_ocr.BACKENDS:
+            raise ValueError(f"OCR backend must be one of: {', '.join(autoclicker_ocr.BACKENDS)}")
+        if ocr_workers < 1:
+            raise ValueError("OCR workers must be at least 1")
+        self.socket_path = socket_path or default_socket_path()
+        self.capture = SharedCapture(frame_age)
+        self.templates = {}  # Template cache filled by whichever job loads a template first
+        self.ocr = SharedOcr(ocr_backend, ocr_workers)
+        self.ocr_backend = ocr_backend
+        self.clicker_class = clicker_class or autoclicker.AutoClicker
+        self.event_sinks = event_sinks or []
+        self.jobs = {}
+        self.job_ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.server = None
+        self.thread = None
+        self.methods = {
+            'submit': self.submit,
+            'pause': self.pause,
+            'resume': self.resume,
+            'stop': self.stop,
+            'query': self.query,
+            'shutdown': self.shutdown,
+        }
+
+    # Methods of the API
+
+    def submit(self, mode, targets, options=None, name=None):
+        settings, run_targets = job_settings(mode, targets, options)
+        if isinstance(targets, (str, dict)):
+            targets = [targets]
+        log = JobLogSink()
+        clicker = self.clicker_class(
+            capture_source=self.capture,
+            template_cache=self.templates,
+            ocr_backend=self.ocr_backend,
+            ocr_engine=self.ocr,
+            event_sinks=[log] + self.event_sinks,
+            **settings
+        )
+        with self.lock:
+            job = Job(next(self.job_ids), name or f'{mode} job', mode,
+                      [target if isinstance(target, str) else '<inline>' for target in targets],
+                      clicker, lambda: run_job(clicker, mode, run_targets), log)
+            self.jobs[job.id] = job
+        job.thread.start()
+        return job.status()
+
+    def get_job(self, job):
+        with self.lock:
+            found = self.jobs.get(job)
+        if found is None:
+            raise RpcError(JOB_NOT_FOUND, f"No job {job}")
+        return found
+
+    def pause(self, job):
+        job = self.get_job(job)
+        if job.thread.is_alive() and not job.clicker.pause_flag:
+            job.clicker.toggle_pause()
+        return job.status()
+
+    def resume(self, job):
+        job = self.get_job(job)
+        if job.clicker.pause_flag:
+            job.clicker.toggle_pause()
+        return job.status()
+
+    def stop(self, job):
+        job = self.get_job(job)
+        job.clicker.stop()
+        job.clicker.pause_flag = False  # A paused run only sees the stop flag once it resumes
+        return job.status()
+
+    def query(self, job=None, log=False):
+        if job is not None:
+            return self.get_job(job).status(log)
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return {
+            'jobs': [job.status(log) for job in jobs],
+            'shared': {
+                'captures': self.capture.captures,
+                'frames_reused': self.capture.reused,
+                'templates': len(self.templates),
+                'ocr_backend': self.ocr.name,
+            },
+        }
+
+    def shutdown(self):
+        self.stopped.set()
+        return {'stopping': True}
+
+    # Protocol
+
+    def handle(self, request):
+        """Answer one decoded JSON-RPC request; None for notifications, which get no response"""
+        if not isinstance(request, dict):
+            return error_response(None, INVALID_REQUEST, "Request must be an object")
+        request_id = request.get('id')
+        method = self.methods.get(request.get('method')) if isinstance(request.get('method'), str) else None
+        if request.get('jsonrpc') != '2.0' or 'method' not in request:
+            response = error_response(request_id, INVALID_REQUEST, "Invalid JSON-RPC 2.0 request")
+        elif method is None:
+            response = error_response(request_id, METHOD_NOT_FOUND, f"Unknown method: {request['method']}")
+        else:
+            params = request.get('params', {})
+            try:
+                if not isinstance(params, dict):
+                    raise RpcError(INVALID_PARAMS, "params must be an object")
+                try:
+                    inspect.signature(method).bind(**params)
+                except TypeError as e:
+                    raise RpcError(INVALID_PARAMS, str(e))
+                response = {'jsonrpc': '2.0', 'id': request_id, 'result': method(**params)}
+            except RpcError as e:
+                response = error_response(request_id, e.code, e.message)
+            except (ValueError, TypeError, OSError) as e:
+                response = error_response(request_id, INVALID_PARAMS, str(e))
+            except Exception as e:
+                response = error_response(request_id, INTERNAL_ERROR, str(e))
+        return response if 'id' in request else None
+
+    def start(self):
+        """Bind the socket and serve requests on a background thread"""
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)  # Left behind by a daemon that did not exit cleanly
+            else:
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+            finally:
+                probe.close()
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                    except ValueError:
+                        response = error_response(None, PARSE_ERROR, "Invalid JSON")
+                    else:
+                        response = daemon.handle(request)
+                    if response is not None:
+                        self.wfile.write(json.dumps(response, default=str).encode() + b"\n")
+                        self.wfile.flush()
+
+        old_umask = os.umask(0o177)  # Only the owner may talk to the daemon
+        try:
+            self.server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name='autoclicker-daemon', daemon=True)
+        self.thread.start()
+
+    def wait(self, timeout=None):
+        """Block until shutdown is requested; returns False on timeout"""
+        return self.stopped.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Stop every job, then the server, and release the shared OCR engines"""
+        self.stopped.set()
+        with self.lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            job.clicker.stop()
+            job.clicker.pause_flag = False
+        deadline = time.monotonic() + timeout
+        for job in jobs:
+            job.thread.join(max(0.0, deadline - time.monotonic()))
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+        self.ocr.close()
+
+
+def error_response(request_id, code, message):
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+def call(method, socket_path=None, timeout=10.0, **params):
+    """Call a daemon method and return its result, raising RpcError for an error response"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path or default_socket_path())
+        request = {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params}
+        client.sendall(json.dumps(request).encode() + b"\n")
+        with client.makefile('rb') as reply:
+            line = reply.readline()
+    if not line:
+        raise RpcError(INVALID_REQUEST, "Daemon closed the connection")
+    response = json.loads(line)
+    if 'error' in response:
+        raise RpcError(response['error']['code'], response['error']['message'])
+    return response['result']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AutoClicker daemon: run many clicker jobs in one process')
+    parser.add_argument('--socket', help='Unix socket path (default: autoclicker-<uid>.sock in $XDG_RUNTIME_DIR)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help='Run the daemon in the foreground')
+    serve.add_argument('--frame-age', type=float, default=0.25,
+                       help='Seconds a captured frame is shared between jobs before a new one is taken (default: 0.25)')
+    serve.add_argument('--ocr-backend', choices=['auto', 'pytesseract', 'tesserocr', 'capi'], default='pytesseract',
+                       help='OCR backend shared by all jobs (default: pytesseract)')
+    serve.add_argument('--ocr-workers', type=int, default=2,
+                       help='Tesseract engines in the shared pool of persistent backends (default: 2)')
+    serve.add_argument('--log-level', choices=['debug', 'info', 'warning', 'error'], default='info',
+                       help='Events of all jobs printed at this level or above (default: info)')
+
+    submit = commands.add_parser('submit', help='Start a job')
+    submit.add_argument('--mode', choices=MODES, required=True, help='Job mode, as for autoclicker --mode')
+    submit.add_argument('--target', action='append', required=True, help='Target, as for autoclicker --target')
+    submit.add_argument('--name', help='Name shown in queries')
+    submit.add_argument('--options', default='{}',
+                        help=f'JSON object of job settings: {", ".join(JOB_OPTIONS)}')
+
+    for command in ('pause', 'resume', 'stop'):
+        commands.add_parser(command, help=f'{command.capitalize()} a job').add_argument('job', type=int)
+    query = commands.add_parser('query', help='Show one job or all jobs')
+    query.add_argument('job', type=int, nargs='?')
+    query.add_argument('--log', action='store_true', help='Include the most recent events of each job')
+    commands.add_parser('shutdown', help='Stop every job and the daemon')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        try:
+            daemon = ClickerDaemon(args.socket, frame_age=args.frame_age, ocr_backend=args.ocr_backend,
+                                   ocr_workers=args.ocr_workers, event_sinks=[StreamSink(level=args.log_level)])
+            daemon.start()
+        except (ValueError, RuntimeError, OSError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"AutoClicker daemon listening on {daemon.socket_path}")
+        try:
+            daemon.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            daemon.close()
+        return
+
+    params = {}
+    if args.command == 'submit':
+        try:
+            options = json.loads(args.options)
+        except ValueError as e:
+            parser.error(f"Invalid --options: {e}")
+        params = {'mode': args.mode, 'targets': args.target, 'options': options, 'name': args.name}
+    elif args.command in ('pause', 'resume', 'stop'):
+        params = {'job': args.job}
+    elif args.command == 'query':
+        params = {'job': args.job, 'log': args.log}
+    try:
+        result = call(args.command, args.socket, **params)
+    except RpcError as e:
+        print(f"Error: {e.message}")
+        sys.exit(1)
+    except OSError as e:
+        print(f"Error: Cannot reach the daemon: {e}")
+        sys.exit(1)
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Damage tracking for AutoClicker - Waits for X DAMAGE reports instead of polling and grabs only changed pixels
+"""
+
+import select
+import time
+
+from autoclicker_ocr import merge_boxes
+
+MAX_RECTS = 32  # More damaged rectangles than this are merged into their bounding box
+SETTLE = 0.01  # Seconds after the first report during which further damage joins the same batch
+
+
+def clip_rect(rect, bounds):
+    """Intersect two (x, y, width, height) rectangles; None if they do not overlap"""
+    x, y = max(rect[0], bounds[0]), max(rect[1], bounds[1])
+    right = min(rect[0] + rect[2], bounds[0] + bounds[2])
+    bottom = min(rect[1] + rect[3], bounds[1] + bounds[3])
+    if right <= x or bottom <= y:
+        return None
+    return (x, y, right - x, bottom - y)
+
+
+def expand_rect(rect, dx, dy, bounds):
+    """Grow a rectangle by dx/dy on each side, clipped to bounds"""
+    return clip_rect((rect[0] - dx, rect[1] - dy, rect[2] + 2 * dx, rect[3] + 2 * dy), bounds)
+
+
+def merge_rects(rects, limit=MAX_RECTS):
+    """Merge overlapping (x, y, width, height) rectangles; beyond limit, return their bounding box"""
+    boxes = merge_boxes([[x, y, x + w, y + h] for x, y, w, h in rects])
+    if len(boxes) > limit:
+        boxes = [[min(b[0] for b in boxes), min(b[1] for b in boxes),
+                  max(b[2] for b in boxes), max(b[3] for b in boxes)]]
+    return [(x0, y0, x1 - x0, y1 - y0) for x0, y0, x1, y1 in boxes]
+
+
+class DamageMonitor:
+    """Follow screen changes through X DAMAGE events on the root window
+
+    frame is a BGR copy of the screen (or region) kept up to date by grabbing
+    only the damaged rectangles, so a change costs a capture of the pixels
+    that changed rather than of the whole screen. wait() blocks on the X
+    connection without polling. Needs python-xlib and an X server with the
+    DAMAGE extension, and assumes a 32 bits per pixel TrueColor screen as
+    used by Xorg and Xvfb at depth 24.
+    """
+    def __init__(self, display=None, region=None, connection=None, settle=SETTLE):
+        import numpy as np
+        if connection is None:
+            try:
+                from Xlib import display as xlib_display
+            except ImportError:
+                raise RuntimeError("Install python-xlib to follow screen damage events")
+            connection = xlib_display.Display(display)
+        from Xlib import X
+        from Xlib.ext import damage
+
+        self.np = np
+        self.X = X
+        self.connection = connection
+        self.settle = settle
+        if not connection.has_extension('DAMAGE'):
+            connection.close()
+            raise RuntimeError("The X server does not support the DAMAGE extension")
+        connection.damage_query_version()
+        self.event_type = connection.query_extension('DAMAGE').first_event + damage.DamageNotifyCode
+        self.root = connection.screen().root
+        geometry = self.root.get_geometry()
+        screen = (0, 0, geometry.width, geometry.height)
+        self.bounds = clip_rect(region, screen) if region else screen
+        if self.bounds is None:
+            connection.close()
+            raise ValueError(f"Region {region} is outside the screen")
+        # Delta reports only name area not already damaged; subtracting after each batch re-arms them
+        self.damage = self.root.damage_create(damage.DamageReportDeltaRectangles)
+        connection.flush()
+
+        x, y, width, height = self.bounds
+        self.frame = np.zeros((y + height, x + width, 3), dtype=np.uint8)
+        self.grab(self.bounds)
+        self.version = 0  # Incremented whenever frame changes
+        self.reports = 0  # Damage rectangles received
+        self.pixels_grabbed = 0
+
+    def grab(self, rect):
+        """Copy a rectangle of the screen into frame"""
+        x, y, width, height = rect
+        image = self.root.get_image(x, y, width, height, self.X.ZPixmap, 0xffffffff)
+        pixels = self.np.frombuffer(image.data, dtype=self.np.uint8)
+        # ZPixmap rows of 32 bit pixels are B, G, R, unused on little-endian servers
+        self.frame[y:y + height, x:x + width] = pixels.reshape(height, -1, 4)[:, :width, :3]
+
+    def read(self, rects):
+        """Move damage reports already received into rects"""
+        while self.connection.pending_events():
+            event = self.connection.next_event()
+            if event.type != self.event_type:
+                continue
+            self.reports += 1
+            area = event.area
+            rect = clip_rect((area.x, area.y, area.width, area.height), self.bounds)
+            if rect:
+                rects.append(rect)
+
+    def wait(self, timeout):
+        """Wait up to timeout seconds for screen changes and return the changed rectangles, [] if none
+
+        Once a change is reported, more damage is collected for settle seconds
+        so a window drawn in several steps is handled as one change. frame is
+        updated before returning.
+        """
+        deadline = time.monotonic() + timeout
+        rects = []
+        settled = None
+        while True:
+            self.read(rects)
+            now = time.monotonic()
+            if rects and settled is None:
+                settled = min(deadline, now + self.settle)
+            remaining = (settled or deadline) - now
+            if remaining <= 0:
+                break
+            select.select([self.connection.fileno()], [], [], remaining)
+        if not rects:
+            return []
+
+        self.connection.damage_subtract(self.damage)
+        self.connection.flush()
+        rects = merge_rects(rects)
+        for rect in rects:
+            self.grab(rect)
+            self.pixels_grabbed += rect[2] * rect[3]
+        self.version += 1
+        return rects
+
+    def close(self):
+        try:
+            self.connection.damage_destroy(self.damage)
+        finally:
+            self.connection.close()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Structured event logging for AutoClicker - Leveled events with typed fields and pluggable sinks
+"""
+
+import json
+import sys
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: 'debug', INFO: 'info', WARNING: 'warning', ERROR: 'error'}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+
+def parse_level(level):
+    """Convert a level name ('debug', 'info', ...) or number to a level number"""
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVELS[str(level).lower()]
+    except KeyError:
+        raise ValueError(f"Unknown log level: {level}. Choose from: {', '.join(LEVELS)}")
+
+
+class Event:
+    """A single log event; the message template is only formatted when a sink asks for it"""
+    __slots__ = ('time', 'level', 'name', 'template', 'fields', '_message')
+
+    def __init__(self, level, name, template, fields):
+        self.time = time.time()
+        self.level = level
+        self.name = name
+        self.template = template
+        self.fields = fields
+        self._message = None
+
+    @property
+    def level_name(self):
+        return LEVEL_NAMES.get(self.level, str(self.level))
+
+    @property
+    def message(self):
+        """Human-readable message, formatted on first access"""
+        if self._message is None:
+            try:
+                self._message = self.template.format(**self.fields) if self.fields else self.template
+            except (KeyError, IndexError, ValueError):
+                self._message = self.template
+        return self._message
+
+    def to_dict(self):
+        record = {'time': self.time, 'level': self.level_name, 'event': self.name, 'message': self.message}
+        record.update(self.fields)
+        return record
+
+
+class CallbackSink:
+    """Sink that passes rendered messages to a logger callback such as the GUI log"""
+    def __init__(self, callback, level=INFO):
+        self.callback = callback
+        self.level = parse_level(level)
+
+    def write(self, event):
+        self.callback(event.message)
+
+    def close(self):
+        pass
+
+
+class StreamSink:
+    """Sink that prints rendered messages to a stream (stdout by default)"""
+    def __init__(self, stream=None, level=INFO):
+        self.stream = stream
+        self.level = parse_level(level)
+
+    def write(self, event):
+        stream = self.stream or sys.stdout
+        prefix = "" if event.level == INFO else f"{event.level_name.upper()}: "
+        stream.write(f"[{time.strftime('%H:%M:%S', time.localtime(event.time))}] {prefix}{event.message}\n")
+
+    def close(self):
+        pass
+
+
+class JsonLinesSink:
+    """Sink that appends one JSON object per event to a file"""
+    def __init__(self, path, level=DEBUG):
+        self.path = path
+        self.level = parse_level(level)
+        self.lock = threading.Lock()
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, event):
+        line = json.dumps(event.to_dict(), default=str)
+        with self.lock:
+            self.file.write(line + "\n")
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+
+class EventLog:
+    """Dispatch structured events to the sinks whose level accepts them
+
+    Hot paths can check debug_enabled (a plain attribute) before emitting, so
+    disabled debug events cost a single attribute lookup.
+    """
+    def __init__(self, sinks=None):
+        self.sinks = []
+        self.min_level = None
+        self.debug_enabled = False
+        for sink in sinks or []:
+            self.add_sink(sink)
+        self._update_level()
+
+    def _update_level(self):
+        self.min_level = min((sink.level for sink in self.sinks), default=ERROR + 1)
+        self.debug_enabled = self.min_level <= DEBUG
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        self._update_level()
+
+    def remove_sink(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+            self._update_level()
+
+    def enabled(self, level):
+        """Check whether any sink accepts events of this level"""
+        return level >= self.min_level
+
+    def emit(self, level, name, template, /, **fields):
+        """Emit an event; nothing is formatted unless a sink accepts the level"""
+        if level >= self.min_level:
+            self._dispatch(Event(level, name, template, fields))
+
+    def _dispatch(self, event):
+        for sink in self.sinks:
+            if event.level >= sink.level:
+                try:
+                    sink.write(event)
+                except Exception as e:
+                    print(f"Log sink error: {e}", file=sys.stderr)
+
+    # Level shortcuts check the level before building the event; the event name and template are
+    # positional-only so fields may be called 'name' or 'template' too
+    def debug(self, name, template, /, **fields):
+        if DEBUG >= self.min_level:
+            self._dispatch(Event(DEBUG, name, template, fields))
+
+    def info(self, name, template, /, **fields):
+        if INFO >= self.min_level:
+            self._dispatch(Event(INFO, name, template, fields))
+
+    def warning(self, name, template, /, **fields):
+        if WARNING >= self.min_level:
+            self._dispatch(Event(WARNING, name, template, fields))
+
+    def error(self, name, template, /, **fields):
+        if ERROR >= self.min_level:
+            self._dispatch(Event(ERROR, name, template, fields))
+
+    def logger(self, name, level=INFO):
+        """Return a plain logger callback that emits its messages as events"""
+        def log(message):
+            if level >= self.min_level:
+                self.emit(level, name, "{message}", message=message)
+        return log
+
+    def close(self):
+        """Close all sinks"""
+        for sink in self.sinks:
+            sink.close()
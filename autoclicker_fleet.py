@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Fleet supervisor for AutoClicker - Drives many X displays with one worker process each and a shared OCR pool
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import queue
+import re
+import signal
+import sys
+import threading
+import time
+
+import autoclicker
+import autoclicker_daemon
+import autoclicker_ocr
+from autoclicker_events import EventLog, CallbackSink, StreamSink, JsonLinesSink
+from autoclicker_patterns import load_pattern_file
+
+STATS_PERIOD = 1.0  # Seconds between the stats reports of each worker
+CHECK_PERIOD = 0.5  # Seconds between supervisor checks of its processes
+RESTART_DELAY = 1.0  # Delay before restarting a crashed worker, doubled for each crash in a row
+MAX_RESTART_DELAY = 60.0
+STABLE_AFTER = 60.0  # A worker that ran this long before crashing starts over at RESTART_DELAY
+OCR_TIMEOUT = 120.0  # Seconds a worker waits for the OCR pool before giving up on an image
+CONFIG_ERROR = 2  # Worker exit code for a job that cannot start as configured; it is not restarted
+
+COUNTERS = ('cycles', 'captures', 'clicks', 'successful_clicks')
+DISPLAY_PATTERN = re.compile(r'[\w.-]*:\d+(\.\d+)?')
+
+
+class WorkerSpec:
+    """One display of the fleet and the job its worker runs"""
+    def __init__(self, display, mode, targets, options=None, name=None, cwd=None):
+        self.display = display
+        self.mode = mode
+        self.targets = targets
+        self.options = options or {}
+        self.name = name or display
+        self.cwd = cwd  # Relative paths in the targets are taken from here
+
+    def __repr__(self):
+        return f"WorkerSpec(display={self.display!r}, mode={self.mode!r}, targets={len(self.targets)})"
+
+
+class Fleet:
+    """Validated fleet: the workers and the shared OCR pool settings"""
+    def __init__(self, workers, ocr_backend='pytesseract', ocr_workers=1, stats_interval=10.0):
+        self.workers = workers
+        self.ocr_backend = ocr_backend
+        self.ocr_workers = ocr_workers
+        self.stats_interval = stats_interval
+
+
+def compile_fleet(definition, base_dir=None):
+    """Validate a fleet definition and compile it into a Fleet
+
+    A fleet is a mapping with 'workers', a list of:
+      display: ":1"          X display the worker drives
+      mode: "text"           as for --mode (image, text, mixed, pattern, workflow)
+      targets: [...]         as for --target
+      options: {...}         job settings, see autoclicker_daemon.JOB_OPTIONS
+      name: "..."            optional label for logs and stats
+    and optionally 'ocr_backend', 'ocr_workers' (OCR processes shared by all
+    workers, 0 to OCR inside each worker; default half the CPUs) and
+    'stats_interval' (seconds between fleet stats). Relative paths in targets
+    are taken from base_dir. Raises ValueError naming the first invalid entry.
+    """
+    if not isinstance(definition, dict):
+        raise ValueError("Fleet must be a mapping with 'workers'")
+    unknown = set(definition) - {'workers', 'ocr_backend', 'ocr_workers', 'stats_interval'}
+    if unknown:
+        raise ValueError(f"Unknown fleet field(s): {', '.join(sorted(unknown))}")
+    ocr_backend = definition.get('ocr_backend', 'pytesseract')
+    if ocr_backend not in autoclicker_ocr.BACKENDS:
+        raise ValueError(f"ocr_backend must be one of: {', '.join(autoclicker_ocr.BACKENDS)}")
+    ocr_workers = definition.get('ocr_workers', max(1, (os.cpu_count() or 2) // 2))
+    if not isinstance(ocr_workers, int) or isinstance(ocr_workers, bool) or ocr_workers < 0:
+        raise ValueError("ocr_workers must be a non-negative integer")
+    stats_interval = definition.get('stats_interval', 10.0)
+    if not isinstance(stats_interval, (int, float)) or isinstance(stats_interval, bool) or stats_interval <= 0:
+        raise ValueError("stats_interval must be a positive number of seconds")
+
+    entries = definition.get('workers')
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("Fleet workers must be a non-empty list")
+    workers = []
+    displays = set()
+    for index, entry in enumerate(entries, 1):
+        where = f"Worker {index}"
+        if not isinstance(entry, dict):
+            raise ValueError(f"{where}: must be a mapping")
+        unknown = set(entry) - {'display', 'mode', 'targets', 'options', 'name'}
+        if unknown:
+            raise ValueError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+        display = entry.get('display')
+        if not isinstance(display, str) or not DISPLAY_PATTERN.fullmatch(display):
+            raise ValueError(f"{where}: display must be an X display such as ':1'")
+        if display in displays:
+            raise ValueError(f"{where}: display {display} is already driven by another worker")
+        displays.add(display)
+        mode = entry.get('mode')
+        if mode not in autoclicker_daemon.MODES:
+            raise ValueError(f"{where}: mode must be one of {', '.join(autoclicker_daemon.MODES)}")
+        targets = entry.get('targets')
+        if isinstance(targets, (str, dict)):
+            targets = [targets]
+        if not isinstance(targets, list) or not targets:
+            raise ValueError(f"{where}: targets must be a non-empty list")
+        options = entry.get('options', {})
+        if not isinstance(options, dict):
+            raise ValueError(f"{where}: options must be a mapping")
+        unknown = set(options) - set(autoclicker_daemon.JOB_OPTIONS)
+        if unknown:
+            raise ValueError(f"{where}: unknown option(s) {', '.join(sorted(unknown))}")
+        name = entry.get('name')
+        if name is not None and not isinstance(name, str):
+            raise ValueError(f"{where}: name must be a string")
+        workers.append(WorkerSpec(display, mode, targets, options, name, base_dir))
+    return Fleet(workers, ocr_backend, ocr_workers, float(stats_interval))
+
+
+def load_fleet(path):
+    """Load and compile a fleet from a JSON or YAML file; target paths are relative to the file"""
+    return compile_fleet(load_pattern_file(path), os.path.dirname(os.path.abspath(path)))
+
+
+class RemoteOcr:
+    """OCR backend of a worker process that hands its images to the supervisor's OCR pool
+
+    Requests go to the pool's shared queue and answers come back on the
+    worker's own queue. Answers to requests of a crashed predecessor on the
+    same display are recognized by their id and dropped.
+    """
+    name = 'pool'
+
+    def __init__(self, requests, responses, slot, timeout=OCR_TIMEOUT):
+        self.requests = requests
+        self.responses = responses
+        self.slot = slot
+        self.timeout = timeout
+        self.ids = itertools.count()
+        self.lock = threading.Lock()  # One request in flight per worker
+
+    def image_to_data(self, image, profile=autoclicker_ocr.DEFAULT_PROFILE):
+        with self.lock:
+            request_id = (os.getpid(), next(self.ids))
+            self.requests.put((self.slot, request_id, image, profile))
+            deadline = time.monotonic() + self.timeout
+            while True:
+                try:
+                    reply_id, ok, result = self.responses.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    raise RuntimeError(f"OCR pool did not answer within {self.timeout:g}s")
+                if reply_id == request_id:
+                    break
+        if not ok:
+            raise RuntimeError(result)
+        return result
+
+    def close(self):
+        pass
+
+
+def ocr_server(backend, requests, responses, create=None):
+    """OCR pool process: answer the requests of every worker with one OCR engine until sent None"""
+    engine = (create or autoclicker_ocr.create_backend)(backend)
+    try:
+        while True:
+            item = requests.get()
+            if item is None:
+                break
+            slot, request_id, image, profile = item
+            try:
+                reply = (request_id, True, engine.image_to_data(image, profile))
+            except Exception as e:
+                reply = (request_id, False, f"OCR failed: {e}")
+            responses[slot].put(reply)
+    finally:
+        engine.close()
+
+
+def run_worker(spec, ocr_requests, ocr_responses, stats, stop, log_level='info'):
+    """Worker process: run the spec's job on its display until it ends or stop is set"""
+    # PyAutoGUI is only loaded when the clicker starts, so setting this first makes it and the capture tools
+    # connect to the worker's display
+    os.environ['DISPLAY'] = spec.display
+    if spec.cwd:
+        os.chdir(spec.cwd)
+
+    def log(message):
+        print(f"[{spec.name}] {message}", flush=True)
+
+    try:
+        settings, run_targets = autoclicker_daemon.job_settings(spec.mode, spec.targets, spec.options)
+    except (OSError, ValueError) as e:
+        log(f"Error: {e}")
+        sys.exit(CONFIG_ERROR)
+    ocr = RemoteOcr(ocr_requests, ocr_responses, spec.display) if ocr_requests is not None else None
+    clicker = autoclicker.AutoClicker(ocr_engine=ocr, event_sinks=[CallbackSink(log, log_level)], **settings)
+
+    def report():
+        while not stop.wait(STATS_PERIOD):
+            stats.put((spec.display, os.getpid(), clicker.stats_snapshot()))
+        clicker.stop()
+
+    threading.Thread(target=report, name='autoclicker-fleet-stats', daemon=True).start()
+    try:
+        autoclicker_daemon.run_job(clicker, spec.mode, run_targets)
+    finally:
+        stats.put((spec.display, os.getpid(), clicker.stats_snapshot()))
+        clicker.close()
+        clicker.events.close()
+
+
+def child_main(target, *args):
+    """Entry point of spawned processes: Ctrl+C is left to the supervisor, which stops them in order"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    target(*args)
+
+
+class WorkerSlot:
+    """Supervisor state of one display: its current process, crash history and counters"""
+    def __init__(self, spec, responses):
+        self.spec = spec
+        self.responses = responses  # OCR answers for this display, kept across restarts
+        self.process = None
+        self.started = None
+        self.restarts = 0
+        self.delay = RESTART_DELAY
+        self.restart_at = None
+        self.state = 'starting'
+        self.snapshot = {}  # Latest stats of the current process
+        self.totals = dict.fromkeys(COUNTERS, 0)  # Counters of earlier processes of this display
+
+    def counters(self):
+        return {key: self.totals[key] + self.snapshot.get(key, 0) for key in COUNTERS}
+
+
+class FleetSupervisor:
+    """Spawn one worker process per display, share an OCR process pool and restart crashed workers
+
+    Worker processes are spawned, not forked, so each one connects to its own
+    display with a fresh PyAutoGUI. A worker that exits with an error is
+    restarted after a delay that doubles with each crash in a row; one that
+    finishes its job, or cannot start as configured, is left finished.
+    """
+    def __init__(self, fleet, event_sinks=None, log_level='info', worker_target=None, ocr_target=None,
+                 restart_delay=RESTART_DELAY):
+        self.fleet = fleet
+        self.events = EventLog(event_sinks)
+        self.log_level = log_level
+        self.worker_target = worker_target or run_worker
+        self.ocr_target = ocr_target or ocr_server
+        self.restart_delay = restart_delay
+        self.context = multiprocessing.get_context('spawn')
+        self.stop_event = self.context.Event()
+        self.stats_queue = self.context.Queue()
+        self.ocr_requests = self.context.Queue() if fleet.ocr_workers else None
+        self.slots = [WorkerSlot(spec, self.context.Queue() if fleet.ocr_workers else None)
+                      for spec in fleet.workers]
+        self.by_display = {slot.spec.display: slot for slot in self.slots}
+        self.ocr_processes = []
+        self.stopping = False
+
+    def start(self):
+        for index in range(self.fleet.ocr_workers):
+            self.ocr_processes.append(self.start_ocr(index))
+        for slot in self.slots:
+            slot.delay = self.restart_delay
+            self.start_worker(slot)
+
+    def start_ocr(self, index):
+        responses = {slot.spec.display: slot.responses for slot in self.slots}
+        process = self.context.Process(target=child_main, args=(self.ocr_target, self.fleet.ocr_backend,
+                                                                self.ocr_requests, responses),
+                                       name=f'autoclicker-ocr-{index}', daemon=True)
+        process.start()
+        return process
+
+    def start_worker(self, slot):
+        slot.process = self.context.Process(target=child_main,
+                                            args=(self.worker_target, slot.spec, self.ocr_requests, slot.responses, self.stats_queue,
+                                                  self.stop_event, self.log_level),
+                                            name=f'autoclicker-{slot.spec.display}')
+        slot.process.start()
+        slot.started = time.monotonic()
+        slot.state = 'running'
+        self.events.info('worker_started', "Worker {name} started on {display} (pid {pid})",
+                         name=slot.spec.name, display=slot.spec.display, pid=slot.process.pid)
+
+    def check(self, now=None):
+        """Collect worker stats and restart crashed processes; False once every worker is done"""
+        now = time.monotonic() if now is None else now
+        # Exited processes have flushed their last stats, so read them only after seeing which exited
+        exited = [slot for slot in self.slots if slot.process and not slot.process.is_alive()]
+        while True:
+            try:
+                display, pid, snapshot = self.stats_queue.get_nowait()
+            except queue.Empty:
+                break
+            slot = self.by_display.get(display)
+            if slot and slot.process and slot.process.pid == pid:
+                slot.snapshot = snapshot
+
+        for slot in exited:
+            slot.process.join()
+            exitcode = slot.process.exitcode
+            for key in COUNTERS:
+                slot.totals[key] += slot.snapshot.get(key, 0)
+            slot.snapshot = {}
+            slot.process = None
+            if exitcode == 0 or self.stopping:
+                slot.state = 'finished'
+                self.events.info('worker_finished', "Worker {name} on {display} finished",
+                                 name=slot.spec.name, display=slot.spec.display)
+            elif exitcode == CONFIG_ERROR:
+                slot.state = 'failed'
+                self.events.error('worker_failed', "Worker {name} on {display} cannot run as configured",
+                                  name=slot.spec.name, display=slot.spec.display)
+            else:
+                if now - slot.started >= STABLE_AFTER:
+                    slot.delay = self.restart_delay
+                slot.state = 'restarting'
+                slot.restart_at = now + slot.delay
+                self.events.warning('worker_crashed',
+                                    "Worker {name} on {display} exited with code {exitcode}, restarting in {delay:.1f}s",
+                                    name=slot.spec.name, display=slot.spec.display, exitcode=exitcode,
+                                    delay=slot.delay)
+                slot.delay = min(slot.delay * 2, MAX_RESTART_DELAY)
+
+        if not self.stopping:
+            for slot in self.slots:
+                if slot.restart_at is not None and now >= slot.restart_at:
+                    slot.restart_at = None
+                    slot.restarts += 1
+                    self.start_worker(slot)
+            for index, process in enumerate(self.ocr_processes):
+                if not process.is_alive():
+                    self.events.warning('ocr_worker_crashed', "OCR process {index} exited with code {exitcode}, restarting",
+                                        index=index, exitcode=process.exitcode)
+                    self.ocr_processes[index] = self.start_ocr(index)
+        return any(slot.state in ('running', 'restarting') for slot in self.slots)
+
+    def stats(self):
+        """Fleet totals and per-display worker states"""
+        displays = {}
+        totals = dict.fromkeys(COUNTERS, 0)
+        for slot in self.slots:
+            counters = slot.counters()
+            for key in COUNTERS:
+                totals[key] += counters[key]
+            displays[slot.spec.display] = dict(counters, name=slot.spec.name, state=slot.state,
+                                               restarts=slot.restarts,
+                                               pid=slot.process.pid if slot.process else None,
+                                               match_latency=slot.snapshot.get('match_latency', {}))
+        return dict(totals, workers=len(self.slots),
+                    running=sum(slot.state == 'running' for slot in self.slots),
+                    restarts=sum(slot.restarts for slot in self.slots), displays=displays)
+
+    def report(self):
+        stats = self.stats()
+        self.events.info('fleet_stats', "{running}/{workers} workers running: {cycles} cycles, {captures} captures, "
+                                        "{clicks} clicks, {restarts} restarts",
+                         **{key: value for key, value in stats.items() if key != 'displays'})
+
+    def run(self):
+        """Supervise until every worker is done or Ctrl+C, logging fleet stats every stats_interval"""
+        self.start()
+        next_report = time.monotonic() + self.fleet.stats_interval
+        try:
+            while self.check():
+                time.sleep(CHECK_PERIOD)
+                if time.monotonic() >= next_report:
+                    self.report()
+                    next_report += self.fleet.stats_interval
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+            self.report()
+
+    def close(self, timeout=10.0):
+        """Stop every worker, then the OCR pool"""
+        self.stopping = True
+        self.stop_event.set()
+        deadline = time.monotonic() + timeout
+        for slot in self.slots:
+            if slot.restart_at is not None:
+                slot.restart_at = None
+                slot.state = 'finished'
+            if slot.process:
+                slot.process.join(max(0.0, deadline - time.monotonic()))
+                if slot.process.is_alive():
+                    self.events.warning('worker_killed', "Worker {name} on {display} did not stop, terminating it",
+                                        name=slot.spec.name, display=slot.spec.display)
+                    slot.process.terminate()
+                    slot.process.join()
+        self.check()
+        for process in self.ocr_processes:
+            self.ocr_requests.put(None)
+        for process in self.ocr_processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.ocr_processes = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AutoClicker fleet: one worker process per X display')
+    parser.add_argument('fleet', help='Fleet file (.json or .yaml) listing the displays and their jobs')
+    parser.add_argument('--log-level', choices=['debug', 'info', 'warning', 'error'], default='info',
+                        help='Minimum level of events printed by the supervisor and workers (default: info)')
+    parser.add_argument('--log-file', help='Also append supervisor events as JSON lines to this file')
+    args = parser.parse_args()
+
+    try:
+        fleet = load_fleet(args.fleet)
+    except (OSError, ValueError) as e:
+        print(f"Invalid fleet {args.fleet}: {e}")
+        sys.exit(1)
+
+    event_sinks = [StreamSink(level=args.log_level)]
+    if args.log_file:
+        event_sinks.append(JsonLinesSink(args.log_file, level=args.log_level))
+    supervisor = FleetSupervisor(fleet, event_sinks=event_sinks, log_level=args.log_level)
+    print(f"Supervising {len(fleet.workers)} display(s) with {fleet.ocr_workers} shared OCR process(es)")
+    supervisor.run()
+    supervisor.events.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,126 +9,160 @@ import subprocess
 import json
 import threading
 import time
+from collections import deque
 from tkinter import ttk
 import tkinter as tk
 from tkinter import filedialog, messagebox
 
-def detect_display():
-    """Detect available X11 display and set DISPLAY environment variable"""
-    current_display = os.environ.get('DISPLAY', '')
+# Last working display, tried first on the next start
+DISPLAY_CACHE_FILE = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                                  'autoclicker', 'last_display')
+DISPLAY_PROBE_TIMEOUT = 2.0  # Seconds to wait for all display probes together
 
-    # If DISPLAY is already set and seems valid, try it
-    if current_display and (current_display.startswith(':') or current_display.startswith('localhost:')):
+def probe_display(display):
+    """Check whether an X connection to the display can be opened"""
+    try:
+        from Xlib import display as xlib_display
+    except ImportError:
+        # python-xlib not installed, ask xset instead
         try:
-            # Test if we can connect to the display by running a simple X11 command
-            result = subprocess.run(['xset', '-q'], capture_output=True, timeout=2, env=dict(os.environ))
-            if result.returncode == 0:
-                return True
+            result = subprocess.run(['xset', '-q'], capture_output=True, timeout=DISPLAY_PROBE_TIMEOUT,
+                                    env=dict(os.environ, DISPLAY=display))
+            return result.returncode == 0
         except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
-            pass
+            return False
 
-    # Try to find available displays
-    possible_displays = [':0', ':0.0', ':1', ':1.0', ':10.0', 'localhost:10.0', 'localhost:0.0']
+    try:
+        connection = xlib_display.Display(display)
+        connection.close()
+        return True
+    except Exception:
+        return False
+
+def probe_displays(candidates, timeout=DISPLAY_PROBE_TIMEOUT):
+    """Probe displays in parallel and return the first working one in candidate order"""
+    candidates = list(dict.fromkeys(candidates))  # Drop duplicates, keep priority order
+    results = {}
+    finished = {display: threading.Event() for display in candidates}
+
+    def worker(display):
+        results[display] = probe_display(display)
+        finished[display].set()
+
+    # Daemon threads so a hung connection attempt never blocks exit
+    for display in candidates:
+        threading.Thread(target=worker, args=(display,), daemon=True).start()
+
+    deadline = time.monotonic() + timeout
+    for display in candidates:
+        if finished[display].wait(max(0, deadline - time.monotonic())) and results[display]:
+            return display
+    return None
+
+def load_cached_display():
+    """Return the last working display saved on disk, if any"""
+    try:
+        with open(DISPLAY_CACHE_FILE, 'r') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
 
-    for display in possible_displays:
-        try:
-            # Test the display
-            test_env = dict(os.environ)
-            test_env['DISPLAY'] = display
-            result = subprocess.run(['xset', '-q'], capture_output=True, timeout=2, env=test_env)
-            if result.returncode == 0:
-                os.environ['DISPLAY'] = display
-                print(f"✅ Found working display: {display}")
-                return True
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
-            continue
+def save_cached_display(display):
+    """Remember the working display for the next start"""
+    try:
+        os.makedirs(os.path.dirname(DISPLAY_CACHE_FILE), exist_ok=True)
+        with open(DISPLAY_CACHE_FILE, 'w') as f:
+            f.write(display)
+    except OSError:
+        pass
 
-    # If no display found, try to get from who command or other sources
+def local_x_displays():
+    """List displays with a local X server socket"""
+    try:
+        sockets = os.listdir('/tmp/.X11-unix')
+    except OSError:
+        return []
+    return [f":{name[1:]}" for name in sorted(sockets) if name.startswith('X') and name[1:].isdigit()]
+
+def parse_who_displays(output):
+    """Extract X displays from who output, in its order
+
+    A local X session shows its display as the line ("alice :0 ... (:0)") or
+    as the host in parentheses ("carol pts/2 ... (:1)"); remote logins and
+    text consoles have neither.
+    """
+    displays = []
+    for line in output.splitlines():
+        fields = line.split()
+        host = line[line.find('(') + 1:line.rfind(')')] if '(' in line and ')' in line else ''
+        for candidate in (fields[1] if len(fields) > 1 else '', host):
+            if candidate.startswith(':'):
+                displays.append(candidate)
+                break
+    return displays
+
+def who_displays():
+    """List displays of logged-in users from the who command"""
     try:
         result = subprocess.run(['who'], capture_output=True, text=True, timeout=2)
-        if result.returncode == 0:
-            for line in result.stdout.split('\n'):
-                if '(' in line and ')' in line:
-                    # Extract display from who output like "user :0 (192.168.1.1)"
-                    parts = line.split('(')
-                    if len(parts) > 0:
-                        display_part = parts[0].strip().split()[-1]
-                        if display_part.startswith(':'):
-                            try:
-                                test_env = dict(os.environ)
-                                test_env['DISPLAY'] = display_part
-                                result = subprocess.run(['xset', '-q'], capture_output=True, timeout=2, env=test_env)
-                                if result.returncode == 0:
-                                    os.environ['DISPLAY'] = display_part
-                                    print(f"✅ Found working display from who: {display_part}")
-                                    return True
-                            except:
-                                continue
-    except:
-        pass
+    except (subprocess.TimeoutExpired, subprocess.SubprocessError, OSError):
+        return []
+    return parse_who_displays(result.stdout) if result.returncode == 0 else []
+
+def detect_display():
+    """Detect available X11 display and set DISPLAY environment variable"""
+    current_display = os.environ.get('DISPLAY', '')
+    cached_display = load_cached_display()
+
+    # Current DISPLAY first, then the last working one, then well-known and local displays
+    candidates = []
+    if current_display and (current_display.startswith(':') or current_display.startswith('localhost:')):
+        candidates.append(current_display)
+    if cached_display:
+        candidates.append(cached_display)
+    candidates.extend([':0', ':0.0', ':1', ':1.0', ':10.0', 'localhost:10.0', 'localhost:0.0'])
+    candidates.extend(local_x_displays())
+
+    display = probe_displays(candidates)
+    source = ""
+
+    # If no display found, try the displays of logged-in users
+    if display is None:
+        display = probe_displays(who_displays())
+        source = " from who"
+
+    if display is not None:
+        if display != cached_display:
+            save_cached_display(display)
+        if display != current_display:
+            os.environ['DISPLAY'] = display
+            print(f"✅ Found working display{source}: {display}")
+        return True
 
     print("❌ No working X11 display found. Make sure you're running in a graphical environment.")
     print("💡 Try: export DISPLAY=:0.0")
     print("💡 Or: export DISPLAY=:10.0 (if using SSH)")
     return False
 
-# Detect and set display before importing tkinter
-if not detect_display():
-    print("Cannot run GUI without a working X11 display.")
-    print("Please run this in a graphical environment or set the DISPLAY variable manually.")
-    sys.exit(1)
-
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
-import threading
-import time
-
-# Try to import pyautogui and handle display connection errors
-try:
-    import pyautogui
-    PYAUTOGUI_AVAILABLE = True
-except Exception as e:
-    print(f"PyAutoGUI Error: {e}")
-    PYAUTOGUI_AVAILABLE = False
-    pyautogui = None
-
-    # Try to fix common X11 authentication issues
-    if "Authorization required" in str(e):
-        print("\n🔧 Attempting to fix X11 authentication...")
-        print("This is a common issue. Trying solutions:")
+# Import our autoclicker class; PyAutoGUI connects to the display on import, so it is loaded by load_pyautogui()
+import autoclicker
+from autoclicker import AutoClicker, load_pyautogui
+from autoclicker_events import CallbackSink, DEBUG, INFO
+from autoclicker_preview import DetectionPreview
+from autoclicker_config import ConfigCompiler
+from autoclicker_ocr import parse_profile
+from autoclicker_patterns import parse_pattern
 
-        # Try to disable X11 authentication for local connections
-        import os
-        import subprocess
-
-        try:
-            # Check if we're running locally
-            display = os.environ.get('DISPLAY', '')
-            if display.startswith(':'):
-                print("1. Trying to allow local X11 connections...")
-                subprocess.run(['xhost', '+local:'], check=False, capture_output=True)
-
-                # Try importing again
-                try:
-                    import pyautogui
-                    PYAUTOGUI_AVAILABLE = True
-                    print("✅ Fixed! PyAutoGUI is now available.")
-                except:
-                    print("❌ Fix attempt failed.")
-        except:
-            print("❌ Could not apply X11 authentication fix.")
-
-        if not PYAUTOGUI_AVAILABLE:
-            print("\n📋 Manual solutions:")
-            print("• Run: xhost +local:")
-            print("• Or: export XAUTHORITY=~/.Xauthority")
-            print("• Or use: ssh -X user@localhost")
-            print("• Or set: export DISPLAY=:0.0")
-
-# Import our autoclicker class
-from autoclicker import AutoClicker
+def screen_size():
+    """Return the screen size from PyAutoGUI, loaded when the GUI starts"""
+    return autoclicker.pyautogui.size()
 
 class AutoClickerGUI:
+    LOG_FLUSH_INTERVAL = 50  # Milliseconds between batched log widget updates
+    LOG_MAX_LINES = 1000  # Scrollback kept in the log widget
+    STATUS_POLL_INTERVAL = 500  # Milliseconds between progress bar and status updates while running
+    COMPILE_DELAY = 300  # Milliseconds of editing quiet time before the run configuration is recompiled
+
     def __init__(self, root, args=None):
         self.root = root
         self.root.title("AutoClicker for Ubuntu")
@@ -146,8 +180,23 @@ class AutoClickerGUI:
         self.running = False
         self.thread = None
 
+        # Log messages from any thread, drained by the Tk thread on a fixed tick
+        self.log_queue = deque(maxlen=self.LOG_MAX_LINES)
+        self.last_log_message = None
+        self.last_log_count = 0
+
+        # Live throughput dashboard, only polled while its window is open
+        self.dashboard = None
+        self.last_snapshot = None
+        self.preview_window = None
+
+        # Targets and safety zones are compiled in the background as they are edited
+        self.config_compiler = ConfigCompiler(logger=self.log)
+        self.config_compiler.start()
+        self.compile_after_id = None
+
         # Check PyAutoGUI availability
-        if not PYAUTOGUI_AVAILABLE:
+        if not load_pyautogui():
             messagebox.showerror("Error", "PyAutoGUI not available. Please run in a graphical environment.")
             sys.exit(1)
 
@@ -159,7 +208,14 @@ class AutoClickerGUI:
         if args:
             self.apply_args(args)
 
+        # Recompile whenever the target or safety zone text changes
+        for widget in (self.target_text, self.safety_zones_text):
+            widget.edit_modified(False)
+            widget.bind("<<Modified>>", self.on_config_modified)
+        self.submit_config()
+
         self.log("Hotkeys: F6=Start, F7=Stop")
+        self.root.after(self.LOG_FLUSH_INTERVAL, self.flush_log)
 
         # Bind window close event to save settings
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -207,6 +263,10 @@ class AutoClickerGUI:
         view_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="View", menu=view_menu)
         view_menu.add_command(label="Toggle Dark Mode", command=self.toggle_dark_mode)
+        self.dashboard_var = tk.BooleanVar(value=False)
+        view_menu.add_checkbutton(label="Live Dashboard", variable=self.dashboard_var, command=self.toggle_dashboard)
+        self.preview_var = tk.BooleanVar(value=False)
+        view_menu.add_checkbutton(label="Detection Preview", variable=self.preview_var, command=self.toggle_preview)
 
         # Help menu
         help_menu = tk.Menu(menubar, tearoff=0)
@@ -319,7 +379,7 @@ class AutoClickerGUI:
             self.region_vars.append(var)
 
         # Set default region (full screen)
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = screen_size()
         self.region_vars[0].set(0)  # X
         self.region_vars[1].set(0)  # Y
         self.region_vars[2].set(screen_width)  # Width
@@ -352,6 +412,34 @@ class AutoClickerGUI:
         self.screenshot_debug_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(advanced_frame, text="Screenshot Debug", variable=self.screenshot_debug_var).grid(row=0, column=1, sticky="w", pady=2)
 
+        # Verbose log shows debug events such as per-cycle "No targets found"
+        self.verbose_log_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(advanced_frame, text="Verbose Log", variable=self.verbose_log_var).grid(row=0, column=2, sticky="w", pady=2)
+
+        # OCR engine: persistent backends keep Tesseract loaded instead of starting it per call
+        ttk.Label(advanced_frame, text="OCR Engine:").grid(row=2, column=0, sticky="w", pady=2)
+        self.ocr_backend_var = tk.StringVar(value="pytesseract")
+        ttk.Combobox(advanced_frame, textvariable=self.ocr_backend_var, state="readonly", width=12,
+                     values=["auto", "pytesseract", "tesserocr", "capi"]).grid(row=2, column=1, sticky="w", pady=2)
+
+        # Text region proposals: only likely text areas are sent to OCR
+        self.text_regions_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(advanced_frame, text="Text Regions Only", variable=self.text_regions_var).grid(row=2, column=2, sticky="w", pady=2)
+
+        # OCR tile cache: unchanged screen tiles reuse their previous OCR results
+        self.ocr_cache_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(advanced_frame, text="OCR Tile Cache", variable=self.ocr_cache_var).grid(row=3, column=2, sticky="w", pady=2)
+
+        # Fuzzy text matching: misread characters tolerated per text target
+        ttk.Label(advanced_frame, text="Text Errors:").grid(row=3, column=0, sticky="w", pady=2)
+        self.text_max_errors_var = tk.IntVar(value=0)
+        ttk.Entry(advanced_frame, textvariable=self.text_max_errors_var, width=5).grid(row=3, column=1, sticky="w", pady=2)
+
+        # Default OCR profile for text targets without their own "target | options" suffix
+        ttk.Label(advanced_frame, text="OCR Profile:").grid(row=4, column=0, sticky="w", pady=2)
+        self.ocr_profile_var = tk.StringVar(value="")
+        ttk.Entry(advanced_frame, textvariable=self.ocr_profile_var, width=30).grid(row=4, column=1, columnspan=2, sticky="w", pady=2)
+
         # Hotkey customization
         ttk.Label(advanced_frame, text="Hotkeys:").grid(row=1, column=0, sticky="w", pady=2)
         hotkey_frame = ttk.Frame(advanced_frame)
@@ -449,15 +537,67 @@ class AutoClickerGUI:
 
     def log(self, message):
         """Add message to log (thread-safe)"""
-        self.root.after(0, lambda: self._log(message))
+        # deque.append is atomic, so producers never take a lock or touch Tk
+        self.log_queue.append((time.time(), message))
+
+    def flush_log(self):
+        """Drain queued log messages into the log widget - runs on the main thread"""
+        try:
+            entries = []
+            while True:
+                try:
+                    entries.append(self.log_queue.popleft())
+                except IndexError:
+                    break
+            if entries:
+                self._log_batch(entries)
+        finally:
+            self.root.after(self.LOG_FLUSH_INTERVAL, self.flush_log)
+
+    def _format_log_line(self, timestamp, message, count):
+        line = f"[{time.strftime('%H:%M:%S', time.localtime(timestamp))}] {message}"
+        if count > 1:
+            line += f" (x{count})"
+        return line + "\n"
+
+    def _log_batch(self, entries):
+        """Insert a batch of log messages, collapsing consecutive duplicates into counters"""
+        lines = []  # [timestamp, message, count]
+        replace_last = False
+        for timestamp, message in entries:
+            if lines and lines[-1][1] == message:
+                lines[-1][0] = timestamp
+                lines[-1][2] += 1
+            elif not lines and message == self.last_log_message:
+                # Repeat of the line already shown: rewrite it with the new count
+                replace_last = True
+                lines.append([timestamp, message, self.last_log_count + 1])
+            else:
+                lines.append([timestamp, message, 1])
 
-    def _log(self, message):
-        """Internal log method - must be called from main thread"""
         self.log_text.config(state="normal")
-        self.log_text.insert("end", f"[{time.strftime('%H:%M:%S')}] {message}\n")
+        if replace_last:
+            self.log_text.delete("last_log", "end-1c")
+
+        head = "".join(self._format_log_line(*line) for line in lines[:-1])
+        if head:
+            self.log_text.insert("end", head)
+        # Mark where the last line starts so a later duplicate can replace it
+        self.log_text.mark_set("last_log", "end-1c")
+        self.log_text.mark_gravity("last_log", "left")
+        self.log_text.insert("end", self._format_log_line(*lines[-1]))
+
+        # Trim the oldest lines beyond the scrollback limit
+        line_count = int(self.log_text.index("end-1c").split(".")[0]) - 1
+        if line_count > self.LOG_MAX_LINES:
+            self.log_text.delete("1.0", f"{line_count - self.LOG_MAX_LINES + 1}.0")
+
         self.log_text.see("end")
         self.log_text.config(state="disabled")
 
+        self.last_log_message = lines[-1][1]
+        self.last_log_count = lines[-1][2]
+
     def select_region(self):
         """Allow user to select a region by clicking and dragging"""
         try:
@@ -490,58 +630,48 @@ class AutoClickerGUI:
         h = self.region_vars[3].get()
 
         # Return None if it's the full screen (default)
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = screen_size()
         if x == 0 and y == 0 and w == screen_width and h == screen_height:
             return None
 
         return (x, y, w, h)
 
-    def get_targets(self):
-        """Get targets from the text area, filtering out comments and empty lines"""
-        content = self.target_text.get("1.0", "end-1c")
-        lines = content.split('\n')
-        targets = []
+    def on_config_modified(self, event):
+        """Schedule a background recompile once editing pauses"""
+        event.widget.edit_modified(False)
+        if self.compile_after_id is not None:
+            self.root.after_cancel(self.compile_after_id)
+        self.compile_after_id = self.root.after(self.COMPILE_DELAY, self.submit_config)
 
-        for line in lines:
-            line = line.strip()
-            # Skip empty lines and comments
-            if line and not line.startswith('#'):
-                targets.append(line)
+    def submit_config(self):
+        """Hand the current target and safety zone text to the background compiler"""
+        self.compile_after_id = None
+        self.config_compiler.submit(self.target_text.get("1.0", "end-1c"),
+                                    self.safety_zones_text.get("1.0", "end-1c"))
 
-        return targets
+    def get_run_config(self):
+        """Get the compiled run configuration, compiling now only if the background result is stale"""
+        return self.config_compiler.get(self.target_text.get("1.0", "end-1c"),
+                                        self.safety_zones_text.get("1.0", "end-1c"))
+
+    def get_targets(self):
+        """Get targets from the text area, filtering out comments and empty lines"""
+        return self.get_run_config().targets
 
     def get_safety_zones(self):
-        """Parse safety zones from the text area"""
-        content = self.safety_zones_text.get("1.0", "end-1c")
-        lines = content.split('\n')
-        safety_zones = []
-
-        for line in lines:
-            line = line.strip()
-            # Skip empty lines and comments
-            if line and not line.startswith('#'):
-                try:
-                    # Parse x,y,width,height format
-                    parts = line.split(',')
-                    if len(parts) == 4:
-                        x, y, w, h = map(int, [p.strip() for p in parts])
-                        if x >= 0 and y >= 0 and w > 0 and h > 0:
-                            safety_zones.append((x, y, w, h))
-                        else:
-                            self.log(f"Invalid safety zone coordinates: {line}")
-                    else:
-                        self.log(f"Invalid safety zone format: {line}")
-                except ValueError as e:
-                    self.log(f"Error parsing safety zone '{line}': {e}")
-
-        return safety_zones
+        """Get the parsed safety zones, logging lines that failed validation"""
+        config = self.get_run_config()
+        for error in config.errors:
+            self.log(error)
+        return config.zones
 
     def start_autoclicker(self):
         if self.running:
             return
 
         mode = self.mode_var.get()
-        targets = self.get_targets()
+        config = self.get_run_config()
+        targets = config.targets
 
         if not targets:
             messagebox.showerror("Error", "Please specify at least one target")
@@ -550,14 +680,16 @@ class AutoClickerGUI:
         # Validate image targets if in image mode
         if mode == "image":
             for target in targets:
-                if not os.path.exists(target):
+                if target not in config.existing:
                     messagebox.showerror("Error", f"Image file not found: {target}")
                     return
 
         try:
             region = self.get_region()
-            safety_zones = self.get_safety_zones()
+            for error in config.errors:
+                self.log(error)
             max_runtime = self.max_runtime_var.get() if self.max_runtime_var.get() > 0 else None
+            ocr_profile = parse_profile(self.ocr_profile_var.get())
 
             # Setup hotkeys
             hotkeys = {
@@ -571,8 +703,16 @@ class AutoClickerGUI:
                 interval=self.interval_var.get(),
                 region=region,
                 cache_duration=self.cache_var.get(),
-                logger=self.log,
-                safety_zones=safety_zones,
+                event_sinks=[CallbackSink(self.log, level=DEBUG if self.verbose_log_var.get() else INFO)],
+                safety_zones=config.zone_index,
+                templates=config.templates,
+                ocr_backend=self.ocr_backend_var.get(),
+                text_regions=self.text_regions_var.get(),
+                ocr_cache=self.ocr_cache_var.get(),
+                text_max_errors=self.text_max_errors_var.get(),
+                ocr_profile=ocr_profile,
+                ocr_profiles=config.profiles,
+                target_schedules=config.schedules,
                 max_runtime=max_runtime,
                 sound_feedback=self.sound_feedback_var.get(),
                 screenshot_debug=self.screenshot_debug_var.get(),
@@ -587,6 +727,8 @@ class AutoClickerGUI:
             self.status_label.config(foreground="green")
 
             self.log(f"Starting autoclicker with {len(targets)} target(s)...")
+            self.last_snapshot = None
+            self.root.after(self.STATUS_POLL_INTERVAL, self.poll_run_status)
 
             # Start in a separate thread
             self.thread = threading.Thread(target=self.run_autoclicker, args=(mode, targets), daemon=True)
@@ -641,10 +783,9 @@ class AutoClickerGUI:
                 patterns = []
                 for target in targets:
                     try:
-                        pattern = eval(target)  # Simple eval for pattern dict
-                        patterns.append(pattern)
-                    except:
-                        self.log(f"Invalid pattern format: {target}")
+                        patterns.append(parse_pattern(target))
+                    except (OSError, ValueError) as e:
+                        self.log(f"Invalid pattern {target}: {e}")
                 if patterns:
                     self.autoclicker.run_pattern_clicker(patterns)
             else:  # mixed mode
@@ -654,13 +795,60 @@ class AutoClickerGUI:
         except Exception as e:
             self.log(f"Error during execution: {e}")
         finally:
+            self.autoclicker.close()
             self.running = False
             self.root.after(0, self.reset_ui)
 
+    def poll_run_status(self):
+        """Update the progress bar and status line from the engine's stats snapshot"""
+        if not self.running or not self.autoclicker:
+            return
+
+        snapshot = self.autoclicker.stats_snapshot()
+        rates = snapshot_rates(self.last_snapshot, snapshot)
+        self.last_snapshot = snapshot
+
+        max_runtime = self.autoclicker.max_runtime
+        if max_runtime:
+            self.progress_var.set(min(100.0, snapshot['elapsed_time'] / max_runtime * 100))
+
+        if not snapshot['paused'] and rates:
+            self.status_var.set(f"Running... {rates['cycles']:.1f} cycles/s, {snapshot['clicks']} clicks")
+
+        self.root.after(self.STATUS_POLL_INTERVAL, self.poll_run_status)
+
+    def toggle_dashboard(self):
+        """Show or hide the live throughput dashboard"""
+        if self.dashboard_var.get():
+            if self.dashboard is None:
+                self.dashboard = DashboardWindow(self.root, lambda: self.autoclicker, self.on_dashboard_closed)
+        elif self.dashboard is not None:
+            self.dashboard.close()
+
+    def on_dashboard_closed(self):
+        """Forget the dashboard once its window has been closed"""
+        self.dashboard = None
+        self.dashboard_var.set(False)
+
+    def toggle_preview(self):
+        """Show or hide the live detection preview"""
+        if self.preview_var.get():
+            if self.preview_window is None:
+                self.preview_window = PreviewWindow(self.root, lambda: self.autoclicker, self.on_preview_closed,
+                                                    logger=self.log)
+        elif self.preview_window is not None:
+            self.preview_window.close()
+
+    def on_preview_closed(self):
+        """Forget the preview once its window has been closed"""
+        self.preview_window = None
+        self.preview_var.set(False)
+
     def reset_ui(self):
         self.start_button.config(state="normal")
         self.pause_button.config(state="disabled")
         self.stop_button.config(state="disabled")
+        self.progress_var.set(0)
         self.status_var.set("Ready")
         self.status_label.config(foreground="blue")
         self.pause_button.config(text="Pause (F8)")
@@ -684,6 +872,12 @@ class AutoClickerGUI:
                 "targets": self.target_text.get("1.0", "end-1c"),
                 "sound_feedback": self.sound_feedback_var.get(),
                 "screenshot_debug": self.screenshot_debug_var.get(),
+                "verbose_log": self.verbose_log_var.get(),
+                "ocr_backend": self.ocr_backend_var.get(),
+                "text_regions": self.text_regions_var.get(),
+                "ocr_cache": self.ocr_cache_var.get(),
+                "text_max_errors": self.text_max_errors_var.get(),
+                "ocr_profile": self.ocr_profile_var.get(),
                 "hotkeys": {
                     "start": self.hotkey_start_var.get(),
                     "stop": self.hotkey_stop_var.get(),
@@ -729,8 +923,8 @@ class AutoClickerGUI:
                     region = settings["region"]
                     self.region_vars[0].set(region.get("x", 0))
                     self.region_vars[1].set(region.get("y", 0))
-                    self.region_vars[2].set(region.get("width", pyautogui.size()[0]))
-                    self.region_vars[3].set(region.get("height", pyautogui.size()[1]))
+                    self.region_vars[2].set(region.get("width", screen_size()[0]))
+                    self.region_vars[3].set(region.get("height", screen_size()[1]))
 
                 if "targets" in settings:
                     self.target_text.delete("1.0", "end")
@@ -742,6 +936,24 @@ class AutoClickerGUI:
                 if "screenshot_debug" in settings:
                     self.screenshot_debug_var.set(settings["screenshot_debug"])
 
+                if "verbose_log" in settings:
+                    self.verbose_log_var.set(settings["verbose_log"])
+
+                if "ocr_backend" in settings:
+                    self.ocr_backend_var.set(settings["ocr_backend"])
+
+                if "text_regions" in settings:
+                    self.text_regions_var.set(settings["text_regions"])
+
+                if "ocr_cache" in settings:
+                    self.ocr_cache_var.set(settings["ocr_cache"])
+
+                if "text_max_errors" in settings:
+                    self.text_max_errors_var.set(settings["text_max_errors"])
+
+                if "ocr_profile" in settings:
+                    self.ocr_profile_var.set(settings["ocr_profile"])
+
                 if "hotkeys" in settings:
                     hotkeys = settings["hotkeys"]
                     self.hotkey_start_var.set(hotkeys.get("start", "f6"))
@@ -776,6 +988,12 @@ class AutoClickerGUI:
                     "targets": self.target_text.get("1.0", "end-1c"),
                     "sound_feedback": self.sound_feedback_var.get(),
                     "screenshot_debug": self.screenshot_debug_var.get(),
+                    "verbose_log": self.verbose_log_var.get(),
+                    "ocr_backend": self.ocr_backend_var.get(),
+                    "text_regions": self.text_regions_var.get(),
+                    "ocr_cache": self.ocr_cache_var.get(),
+                    "text_max_errors": self.text_max_errors_var.get(),
+                    "ocr_profile": self.ocr_profile_var.get(),
                     "hotkeys": {
                         "start": self.hotkey_start_var.get(),
                         "stop": self.hotkey_stop_var.get(),
@@ -827,8 +1045,8 @@ class AutoClickerGUI:
                     region = settings["region"]
                     self.region_vars[0].set(region.get("x", 0))
                     self.region_vars[1].set(region.get("y", 0))
-                    self.region_vars[2].set(region.get("width", pyautogui.size()[0]))
-                    self.region_vars[3].set(region.get("height", pyautogui.size()[1]))
+                    self.region_vars[2].set(region.get("width", screen_size()[0]))
+                    self.region_vars[3].set(region.get("height", screen_size()[1]))
 
                 if "targets" in settings:
                     self.target_text.delete("1.0", "end")
@@ -896,9 +1114,208 @@ Created with safety and reliability in mind."""
     def on_closing(self):
         """Handle window close event"""
         self.save_settings()
+        self.config_compiler.close()
         self.root.destroy()
 
 
+def snapshot_rates(previous, current):
+    """Per-second cycle, capture and click rates between two engine stats snapshots
+
+    Returns None when there is no usable previous snapshot, e.g. on the first poll
+    or after a new run replaced the engine's counters.
+    """
+    if previous is None:
+        return None
+    elapsed = current['time'] - previous['time']
+    if elapsed <= 0 or current['cycles'] < previous['cycles']:
+        return None
+    return {key: (current[key] - previous[key]) / elapsed for key in ('cycles', 'captures', 'clicks')}
+
+
+class DashboardWindow:
+    """Live throughput dashboard with rolling rates and latency sparklines
+
+    The dashboard polls AutoClicker.stats_snapshot() from the Tk thread a few
+    times per second and keeps all history itself, so the detection thread does
+    no extra work whether or not the window is open. Closing the window cancels
+    the poll entirely.
+    """
+    POLL_INTERVAL = 250  # Milliseconds between snapshots
+    HISTORY = 120  # Samples kept per sparkline (30 seconds at the poll interval)
+    RATE_WINDOW = 4  # Samples averaged for the displayed rates
+    MAX_TARGETS = 6  # Per-target latency rows shown
+    WIDTH = 380
+    ROW_HEIGHT = 36
+
+    def __init__(self, parent, get_clicker, on_close=None):
+        self.get_clicker = get_clicker
+        self.on_close = on_close
+        self.clicker = None
+        self.last_snapshot = None
+        self.rates = {key: deque(maxlen=self.HISTORY) for key in ('cycles', 'captures', 'clicks')}
+        self.latency = {}  # Target -> deque of latencies in milliseconds
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Live Dashboard")
+        self.window.attributes('-topmost', True)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        rates_frame = ttk.LabelFrame(self.window, text="Throughput", padding=10)
+        rates_frame.pack(fill="x", padx=10, pady=5)
+        self.rate_vars = {}
+        for row, (key, label) in enumerate([('cycles', "Cycle rate"), ('captures', "Capture FPS"),
+                                            ('clicks', "Click rate")]):
+            ttk.Label(rates_frame, text=f"{label}:").grid(row=row, column=0, sticky="w")
+            self.rate_vars[key] = tk.StringVar(value="-")
+            ttk.Label(rates_frame, textvariable=self.rate_vars[key], width=10).grid(row=row, column=1, sticky="w")
+        self.rates_canvas = tk.Canvas(rates_frame, width=200, height=3 * 20, bg='white', highlightthickness=0)
+        self.rates_canvas.grid(row=0, column=2, rowspan=3, padx=(10, 0))
+
+        latency_frame = ttk.LabelFrame(self.window, text="Match Latency", padding=10)
+        latency_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        self.latency_canvas = tk.Canvas(latency_frame, width=self.WIDTH,
+                                        height=self.MAX_TARGETS * self.ROW_HEIGHT, bg='white', highlightthickness=0)
+        self.latency_canvas.pack(fill="both", expand=True)
+
+        self.after_id = self.window.after(self.POLL_INTERVAL, self.poll)
+
+    def poll(self):
+        """Take a stats snapshot and redraw"""
+        self.after_id = None
+        clicker = self.get_clicker()
+        if clicker is not self.clicker:
+            # A new run starts from fresh counters
+            self.clicker = clicker
+            self.last_snapshot = None
+            for history in self.rates.values():
+                history.clear()
+            self.latency.clear()
+
+        if clicker is not None:
+            snapshot = clicker.stats_snapshot()
+            rates = snapshot_rates(self.last_snapshot, snapshot)
+            self.last_snapshot = snapshot
+            if rates and not snapshot['paused']:
+                for key, value in rates.items():
+                    self.rates[key].append(value)
+                for target, seconds in snapshot['match_latency'].items():
+                    if target not in self.latency and len(self.latency) >= self.MAX_TARGETS:
+                        continue
+                    self.latency.setdefault(target, deque(maxlen=self.HISTORY)).append(seconds * 1000)
+            self.redraw()
+
+        self.after_id = self.window.after(self.POLL_INTERVAL, self.poll)
+
+    def redraw(self):
+        """Redraw rate labels and sparklines from the kept history"""
+        units = {'cycles': "/s", 'captures': " fps", 'clicks': "/s"}
+        canvas = self.rates_canvas
+        canvas.delete("all")
+        for row, (key, history) in enumerate(self.rates.items()):
+            if history:
+                recent = list(history)[-self.RATE_WINDOW:]
+                self.rate_vars[key].set(f"{sum(recent) / len(recent):.1f}{units[key]}")
+            draw_sparkline(canvas, 0, row * 20 + 2, 200, 16, history, color='#1f77b4')
+
+        canvas = self.latency_canvas
+        canvas.delete("all")
+        if not self.latency:
+            canvas.create_text(10, 10, anchor="nw", text="No detections yet", fill='gray')
+        for row, (target, history) in enumerate(self.latency.items()):
+            top = row * self.ROW_HEIGHT
+            name = os.path.basename(target) if os.path.sep in target else target
+            canvas.create_text(0, top + 2, anchor="nw", text=f"{name[:24]}: {history[-1]:.1f} ms (max {max(history):.1f})",
+                               font=('TkDefaultFont', 8))
+            draw_sparkline(canvas, 0, top + 16, self.WIDTH, self.ROW_HEIGHT - 20, history, color='#d62728')
+
+    def close(self):
+        """Stop polling and destroy the window"""
+        if self.after_id is not None:
+            self.window.after_cancel(self.after_id)
+            self.after_id = None
+        self.window.destroy()
+        if self.on_close:
+            self.on_close()
+
+
+class PreviewWindow:
+    """Live detection preview showing the latest frame with match, score and OCR boxes
+
+    The preview attaches a DetectionPreview to the running engine, which hands
+    over one frame per cycle through a latest-only slot. Downscaling, drawing
+    and encoding happen on the preview's worker thread; the Tk thread only
+    swaps the finished image in at the capped frame rate.
+    """
+    MAX_WIDTH = 480
+    MAX_FPS = 5
+
+    def __init__(self, parent, get_clicker, on_close=None, logger=None):
+        self.get_clicker = get_clicker
+        self.on_close = on_close
+        self.clicker = None
+        self.photo = None  # Keep a reference so Tk does not discard the image
+
+        self.preview = DetectionPreview(max_width=self.MAX_WIDTH, max_fps=self.MAX_FPS, logger=logger)
+        self.preview.start()
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Detection Preview")
+        self.window.attributes('-topmost', True)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.image_label = ttk.Label(self.window, text="Waiting for the next detection cycle...", anchor="center")
+        self.image_label.pack(fill="both", expand=True, padx=5, pady=5)
+
+        self.after_id = self.window.after(0, self.poll)
+
+    def poll(self):
+        """Attach to the current run and show the newest rendered frame"""
+        self.after_id = None
+        clicker = self.get_clicker()
+        if clicker is not self.clicker:
+            self.detach()
+            self.clicker = clicker
+            if clicker is not None:
+                clicker.preview = self.preview
+
+        data = self.preview.latest()
+        if data is not None:
+            self.photo = tk.PhotoImage(data=data)
+            self.image_label.configure(image=self.photo, text="")
+
+        self.after_id = self.window.after(int(1000 / self.MAX_FPS), self.poll)
+
+    def detach(self):
+        """Stop the current engine feeding this preview"""
+        if self.clicker is not None and self.clicker.preview is self.preview:
+            self.clicker.preview = None
+
+    def close(self):
+        """Detach from the engine, stop the renderer and destroy the window"""
+        if self.after_id is not None:
+            self.window.after_cancel(self.after_id)
+            self.after_id = None
+        self.detach()
+        self.preview.close()
+        self.window.destroy()
+        if self.on_close:
+            self.on_close()
+
+
+def draw_sparkline(canvas, x, y, width, height, values, color='black'):
+    """Draw values as a line scaled to fit the given canvas box"""
+    if len(values) < 2:
+        return
+    values = list(values)
+    low = min(values)
+    span = (max(values) - low) or 1.0
+    step = width / (len(values) - 1)
+    points = []
+    for i, value in enumerate(values):
+        points.extend((x + i * step, y + height - (value - low) / span * height))
+    canvas.create_line(*points, fill=color)
+
+
 class RegionSelector:
     """Full-screen region selection tool"""
     def __init__(self, parent, callback):
@@ -1001,6 +1418,12 @@ def main():
 
     args = parser.parse_args()
 
+    # Detect and set display before creating any window
+    if not detect_display():
+        print("Cannot run GUI without a working X11 display.")
+        print("Please run this in a graphical environment or set the DISPLAY variable manually.")
+        sys.exit(1)
+
     root = tk.Tk()
     gui = AutoClickerGUI(root, args)
     root.lift()  # Bring window to front
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Input hooks for AutoClicker - One process-wide keyboard listener shared by every subscriber
+"""
+
+import itertools
+import threading
+
+
+def keyboard_listener(on_press):
+    """Create a pynput keyboard listener, importing pynput on first use"""
+    from pynput import keyboard
+    return keyboard.Listener(on_press=on_press)
+
+
+class InputHooks:
+    """Fan key presses from a single keyboard listener out to subscribers
+
+    The listener thread, and its connection to the display, is started by the
+    first subscribe() and stopped when the last subscriber unsubscribes, so
+    clickers created and closed over and over never accumulate listeners.
+    Every key press reaches each subscriber once.
+    """
+    def __init__(self, listener_factory=keyboard_listener, logger=print):
+        self.listener_factory = listener_factory
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.subscribers = {}  # Token -> callback, in subscription order
+        self.tokens = itertools.count(1)
+        self.listener = None
+
+    def subscribe(self, callback):
+        """Call callback(key) for every key press until unsubscribed; returns the subscription token"""
+        with self.lock:
+            if self.listener is None:
+                listener = self.listener_factory(self.dispatch)
+                listener.start()
+                self.listener = listener
+            token = next(self.tokens)
+            self.subscribers[token] = callback
+            return token
+
+    def unsubscribe(self, token):
+        """End a subscription; unknown or already ended tokens are ignored"""
+        with self.lock:
+            if self.subscribers.pop(token, None) is None or self.subscribers or self.listener is None:
+                return
+            listener, self.listener = self.listener, None
+        listener.stop()
+        if listener is not threading.current_thread():  # A subscriber may unsubscribe from its callback
+            listener.join()
+
+    def dispatch(self, key):
+        with self.lock:
+            callbacks = list(self.subscribers.values())
+        for callback in callbacks:
+            try:
+                callback(key)
+            except Exception as e:  # One failing subscriber must not keep the key from the others
+                if self.logger:
+                    self.logger(f"Input hook failed: {e}")
+
+
+# The process-wide service used by AutoClicker
+HOOKS = InputHooks()
+
+
+def subscribe(callback):
+    return HOOKS.subscribe(callback)
+
+
+def unsubscribe(token):
+    HOOKS.unsubscribe(token)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Macro recorder for AutoClicker - Captures mouse and keyboard input into click pattern definitions
+"""
+
+import threading
+import time
+
+# Mouse moves closer together than this are coalesced into one point while recording
+COALESCE_NS = 10_000_000
+# Mouse paths are simplified until no dropped point is further than this many pixels from the kept path
+MOVE_TOLERANCE = 3.0
+# A press and release of a button within this many pixels is recorded as a click rather than a drag
+CLICK_SLOP = 3
+
+MODIFIERS = ('ctrl', 'alt', 'shift', 'win')
+
+# pynput key names that differ from their PyAutoGUI names once '_l'/'_r' is stripped
+KEY_NAMES = {
+    'cmd': 'win',
+    'alt_gr': 'altright',
+    'menu': 'apps',
+    'media_play_pause': 'playpause',
+    'media_volume_mute': 'volumemute',
+    'media_volume_down': 'volumedown',
+    'media_volume_up': 'volumeup',
+    'media_previous': 'prevtrack',
+    'media_next': 'nexttrack',
+}
+
+
+def key_name(name):
+    """Translate a pynput key name or character into the name PyAutoGUI presses"""
+    if len(name) == 1:
+        if ord(name) < 32 and name not in '\t\n\r':
+            return chr(ord(name) + 96)  # Control characters some platforms report while ctrl is held
+        return name
+    if name in KEY_NAMES:
+        return KEY_NAMES[name]
+    if name.endswith(('_l', '_r')):
+        name = name[:-2]
+    return KEY_NAMES.get(name, name.replace('_', ''))
+
+
+def simplify_path(points, tolerance=MOVE_TOLERANCE):
+    """Reduce a mouse path with the Douglas-Peucker algorithm
+
+    points are (t, x, y) tuples. The first and last points are always kept;
+    a point in between is kept only if dropping it would move the path by more
+    than tolerance pixels. Kept points keep their timestamps.
+    """
+    if len(points) < 3:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        _, x1, y1 = points[first]
+        _, x2, y2 = points[last]
+        dx, dy = x2 - x1, y2 - y1
+        length = (dx * dx + dy * dy) ** 0.5
+        farthest, distance = None, tolerance
+        for i in range(first + 1, last):
+            _, x, y = points[i]
+            if length:
+                d = abs(dy * (x - x1) - dx * (y - y1)) / length
+            else:
+                d = ((x - x1) ** 2 + (y - y1) ** 2) ** 0.5
+            if d > distance:
+                farthest, distance = i, d
+        if farthest is not None:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def build_steps(events, duration_ns=None, tolerance=MOVE_TOLERANCE):
+    """Turn recorded input events into click pattern steps
+
+    events are (t_ns, kind, *data) tuples with t_ns relative to the start of
+    the recording: ('move', x, y), ('press', x, y, button), ('release', x, y,
+    button), ('key_down', name) and ('key_up', name) with PyAutoGUI key names.
+    Each step carries its offset in 'at'. A press and release in place becomes
+    a click, anything else a down/move/up drag. Runs of printable characters
+    become one 'type' step and keys pressed while ctrl, alt or win is held a
+    'hotkey'. Mouse paths are simplified with simplify_path(). When duration_ns
+    is given, the last step waits until then so a replay lasts as long as the
+    recording.
+    """
+    steps = []
+    cursor = None  # Last (t, x, y) the mouse is known to be at
+    path = []  # Moves since the last emitted mouse position
+    typed = None  # Step collecting a run of typed characters
+    held = []  # Modifiers currently held, in the order they were pressed
+    lone_modifier = None  # Modifier pressed with nothing else so far
+
+    def at(t_ns):
+        return round(t_ns / 1e9, 3)
+
+    def flush_path(end=None):
+        """Emit the simplified moves, ending where the next mouse action happens"""
+        nonlocal cursor
+        if not path and end is None:
+            return
+        points = ([cursor] if cursor else []) + path + ([end] if end else [])
+        kept = simplify_path(points, tolerance)
+        if cursor:
+            kept = kept[1:]
+        if end:
+            kept = kept[:-1]
+        for t, x, y in kept:
+            steps.append({'at': at(t), 'move': [x, y]})
+        cursor = end or (path[-1] if path else cursor)
+        path.clear()
+
+    skip = set()  # Indices of events already folded into a click
+    for index, event in enumerate(events):
+        if index in skip:
+            continue
+        t, kind = event[0], event[1]
+        if kind == 'move':
+            typed = None
+            path.append((t, event[2], event[3]))
+        elif kind in ('press', 'release'):
+            _, _, x, y, button = event
+            typed = None
+            lone_modifier = False
+            flush_path((t, x, y))
+            step = {'at': at(t)}
+            if kind == 'press':
+                release = _matching_release(events, index, button)
+                if release is not None and all(abs(events[i][2] - x) <= CLICK_SLOP and abs(events[i][3] - y) <= CLICK_SLOP
+                                               for i in range(index + 1, release) if events[i][1] == 'move'):
+                    skip.update(i for i in range(index + 1, release + 1) if events[i][1] in ('move', 'release'))
+                    step['click'] = [x, y]
+                else:
+                    step['down'] = [x, y]
+            else:
+                step['up'] = [x, y]
+            if button != 'left':
+                step['button'] = button
+            steps.append(step)
+        elif kind == 'key_down':
+            name = event[2]
+            if name in MODIFIERS:
+                if name not in held:  # Ignore auto-repeat of a held modifier
+                    lone_modifier = False if held else name
+                    held.append(name)
+                continue
+            lone_modifier = False
+            if any(modifier != 'shift' for modifier in held) or (held and len(name) > 1):
+                typed = None
+                steps.append({'at': at(t), 'hotkey': held + [name]})
+            elif len(name) == 1:  # Shift is already applied to the character
+                if typed is None:
+                    typed = {'at': at(t), 'type': ''}
+                    steps.append(typed)
+                typed['type'] += name
+            else:
+                typed = None
+                steps.append({'at': at(t), 'key': name})
+        elif kind == 'key_up' and event[2] in held:
+            name = event[2]
+            held.remove(name)
+            if lone_modifier == name:
+                typed = None
+                steps.append({'at': at(t), 'key': name})
+    flush_path()
+    # Moves are emitted when their path ends, which may be after keys pressed along the way
+    steps.sort(key=lambda step: step['at'])
+
+    if duration_ns is not None and steps and at(duration_ns) > steps[-1]['at']:
+        steps[-1]['wait'] = round(at(duration_ns) - steps[-1]['at'], 3)
+    return steps
+
+
+def _matching_release(events, index, button):
+    """Index of the release of the button pressed at events[index], or None"""
+    for i in range(index + 1, len(events)):
+        kind = events[i][1]
+        if kind in ('press', 'release') and events[i][4] == button:
+            return i if kind == 'release' else None
+    return None
+
+
+class MacroRecorder:
+    """Record mouse and keyboard input with pynput until a stop key is pressed
+
+    Events are timestamped with perf_counter_ns relative to start(). Mouse
+    moves arriving within coalesce_ms of the first move of a burst replace one
+    another, so a fast mouse does not flood the recording.
+    """
+    def __init__(self, stop_key='f9', coalesce_ms=COALESCE_NS / 1e6):
+        self.stop_key = stop_key
+        self.coalesce_ns = int(coalesce_ms * 1_000_000)
+        self.events = []
+        self.origin = None
+        self.duration_ns = None
+        self.stopped = threading.Event()
+        self.lock = threading.Lock()  # Mouse and keyboard listeners run on separate threads
+        self.listeners = []
+        self._burst_start = None  # Time of the first move of the current coalesced burst
+
+    def start(self):
+        """Start listening to the mouse and keyboard"""
+        from pynput import keyboard, mouse
+        self.origin = time.perf_counter_ns()
+        self.listeners = [mouse.Listener(on_move=self.on_move, on_click=self.on_click),
+                          keyboard.Listener(on_press=self.on_press, on_release=self.on_release)]
+        for listener in self.listeners:
+            listener.start()
+
+    def wait(self, timeout=None):
+        """Block until the stop key is pressed; returns False on timeout"""
+        return self.stopped.wait(timeout)
+
+    def stop(self):
+        """Stop listening; the recording ends now unless the stop key already ended it"""
+        if self.duration_ns is None and self.origin is not None:
+            self.duration_ns = time.perf_counter_ns() - self.origin
+        self.stopped.set()
+        for listener in self.listeners:
+            listener.stop()
+        self.listeners = []
+
+    def add(self, kind, *data):
+        t = time.perf_counter_ns() - self.origin
+        with self.lock:
+            if kind == 'move':
+                if self.events and self.events[-1][1] == 'move' and t - self._burst_start < self.coalesce_ns:
+                    self.events[-1] = (t, kind) + data
+                    return
+                self._burst_start = t
+            self.events.append((t, kind) + data)
+
+    def on_move(self, x, y):
+        self.add('move', int(x), int(y))
+
+    def on_click(self, x, y, button, pressed):
+        self.add('press' if pressed else 'release', int(x), int(y), button.name)
+
+    def _key(self, key):
+        name = getattr(key, 'char', None) or getattr(key, 'name', None)
+        return key_name(name) if name else None
+
+    def on_press(self, key):
+        name = getattr(key, 'name', None) or getattr(key, 'char', None)
+        if name == self.stop_key:
+            if self.duration_ns is None:
+                self.duration_ns = time.perf_counter_ns() - self.origin
+            self.stopped.set()
+            return
+        name = self._key(key)
+        if name:
+            self.add('key_down', name)
+
+    def on_release(self, key):
+        name = getattr(key, 'name', None) or getattr(key, 'char', None)
+        if name == self.stop_key or self.stopped.is_set():
+            return
+        name = self._key(key)
+        if name:
+            self.add('key_up', name)
+
+    def to_pattern(self, name='Recorded macro', tolerance=MOVE_TOLERANCE):
+        """The recording as a pattern definition for autoclicker_patterns"""
+        with self.lock:
+            events = list(self.events)
+        return {'name': name, 'steps': build_steps(events, self.duration_ns, tolerance)}
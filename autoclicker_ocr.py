@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+"""
+OCR backends for AutoClicker - pytesseract subprocesses or persistent in-process Tesseract engines
+"""
+
+import ctypes
+import ctypes.util
+import functools
+import hashlib
+import os
+import queue
+import re
+import threading
+from collections import OrderedDict
+
+BACKENDS = ('auto', 'pytesseract', 'tesserocr', 'capi')
+
+# Columns of Tesseract's TSV output, as returned by pytesseract.image_to_data
+TSV_COLUMNS = ('level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+               'left', 'top', 'width', 'height', 'conf', 'text')
+
+# Preprocessing variants tried by AutoClicker.find_text, in order
+PREPROCESS_METHODS = ('original', 'blurred', 'threshold', 'adaptive_threshold', 'morphology', 'enhanced', 'bilateral')
+
+# Options of an OCR profile as written in target lists, see parse_profile
+PROFILE_KEYS = ('psm', 'whitelist', 'lang', 'scale', 'preprocess')
+
+# Columns of word rows returned by TileOcrCache, in the order of its word tuples
+WORD_COLUMNS = ('left', 'top', 'width', 'height', 'conf', 'text')
+
+
+def parse_tsv(tsv):
+    """Parse Tesseract TSV output into the dict layout of pytesseract's Output.DICT"""
+    data = {column: [] for column in TSV_COLUMNS}
+    for line in tsv.splitlines():
+        fields = line.split('\t')
+        if len(fields) < len(TSV_COLUMNS) - 1 or fields[0] == 'level':
+            continue  # Header or malformed line
+        if len(fields) == len(TSV_COLUMNS) - 1:
+            fields.append('')  # Rows without a word have no text column
+        for column, value in zip(TSV_COLUMNS[:-2], fields):
+            data[column].append(int(value))
+        data['conf'].append(float(fields[10]))
+        data['text'].append('\t'.join(fields[11:]))
+    return data
+
+
+def image_bytes(image):
+    """Return (buffer, width, height, bytes_per_pixel, bytes_per_line) for a grayscale or BGR image"""
+    import cv2
+    import numpy as np
+
+    if image.ndim == 3 and image.shape[2] == 4:
+        image = cv2.cvtColor(image, cv2.COLOR_BGRA2RGB)
+    elif image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width = image.shape[:2]
+    bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+    return image, width, height, bytes_per_pixel, width * bytes_per_pixel
+
+
+class OcrProfile:
+    """Tesseract settings for a text target, compiled once into the configuration each backend needs
+
+    psm is Tesseract's page segmentation mode (e.g. 7 for a single line),
+    whitelist limits the characters recognized, language overrides the
+    backend's language, scale enlarges the image before OCR and preprocess
+    names the find_text preprocessing variants to try (None tries them all).
+    """
+    def __init__(self, psm=None, whitelist=None, language=None, scale=1.0, preprocess=None):
+        if psm is not None and not 0 <= psm <= 13:
+            raise ValueError("Page segmentation mode must be between 0 and 13")
+        if whitelist is not None and (not whitelist or any(c.isspace() for c in whitelist)):
+            raise ValueError("Character whitelist must be non-empty and contain no spaces")
+        if language is not None and not re.fullmatch(r'[A-Za-z_]+(\+[A-Za-z_]+)*', language):
+            raise ValueError(f"Invalid OCR language: {language}")
+        if not 0 < scale <= 8:
+            raise ValueError("OCR scale must be greater than 0 and at most 8")
+        if preprocess is not None:
+            preprocess = tuple(preprocess)
+            unknown = [method for method in preprocess if method not in PREPROCESS_METHODS]
+            if unknown or not preprocess:
+                raise ValueError(f"Preprocessing must be chosen from: {', '.join(PREPROCESS_METHODS)}")
+
+        self.psm = psm
+        self.whitelist = whitelist
+        self.language = language
+        self.scale = scale
+        self.preprocess = preprocess
+
+        # Compiled forms: command line config for pytesseract, variables for in-process engines
+        options = []
+        if psm is not None:
+            options.append(f"--psm {psm}")
+        if whitelist is not None:
+            options.append(f"-c tessedit_char_whitelist={whitelist}")
+        self.config = ' '.join(options)
+        self.variables = {'tessedit_char_whitelist': whitelist or ''}
+        self.key = (psm, whitelist, language)  # Settings that change OCR output for the same image
+
+    def __repr__(self):
+        return (f"OcrProfile(psm={self.psm!r}, whitelist={self.whitelist!r}, language={self.language!r}, "
+                f"scale={self.scale!r}, preprocess={self.preprocess!r})")
+
+
+DEFAULT_PROFILE = OcrProfile()
+
+
+@functools.lru_cache(maxsize=256)
+def parse_profile(text):
+    """Parse 'psm=7 whitelist=0123456789 lang=eng scale=2 preprocess=original,threshold' into an OcrProfile
+
+    Identical profile texts share one compiled OcrProfile. Raises ValueError
+    for unknown keys or invalid values.
+    """
+    options = {}
+    for token in text.split():
+        key, separator, value = token.partition('=')
+        if key not in PROFILE_KEYS:
+            raise ValueError(f"Unknown OCR profile option '{key}'")
+        if not separator or not value:
+            raise ValueError(f"Invalid OCR profile option '{token}', expected key=value")
+        try:
+            if key == 'psm':
+                options['psm'] = int(value)
+            elif key == 'scale':
+                options['scale'] = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid OCR profile option '{token}', expected a number")
+        if key == 'whitelist':
+            options['whitelist'] = value
+        elif key == 'lang':
+            options['language'] = value
+        elif key == 'preprocess':
+            options['preprocess'] = value.split(',')
+    return OcrProfile(**options) if options else DEFAULT_PROFILE
+
+
+def looks_like_profile(text):
+    """Check whether every token of text is a key=value pair with a known profile key"""
+    tokens = text.split()
+    return bool(tokens) and all(token.partition('=')[0] in PROFILE_KEYS and '=' in token for token in tokens)
+
+
+def scale_boxes(data, factor):
+    """Return image_to_data results with box coordinates multiplied by factor"""
+    result = dict(data)
+    for key in ('left', 'top', 'width', 'height'):
+        if key in data:
+            result[key] = [int(round(value * factor)) for value in data[key]]
+    return result
+
+
+class PytesseractBackend:
+    """Run the tesseract command line tool once per call through pytesseract"""
+    name = 'pytesseract'
+
+    def __init__(self, language='eng'):
+        self.language = language
+
+    def image_to_data(self, image, profile=DEFAULT_PROFILE):
+        import pytesseract
+        return pytesseract.image_to_data(image, lang=profile.language or self.language, config=profile.config,
+                                         output_type=pytesseract.Output.DICT)
+
+    def close(self):
+        pass
+
+
+class EnginePool:
+    """Fixed set of long-lived engine handles shared between threads, one caller per handle"""
+    def __init__(self, create, destroy, size):
+        self.destroy = destroy
+        self.handles = []
+        self.available = queue.Queue()
+        for _ in range(size):
+            handle = create()
+            self.handles.append(handle)
+            self.available.put(handle)
+
+    def run(self, func):
+        handle = self.available.get()
+        try:
+            return func(handle)
+        finally:
+            self.available.put(handle)
+
+    def close(self):
+        for handle in self.handles:
+            self.destroy(handle)
+        self.handles = []
+
+
+class PooledBackend:
+    """Engine pools per language, created on first use; the default language's pool is created up front"""
+    def __init__(self, language, workers):
+        self.language = language
+        self.workers = workers
+        self.pools = {}
+        self.pools_lock = threading.Lock()
+        self.pool_for(language)
+
+    def pool_for(self, language):
+        with self.pools_lock:
+            pool = self.pools.get(language)
+            if pool is None:
+                pool = EnginePool(lambda: self._create(language), self._destroy, self.workers)
+                self.pools[language] = pool
+            return pool
+
+    def close(self):
+        with self.pools_lock:
+            for pool in self.pools.values():
+                pool.close()
+            self.pools = {}
+
+
+class TesserocrBackend(PooledBackend):
+    """Keep Tesseract loaded in-process through the tesserocr bindings"""
+    name = 'tesserocr'
+
+    def __init__(self, language='eng', workers=1):
+        import tesserocr
+        self.tesserocr = tesserocr
+        super().__init__(language, workers)
+
+    def _create(self, language):
+        return self.tesserocr.PyTessBaseAPI(lang=language)
+
+    def _destroy(self, api):
+        api.End()
+
+    def image_to_data(self, image, profile=DEFAULT_PROFILE):
+        buffer, width, height, bytes_per_pixel, bytes_per_line = image_bytes(image)
+
+        def recognize(api):
+            # Handles are shared by all profiles, so every setting is applied on each call
+            api.SetPageSegMode(self.tesserocr.PSM.AUTO if profile.psm is None else profile.psm)
+            for name, value in profile.variables.items():
+                api.SetVariable(name, value)
+            api.SetImageBytes(buffer.tobytes(), width, height, bytes_per_pixel, bytes_per_line)
+            try:
+                return parse_tsv(api.GetTSVText(0))
+            finally:
+                api.Clear()
+        return self.pool_for(profile.language or self.language).run(recognize)
+
+
+class CapiBackend(PooledBackend):
+    """Keep Tesseract loaded in-process through libtesseract's C API (ctypes, no extra packages)"""
+    name = 'capi'
+
+    def __init__(self, language='eng', workers=1, library=None, datapath=None):
+        path = library or ctypes.util.find_library('tesseract')
+        if not path:
+            raise RuntimeError("libtesseract not found; install the tesseract-ocr package")
+        lib = ctypes.CDLL(path)
+        lib.TessBaseAPICreate.restype = ctypes.c_void_p
+        lib.TessBaseAPIInit3.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+        lib.TessBaseAPIInit3.restype = ctypes.c_int
+        lib.TessBaseAPISetImage.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.c_int,
+                                            ctypes.c_int, ctypes.c_int]
+        lib.TessBaseAPIGetTsvText.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessBaseAPIGetTsvText.restype = ctypes.c_void_p  # Freed with TessDeleteText
+        lib.TessDeleteText.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIClear.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIEnd.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIDelete.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPISetPageSegMode.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessBaseAPIGetPageSegMode.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIGetPageSegMode.restype = ctypes.c_int
+        lib.TessBaseAPISetVariable.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+        lib.TessBaseAPISetVariable.restype = ctypes.c_int
+        self.lib = lib
+        self.datapath = datapath or os.environ.get('TESSDATA_PREFIX')
+        self.default_psm = None  # Page segmentation mode of a fresh handle, restored for profiles without one
+        super().__init__(language, workers)
+
+    def _create(self, language):
+        handle = self.lib.TessBaseAPICreate()
+        datapath = self.datapath.encode() if self.datapath else None
+        if self.lib.TessBaseAPIInit3(handle, datapath, language.encode()) != 0:
+            self.lib.TessBaseAPIDelete(handle)
+            raise RuntimeError(f"Could not initialize Tesseract for language '{language}'")
+        if self.default_psm is None:
+            self.default_psm = self.lib.TessBaseAPIGetPageSegMode(handle)
+        return handle
+
+    def _destroy(self, handle):
+        self.lib.TessBaseAPIEnd(handle)
+        self.lib.TessBaseAPIDelete(handle)
+
+    def image_to_data(self, image, profile=DEFAULT_PROFILE):
+        buffer, width, height, bytes_per_pixel, bytes_per_line = image_bytes(image)
+
+        def recognize(handle):
+            # Handles are shared by all profiles, so every setting is applied on each call
+            self.lib.TessBaseAPISetPageSegMode(handle, self.default_psm if profile.psm is None else profile.psm)
+            for name, value in profile.variables.items():
+                self.lib.TessBaseAPISetVariable(handle, name.encode(), value.encode())
+            self.lib.TessBaseAPISetImage(handle, buffer.ctypes.data, width, height, bytes_per_pixel, bytes_per_line)
+            text = self.lib.TessBaseAPIGetTsvText(handle, 0)
+            try:
+                return parse_tsv(ctypes.string_at(text).decode('utf-8', 'replace') if text else '')
+            finally:
+                if text:
+                    self.lib.TessDeleteText(text)
+                self.lib.TessBaseAPIClear(handle)
+        return self.pool_for(profile.language or self.language).run(recognize)
+
+
+def create_backend(name='pytesseract', language='eng', workers=1):
+    """Create an OCR backend by name; 'auto' picks the fastest one that is installed"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown OCR backend: {name}. Choose from: {', '.join(BACKENDS)}")
+    if name == 'pytesseract':
+        return PytesseractBackend(language)
+    if name == 'tesserocr':
+        return TesserocrBackend(language, workers)
+    if name == 'capi':
+        return CapiBackend(language, workers)
+
+    for backend in (TesserocrBackend, CapiBackend):
+        try:
+            return backend(language, workers)
+        except (ImportError, OSError, RuntimeError):
+            continue
+    return PytesseractBackend(language)
+
+
+def propose_text_regions(image, min_height=6, max_height=80, padding=4, min_gradient=32):
+    """Find candidate text boxes (x, y, width, height) with a morphological gradient and connected components
+
+    Text shows up as dense, short strokes: the gradient picks out their edges, a
+    horizontal closing joins the characters of a word or line, and components
+    that are too thin or too sparse for text are dropped. Components taller than
+    a line of text (labels touching a chart line or icon) are split into their
+    dense row bands.
+    """
+    import cv2
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    threshold, edges = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    if threshold < min_gradient:
+        # Mostly flat screens make Otsu pick a near-zero threshold; keep only real edges
+        _, edges = cv2.threshold(gradient, min_gradient, 255, cv2.THRESH_BINARY)
+    # Long straight edges are panel borders and table rules, not glyphs
+    lines = cv2.bitwise_or(
+        cv2.morphologyEx(edges, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (max_height, 1))),
+        cv2.morphologyEx(edges, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (1, max_height))))
+    edges = cv2.subtract(edges, lines)
+    joined = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1)))
+
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(joined, connectivity=8)
+    height, width = gray.shape[:2]
+    candidates = []
+    for label in range(1, count):
+        x, y, w, h, area = stats[label]
+        if h < min_height or w < min_height // 2:
+            continue
+        if h > max_height:
+            candidates.extend(split_row_bands(labels[y:y + h, x:x + w] == label, x, y, min_height, max_height))
+        elif area >= 0.15 * w * h or h <= 2 * min_height:  # Sparse components are box or frame outlines
+            candidates.append((x, y, w, h))
+
+    boxes = []
+    for x, y, w, h in candidates:
+        x0, y0 = max(0, x - padding), max(0, y - padding)
+        x1, y1 = min(width, x + w + padding), min(height, y + h + padding)
+        boxes.append([x0, y0, x1, y1])
+
+    return [(int(x0), int(y0), int(x1 - x0), int(y1 - y0)) for x0, y0, x1, y1 in merge_boxes(boxes)]
+
+
+def split_row_bands(mask, x, y, min_height, max_height):
+    """Split a tall component mask into text-line-sized bands of dense rows"""
+    import numpy as np
+
+    counts = mask.sum(axis=1)
+    dense = np.concatenate(([False], counts > max(3, 0.1 * counts.max()), [False]))
+    edges = np.flatnonzero(dense[1:] != dense[:-1])
+    bands = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        if min_height <= end - start <= max_height:
+            columns = np.flatnonzero(mask[start:end].any(axis=0))
+            bands.append((x + columns[0], y + start, columns[-1] - columns[0] + 1, end - start))
+    return bands
+
+
+def merge_boxes(boxes):
+    """Merge overlapping [x0, y0, x1, y1] boxes until none overlap"""
+    merged = True
+    while merged:
+        merged = False
+        boxes.sort()
+        result = []
+        for box in boxes:
+            for other in reversed(result):  # Sorted by x0, so only the right edge needs checking
+                if box[0] <= other[2] and box[1] <= other[3] and other[1] <= box[3]:
+                    other[1], other[2], other[3] = min(other[1], box[1]), max(other[2], box[2]), max(other[3], box[3])
+                    merged = True
+                    break
+            else:
+                result.append(box)
+        boxes = result
+    return boxes
+
+
+class RegionMosaic:
+    """Pack text region crops into one image so a single OCR call covers all of them
+
+    Crops are laid out on shelves separated by blank space; word boxes found in
+    the mosaic are mapped back to screen coordinates with to_screen().
+    """
+    SPACING = 8
+
+    def __init__(self, image, boxes, max_width=2048, fill=255):
+        import numpy as np
+
+        self.boxes = list(boxes)
+        self.source_pixels = image.shape[0] * image.shape[1]
+        self.placements = []  # (mosaic x, mosaic y, screen x, screen y, width, height)
+        self.order = sorted(range(len(self.boxes)), key=lambda i: (self.boxes[i][3], self.boxes[i][0]))
+        spacing = self.SPACING
+        shelf_width = max([max_width] + [w + 2 * spacing for _, _, w, _ in self.boxes])
+
+        x = y = spacing
+        shelf_height = 0
+        for bx, by, w, h in (self.boxes[i] for i in self.order):
+            if x + w + spacing > shelf_width:
+                x = spacing
+                y += shelf_height + spacing
+                shelf_height = 0
+            self.placements.append((x, y, bx, by, w, h))
+            x += w + spacing
+            shelf_height = max(shelf_height, h)
+
+        mosaic_width = max((mx + w + spacing for mx, _, _, _, w, _ in self.placements), default=1)
+        mosaic_height = y + shelf_height + spacing
+        channels = image.shape[2:] if image.ndim == 3 else ()
+        self.image = np.full((mosaic_height, mosaic_width) + channels, fill, dtype=image.dtype)
+        self.owner = np.zeros((mosaic_height, mosaic_width), dtype=np.int32)  # Placement index + 1 per pixel
+        for index, (mx, my, bx, by, w, h) in enumerate(self.placements):
+            self.image[my:my + h, mx:mx + w] = image[by:by + h, bx:bx + w]
+            self.owner[my:my + h, mx:mx + w] = index + 1
+
+    @property
+    def pixels(self):
+        """Number of pixels that will be sent to OCR"""
+        return self.image.shape[0] * self.image.shape[1]
+
+    def assign(self, data):
+        """Yield (placement index, row index) for image_to_data rows whose center lies inside a placed crop
+
+        self.order[placement index] is the index of the crop in the boxes passed in.
+        """
+        height, width = self.owner.shape
+        for i in range(len(data['text'])):
+            cx = min(width - 1, max(0, data['left'][i] + data['width'][i] // 2))
+            cy = min(height - 1, max(0, data['top'][i] + data['height'][i] // 2))
+            owner = self.owner[cy, cx]
+            if owner:
+                yield owner - 1, i
+
+    def to_screen(self, data):
+        """Translate image_to_data results from mosaic to screen coordinates
+
+        Rows whose center does not fall inside a placed crop (e.g. page or block
+        rows spanning several crops) are dropped.
+        """
+        result = {key: [] for key in data}
+        for placement, i in self.assign(data):
+            mx, my, bx, by, _, _ = self.placements[placement]
+            for key in data:
+                result[key].append(data[key][i])
+            result['left'][-1] += bx - mx
+            result['top'][-1] += by - my
+        return result
+
+
+def join_fragments(left_text, right_text, overlap_chars):
+    """Join the two OCR'd halves of a word cut by a seam
+
+    Both halves contain the glyphs inside the overlap, so the longest suffix of
+    the left half that starts the right half is dropped from the right half;
+    without an exact match, the number of characters the overlap is expected to
+    hold is dropped instead.
+    """
+    for k in range(min(len(left_text), len(right_text)), 0, -1):
+        if left_text.endswith(right_text[:k]):
+            return left_text + right_text[k:]
+    return left_text + right_text[max(0, overlap_chars):]
+
+
+def merge_seam_words(words, tile_width, margin):
+    """Join word fragments that meet across a vertical tile seam
+
+    words are (left, top, width, height, conf, text) tuples. A word wider than
+    the margin on both sides of a seam is reported by both tiles, each fragment
+    running into the other tile's margin: two fragments overlapping
+    horizontally, on the same line, with edges within the margin of the same
+    seam are joined. Separate words never overlap, so they are left alone.
+    """
+    def seam_near(x):
+        seam = round(x / tile_width) * tile_width
+        return seam if seam > 0 and abs(x - seam) <= margin else None
+
+    merged = []
+    fragments = {}  # Seam x -> indexes into merged of words ending near that seam
+    for word in sorted(words):
+        left, top, width, height, conf, text = word
+        for index in fragments.get(seam_near(left), ()):
+            a_left, a_top, a_width, a_height, a_conf, a_text = merged[index]
+            overlap = a_left + a_width - left
+            vertical = min(a_top + a_height, top + height) - max(a_top, top)
+            if overlap <= 0 or left <= a_left or vertical < min(a_height, height) / 2:
+                continue
+            right, bottom = max(a_left + a_width, left + width), max(a_top + a_height, top + height)
+            new_top = min(a_top, top)
+            overlap_chars = round(overlap * len(a_text) / a_width) if a_width else 0
+            merged[index] = (a_left, new_top, right - a_left, bottom - new_top, min(a_conf, conf),
+                             join_fragments(a_text, text, overlap_chars))
+            word = None
+            break
+        if word is None:
+            continue
+        seam = seam_near(left + width)
+        if seam is not None:
+            fragments.setdefault(seam, []).append(len(merged))
+        merged.append(word)
+    return merged
+
+
+class TileOcrCache:
+    """Reuse OCR results for image tiles whose pixels have not changed
+
+    The image is cut into a grid of tiles and each tile is hashed together with
+    a margin of the surrounding pixels. Tiles whose hash is cached reuse their
+    words; the rest are packed into one RegionMosaic and OCR'd in a single call.
+    A tile keeps the words whose center lies in its own area, so lines crossing
+    a horizontal seam are seen whole through the margin, and words cut by a
+    vertical seam are joined by merge_seam_words().
+    """
+    TILE_WIDTH = 480
+    TILE_HEIGHT = 128
+    MARGIN = 16
+    MAX_ENTRIES = 4096
+
+    def __init__(self, tile_width=TILE_WIDTH, tile_height=TILE_HEIGHT, margin=MARGIN, max_entries=MAX_ENTRIES):
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.margin = margin
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (profile key, digest) -> words as (left, top, width, height, conf, text) within the tile
+        self.hits = 0
+        self.misses = 0
+        self.pixels_sent = 0  # Pixels passed to OCR, mosaic spacing included
+        self.pixels_saved = 0  # Pixels of tiles answered from the cache
+
+    @property
+    def hit_rate(self):
+        """Percentage of tile lookups answered from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups * 100 if lookups else 0.0
+
+    def tiles(self, height, width):
+        """Yield (tile, extended tile) rectangles as (x, y, width, height) covering an image"""
+        margin = self.margin
+        for y in range(0, height, self.tile_height):
+            for x in range(0, width, self.tile_width):
+                w, h = min(self.tile_width, width - x), min(self.tile_height, height - y)
+                ex, ey = max(0, x - margin), max(0, y - margin)
+                yield (x, y, w, h), (ex, ey, min(width, x + w + margin) - ex, min(height, y + h + margin) - ey)
+
+    @staticmethod
+    def digest(crop):
+        """Content hash of an image crop, including its shape and pixel type"""
+        digest = hashlib.blake2b(f"{crop.shape}{crop.dtype}".encode(), digest_size=16)
+        digest.update(crop.tobytes())
+        return digest.digest()
+
+    def image_to_data(self, backend, image, profile=DEFAULT_PROFILE):
+        """OCR an image through the cache, returning word rows in pytesseract's dict layout"""
+        height, width = image.shape[:2]
+        words = []
+        pending = []  # (digest, tile, extended tile) for tiles not in the cache
+        for tile, extended in self.tiles(height, width):
+            ex, ey, ew, eh = extended
+            key = (profile.key, self.digest(image[ey:ey + eh, ex:ex + ew]))
+            cached = self.entries.get(key)
+            if cached is None:
+                self.misses += 1
+                pending.append((key, tile, extended))
+                continue
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self.pixels_saved += tile[2] * tile[3]
+            words.extend((left + ex, top + ey, w, h, conf, text) for left, top, w, h, conf, text in cached)
+
+        if pending:
+            mosaic = RegionMosaic(image, [extended for _, _, extended in pending])
+            data = backend.image_to_data(mosaic.image, profile)
+            self.pixels_sent += mosaic.pixels
+            found = [[] for _ in pending]
+            for placement, i in mosaic.assign(data):
+                text = str(data['text'][i])
+                if not text.strip():
+                    continue
+                mx, my, ex, ey, _, _ = mosaic.placements[placement]
+                index = mosaic.order[placement]
+                x, y, w, h = pending[index][1]
+                left, top = data['left'][i] - mx, data['top'][i] - my
+                cx, cy = ex + left + data['width'][i] // 2, ey + top + data['height'][i] // 2
+                if x <= cx < x + w and y <= cy < y + h:
+                    found[index].append((left, top, data['width'][i], data['height'][i], float(data['conf'][i]), text))
+
+            for (key, _, (ex, ey, _, _)), tile_words in zip(pending, found):
+                self.entries[key] = tile_words
+                words.extend((left + ex, top + ey, w, h, conf, text) for left, top, w, h, conf, text in tile_words)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        data = {key: [] for key in WORD_COLUMNS}
+        for word in merge_seam_words(words, self.tile_width, self.margin):
+            for key, value in zip(WORD_COLUMNS, word):
+                data[key].append(value)
+        return data
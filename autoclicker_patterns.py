@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Click pattern compiler for AutoClicker - Parses and validates pattern definitions into timed action lists
+"""
+
+import ast
+import json
+import os
+from collections import namedtuple
+
+PATTERN_EXTENSIONS = ('.json', '.yaml', '.yml')
+MOUSE_BUTTONS = ('left', 'right', 'middle')
+
+MOUSE_KINDS = ('click', 'move', 'down', 'up')
+
+# One input action: offset in seconds from the start of the pattern, kind, its value, mouse button and an
+# optional ('image' | 'text', target) to verify at the action's position before it is performed.
+# Kinds: 'click', 'move', 'down', 'up' (x, y), 'key' (key name), 'hotkey' (tuple of key names), 'type' (text)
+Action = namedtuple('Action', ['offset', 'kind', 'value', 'button', 'verify'], defaults=('left', None))
+
+
+class CompiledPattern:
+    """Validated pattern as a flat list of actions sorted by their absolute offsets
+
+    With an anchor, ('image' | 'text', target), mouse positions are offsets
+    from the anchor's center and must be resolved against where the anchor
+    was detected before the pattern can run.
+    """
+    def __init__(self, name, actions, duration, anchor=None):
+        self.name = name
+        self.actions = actions
+        self.duration = duration  # Seconds from start until the pattern is over, trailing waits included
+        self.anchor = anchor
+        # Integer nanosecond offsets for perf_counter_ns deadlines
+        self.offsets_ns = [round(action.offset * 1e9) for action in actions]
+        self.duration_ns = round(duration * 1e9)
+
+    def __len__(self):
+        return len(self.actions)
+
+    def __repr__(self):
+        return f"CompiledPattern(name={self.name!r}, actions={len(self.actions)}, duration={self.duration:.3f})"
+
+    def resolve(self, origin):
+        """Return the pattern with mouse offsets turned into screen positions relative to origin"""
+        actions = []
+        for index, action in enumerate(self.actions):
+            if action.kind in MOUSE_KINDS:
+                x, y = action.value[0] + origin[0], action.value[1] + origin[1]
+                if x < 0 or y < 0:
+                    raise ValueError(f"Action {index + 1} of '{self.name}' resolves off screen at ({x}, {y})")
+                action = action._replace(value=(x, y))
+            actions.append(action)
+        return CompiledPattern(self.name, actions, self.duration)
+
+
+def _position(value, where, relative=False):
+    if (not isinstance(value, (list, tuple)) or len(value) != 2
+            or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value)):
+        raise ValueError(f"{where}: position must be [x, y]")
+    x, y = int(value[0]), int(value[1])
+    if not relative and (x < 0 or y < 0):
+        raise ValueError(f"{where}: position must not be negative")
+    return (x, y)
+
+
+def _detector(value, where, base_dir=None):
+    """Validate an anchor or verify target: {'image': path} or {'text': text}"""
+    if isinstance(value, dict) and len(value) == 1:
+        kind, target = next(iter(value.items()))
+        if kind in ('image', 'text') and isinstance(target, str) and target.strip():
+            target = target.strip()
+            if kind == 'image' and base_dir and not os.path.isabs(target):
+                target = os.path.join(base_dir, target)
+            return (kind, target)
+    raise ValueError(f"{where} must be {{'image': path}} or {{'text': text}}")
+
+
+def _seconds(value, where, name):
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+        raise ValueError(f"{where}: {name} must be a non-negative number of seconds")
+    return float(value)
+
+
+def _keys(value, where):
+    if isinstance(value, str) and value:
+        return value
+    if (isinstance(value, (list, tuple)) and value
+            and all(isinstance(key, str) and key for key in value)):
+        return tuple(value)
+    raise ValueError(f"{where}: keys must be a key name or a list of key names")
+
+
+def compile_pattern(pattern, time_scale=1.0, base_dir=None):
+    """Validate a pattern definition and compile it into a CompiledPattern
+
+    A pattern is a dict with an optional 'name' and a list of 'steps' (a bare
+    list of steps is accepted too). Each step may hold:
+      click: [x, y]          click at a screen position
+      move: [x, y]           move the mouse without clicking
+      down / up: [x, y]      press / release a mouse button (drags)
+      button: "right"        mouse button for click, down and up (default left)
+      key: "enter"           press one key
+      hotkey: ["ctrl", "s"]  press keys together
+      type: "text"           type text
+      wait: seconds          wait after the step's actions
+      at: seconds            run the step at this offset from the pattern start
+      verify: {"image": p}   check the image (or {"text": t}) is at the step's
+                             mouse position before acting; a failed check
+                             stops the pattern
+    The original 'position', 'keyboard' (key name, or list for a hotkey) and
+    'delay' keys are accepted as well. Actions within a step run in the order
+    move, click/down/up, key/hotkey, type. All offsets are multiplied by
+    time_scale (0.5 plays twice as fast). With a pattern level 'anchor',
+    {"image": path} or {"text": text}, mouse positions are [dx, dy] offsets
+    from the anchor's center, which may be negative. Relative image paths are
+    taken from base_dir when given. Raises ValueError naming the first invalid
+    step.
+    """
+    if not time_scale > 0:
+        raise ValueError("Time scale must be positive")
+    if isinstance(pattern, CompiledPattern):
+        if time_scale == 1.0:
+            return pattern
+        return CompiledPattern(pattern.name, [action._replace(offset=action.offset * time_scale)
+                                              for action in pattern.actions], pattern.duration * time_scale,
+                               pattern.anchor)
+    if isinstance(pattern, (list, tuple)):
+        pattern = {'steps': pattern}
+    if not isinstance(pattern, dict):
+        raise ValueError("Pattern must be a mapping with 'steps' or a list of steps")
+    unknown = set(pattern) - {'name', 'steps', 'anchor'}
+    if unknown:
+        raise ValueError(f"Unknown pattern field(s): {', '.join(sorted(unknown))}")
+    name = pattern.get('name', 'Unnamed')
+    steps = pattern.get('steps', [])
+    if not isinstance(name, str):
+        raise ValueError("Pattern name must be a string")
+    if not isinstance(steps, (list, tuple)):
+        raise ValueError("Pattern steps must be a list")
+    anchor = _detector(pattern['anchor'], "Pattern anchor", base_dir) if 'anchor' in pattern else None
+    relative = anchor is not None
+
+    actions = []
+    offset = 0.0
+    for index, step in enumerate(steps, 1):
+        where = f"Step {index}"
+        if not isinstance(step, dict):
+            raise ValueError(f"{where}: must be a mapping")
+        unknown = set(step) - {'click', 'position', 'move', 'down', 'up', 'button', 'key', 'hotkey', 'keyboard',
+                               'type', 'wait', 'delay', 'at', 'verify'}
+        if unknown:
+            raise ValueError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+
+        if 'at' in step:
+            at = _seconds(step['at'], where, 'at')
+            if at < offset:
+                raise ValueError(f"{where}: at={at:g}s is before the end of the previous step ({offset:g}s)")
+            offset = at
+
+        verify = _detector(step['verify'], f"{where}: verify", base_dir) if 'verify' in step else None
+        if verify and not any(field in step for field in ('click', 'position', 'move', 'down', 'up')):
+            raise ValueError(f"{where}: verify needs a mouse position to check")
+
+        if 'move' in step:
+            actions.append(Action(offset * time_scale, 'move', _position(step['move'], where, relative), 'left', verify))
+            verify = None  # Checked once, before the step's first action
+
+        mouse_fields = [field for field in ('click', 'position', 'down', 'up') if field in step]
+        if len(mouse_fields) > 1:
+            raise ValueError(f"{where}: use only one of click, position, down and up")
+        button = step.get('button', 'left')
+        if button not in MOUSE_BUTTONS:
+            raise ValueError(f"{where}: button must be one of {', '.join(MOUSE_BUTTONS)}")
+        if 'button' in step and not mouse_fields:
+            raise ValueError(f"{where}: button needs click, down or up")
+        for field in mouse_fields:
+            kind = 'click' if field == 'position' else field
+            actions.append(Action(offset * time_scale, kind, _position(step[field], where, relative), button, verify))
+
+        key_fields = [field for field in ('key', 'hotkey', 'keyboard') if field in step]
+        if len(key_fields) > 1:
+            raise ValueError(f"{where}: use only one of key, hotkey and keyboard")
+        for field in key_fields:
+            keys = _keys(step[field], where)
+            if field == 'key' and not isinstance(keys, str):
+                raise ValueError(f"{where}: key must be a single key name")
+            actions.append(Action(offset * time_scale, 'key' if isinstance(keys, str) else 'hotkey', keys))
+
+        if 'type' in step:
+            if not isinstance(step['type'], str):
+                raise ValueError(f"{where}: type must be a string")
+            actions.append(Action(offset * time_scale, 'type', step['type']))
+
+        if 'wait' in step and 'delay' in step:
+            raise ValueError(f"{where}: use either wait or delay")
+        for field in ('wait', 'delay'):
+            if field in step:
+                offset += _seconds(step[field], where, field)
+
+    return CompiledPattern(name, actions, offset * time_scale, anchor)
+
+
+def load_pattern_file(path):
+    """Load a pattern definition from a JSON or YAML file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if path.lower().endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("Install PyYAML to load YAML patterns")
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML in {path}: {e}")
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in {path}: {e}")
+
+
+def save_pattern_file(path, definition):
+    """Write a pattern definition to a JSON or YAML file, chosen by extension"""
+    with open(path, 'w', encoding='utf-8') as f:
+        if path.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("Install PyYAML to save YAML patterns")
+            yaml.safe_dump(definition, f, sort_keys=False, default_flow_style=None)
+        else:
+            # One step per line keeps recorded macros compact yet readable
+            f.write('{"name": %s, "steps": [\n' % json.dumps(definition.get('name', 'Unnamed')))
+            f.write(',\n'.join('  ' + json.dumps(step) for step in definition.get('steps', [])))
+            f.write('\n]}\n')
+
+
+def parse_pattern(target, time_scale=1.0):
+    """Parse a pattern target and compile it
+
+    The target may be the path of a .json/.yaml pattern file, inline JSON, or
+    the original Python dict syntax, which is read as a literal and never
+    executed. Image paths in a pattern file are relative to the file. Raises
+    ValueError if the target cannot be parsed or is invalid.
+    """
+    target = target.strip()
+    if target.lower().endswith(PATTERN_EXTENSIONS) and os.path.isfile(target):
+        return compile_pattern(load_pattern_file(target), time_scale, os.path.dirname(os.path.abspath(target)))
+    try:
+        definition = json.loads(target)
+    except json.JSONDecodeError:
+        try:
+            definition = ast.literal_eval(target)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            raise ValueError(f"Invalid pattern format: {target}")
+    return compile_pattern(definition, time_scale)
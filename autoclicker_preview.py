@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Live detection preview for AutoClicker - Downscaled frames with match and OCR boxes
+"""
+
+import base64
+import threading
+import time
+
+from autoclicker_slot import LatestSlot
+
+# Box kinds drawn on the preview and their BGR colors (matched, not matched)
+BOX_COLORS = {
+    'image': ((0, 200, 0), (0, 140, 255)),
+    'text': ((0, 200, 0), (0, 140, 255)),
+    'ocr': ((255, 120, 0), (255, 120, 0))
+}
+
+
+class DetectionPreview:
+    """Render the engine's latest frame and detections on a background thread
+
+    The detection thread hands frames over with publish(), which only swaps a
+    reference into a single slot. The worker downscales, draws boxes and PNG
+    encodes at no more than max_fps, and the GUI picks up the encoded image
+    with latest().
+    """
+    def __init__(self, max_width=480, max_fps=5, logger=None):
+        if max_width <= 0:
+            raise ValueError("Preview width must be positive")
+        if max_fps <= 0:
+            raise ValueError("Preview FPS must be positive")
+
+        self.max_width = max_width
+        self.max_fps = max_fps
+        self.logger = logger
+        self.pending = LatestSlot()  # (frame, boxes) from the detection thread
+        self.rendered = None  # Latest base64 PNG, replaced atomically by the worker
+        self.rendered_count = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        """Start the render worker"""
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name="DetectionPreview", daemon=True)
+            self.thread.start()
+
+    def close(self):
+        """Stop the render worker"""
+        self.running = False
+        if self.thread is not None:
+            self.pending.put(None)
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def publish(self, frame, boxes):
+        """Hand the latest frame and its boxes to the renderer without copying
+
+        boxes is a list of (kind, (x, y, width, height), label, matched) in frame
+        coordinates, kind being 'image', 'text' or 'ocr'. The frame must not be
+        modified in place afterwards.
+        """
+        if self.running:
+            self.pending.put((frame, boxes))
+
+    def latest(self):
+        """Return the newest rendered image as base64 PNG data, or None if nothing new"""
+        rendered, self.rendered = self.rendered, None
+        return rendered
+
+    def render(self, frame, boxes):
+        """Downscale a frame and draw detection boxes on it"""
+        import cv2  # Imported on first render so the GUI starts without OpenCV
+
+        height, width = frame.shape[:2]
+        scale = min(1.0, self.max_width / width)
+        if scale < 1.0:
+            image = cv2.resize(frame, (max(1, int(width * scale)), max(1, int(height * scale))),
+                               interpolation=cv2.INTER_AREA)
+        else:
+            image = frame.copy()
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+        for kind, (x, y, w, h), label, matched in boxes:
+            matched_color, missed_color = BOX_COLORS.get(kind, BOX_COLORS['ocr'])
+            color = matched_color if matched else missed_color
+            top_left = (int(x * scale), int(y * scale))
+            bottom_right = (int((x + w) * scale), int((y + h) * scale))
+            cv2.rectangle(image, top_left, bottom_right, color, 2 if kind != 'ocr' else 1)
+            if label and kind != 'ocr':
+                cv2.putText(image, label, (top_left[0], max(10, top_left[1] - 3)),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1, cv2.LINE_AA)
+        return image
+
+    def encode(self, image):
+        """Encode a rendered image as base64 PNG data for a Tk PhotoImage"""
+        import cv2
+
+        ok, encoded = cv2.imencode('.png', image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        if not ok:
+            raise RuntimeError("Could not encode preview image")
+        return base64.b64encode(encoded.tobytes())
+
+    def _run(self):
+        frame_interval = 1.0 / self.max_fps
+        next_render = 0.0
+        while self.running:
+            item = self.pending.take(timeout=0.5)
+            if item is None:
+                continue
+
+            # Cap the render rate; frames published while waiting replace this one
+            delay = next_render - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+                item = self.pending.take() or item
+            if not self.running:
+                break
+
+            try:
+                frame, boxes = item
+                self.rendered = self.encode(self.render(frame, boxes))
+                self.rendered_count += 1
+            except Exception as e:
+                if self.logger:
+                    self.logger(f"Preview render error: {e}")
+            next_render = time.monotonic() + frame_interval
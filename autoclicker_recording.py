@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Frame recording and replay for AutoClicker - Captures sessions for offline profiling
+"""
+
+import hashlib
+import json
+import struct
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# Recording file layout: magic header followed by records of
+# kind (1 byte) + header length (4 bytes) + payload length (4 bytes) + JSON header + payload
+RECORDING_MAGIC = b'ACREC1\n'
+RECORD_FRAME = b'F'       # New unique frame, payload is a PNG-encoded image
+RECORD_REPEAT = b'R'      # Reference to an already stored frame (deduplicated)
+RECORD_DETECTION = b'D'   # Detection result for the most recent frame
+RECORD_HEADER = struct.Struct('<cII')
+
+
+class FrameRecorder:
+    """Stream captured frames, timestamps and detection results to a recording file"""
+    def __init__(self, path, compression_level=1):
+        if not (0 <= compression_level <= 9):
+            raise ValueError("Compression level must be between 0 and 9")
+
+        self.path = path
+        self.compression_level = compression_level  # PNG compression, lossless at every level
+        self.lock = threading.Lock()
+        self.frame_ids = {}  # Frame digest -> frame id, used for deduplication
+        self.last_frame_id = None
+        self.frame_count = 0  # All recorded captures, including repeats
+        self.unique_frames = 0
+        self.start_time = time.monotonic()
+
+        self.file = open(path, 'wb')
+        self.file.write(RECORDING_MAGIC)
+
+    def _elapsed(self):
+        return round(time.monotonic() - self.start_time, 6)
+
+    def _write_record(self, kind, header, payload=b''):
+        header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        self.file.write(RECORD_HEADER.pack(kind, len(header_bytes), len(payload)))
+        self.file.write(header_bytes)
+        self.file.write(payload)
+
+    def record_frame(self, frame):
+        """Record a newly captured frame, storing only a reference if it was seen before"""
+        frame = np.ascontiguousarray(frame)
+        digest = hashlib.blake2b(frame.data, digest_size=16).hexdigest()
+
+        with self.lock:
+            timestamp = self._elapsed()
+            frame_id = self.frame_ids.get(digest)
+
+            if frame_id is None:
+                ok, encoded = cv2.imencode('.png', frame, [cv2.IMWRITE_PNG_COMPRESSION, self.compression_level])
+                if not ok:
+                    raise RuntimeError("Could not encode frame for recording")
+                frame_id = self.unique_frames
+                self.frame_ids[digest] = frame_id
+                self.unique_frames += 1
+                self._write_record(RECORD_FRAME, {'t': timestamp, 'id': frame_id}, encoded.tobytes())
+            else:
+                self._write_record(RECORD_REPEAT, {'t': timestamp, 'id': frame_id})
+
+            self.last_frame_id = frame_id
+            self.frame_count += 1
+            return frame_id
+
+    def record_repeat(self):
+        """Record that the previous frame was served again (e.g. from the screenshot cache)"""
+        with self.lock:
+            if self.last_frame_id is None:
+                return None
+            self._write_record(RECORD_REPEAT, {'t': self._elapsed(), 'id': self.last_frame_id})
+            self.frame_count += 1
+            return self.last_frame_id
+
+    def record_detection(self, kind, target, position, **fields):
+        """Record a detection result against the most recent frame"""
+        header = {
+            't': self._elapsed(),
+            'frame': self.last_frame_id,
+            'kind': kind,
+            'target': target,
+            'position': list(position) if position else None
+        }
+        header.update(fields)
+        with self.lock:
+            self._write_record(RECORD_DETECTION, header)
+
+    def flush(self):
+        """Flush buffered records to disk"""
+        with self.lock:
+            if not self.file.closed:
+                self.file.flush()
+
+    def close(self):
+        """Flush and close the recording file"""
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_recording(path):
+    """Read a recording file, returning (frames, payloads, detections)
+
+    frames is the ordered list of (timestamp, frame_id) captures, payloads maps
+    frame ids to encoded images and detections is a list of detection dicts.
+    """
+    frames = []
+    payloads = {}
+    detections = []
+
+    with open(path, 'rb') as f:
+        if f.read(len(RECORDING_MAGIC)) != RECORDING_MAGIC:
+            raise ValueError(f"Not an AutoClicker recording: {path}")
+
+        while True:
+            record_header = f.read(RECORD_HEADER.size)
+            if len(record_header) < RECORD_HEADER.size:
+                break  # End of file (or a truncated trailing record)
+            kind, header_length, payload_length = RECORD_HEADER.unpack(record_header)
+            header_bytes = f.read(header_length)
+            payload = f.read(payload_length)
+            if len(header_bytes) < header_length or len(payload) < payload_length:
+                break
+            header = json.loads(header_bytes.decode('utf-8'))
+
+            if kind == RECORD_FRAME:
+                payloads[header['id']] = payload
+                frames.append((header['t'], header['id']))
+            elif kind == RECORD_REPEAT:
+                frames.append((header['t'], header['id']))
+            elif kind == RECORD_DETECTION:
+                detections.append(header)
+
+    return frames, payloads, detections
+
+
+class FrameReplay:
+    """Capture backend that feeds recorded frames back at recorded or maximum speed"""
+    def __init__(self, path, realtime=True, loop=False):
+        self.path = path
+        self.realtime = realtime  # False replays as fast as frames are requested
+        self.loop = loop
+        self.frames, self.payloads, self.detections = read_recording(path)
+        self.position = 0
+        self.replay_start = None
+        self.decoded_id = None
+        self.decoded_frame = None
+
+    def __len__(self):
+        return len(self.frames)
+
+    def rewind(self):
+        """Restart replay from the first frame"""
+        self.position = 0
+        self.replay_start = None
+
+    def decode(self, frame_id):
+        """Decode a stored frame, reusing the last decode for repeated frames"""
+        if frame_id != self.decoded_id:
+            encoded = np.frombuffer(self.payloads[frame_id], dtype=np.uint8)
+            self.decoded_frame = cv2.imdecode(encoded, cv2.IMREAD_UNCHANGED)
+            self.decoded_id = frame_id
+        return self.decoded_frame
+
+    def next_frame(self):
+        """Return the next recorded frame, or None when the recording is exhausted"""
+        if self.position >= len(self.frames):
+            if not self.loop or not self.frames:
+                return None
+            self.rewind()
+
+        timestamp, frame_id = self.frames[self.position]
+        self.position += 1
+
+        if self.realtime:
+            if self.replay_start is None:
+                self.replay_start = time.monotonic() - timestamp
+            delay = self.replay_start + timestamp - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        return self.decode(frame_id).copy()
+
+    def detections_for_frame(self, frame_id):
+        """Return the detection results recorded against a frame"""
+        return [d for d in self.detections if d.get('frame') == frame_id]
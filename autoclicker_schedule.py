@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Target scheduling for AutoClicker - Per-target check periods, priorities and cost budgets
+"""
+
+SCHEDULE_KEYS = ('every', 'priority', 'budget')
+
+
+class TargetSchedule:
+    """How often a target is checked and how much detection time it may use
+
+    period is the check period in seconds (None: the run's interval). Higher
+    priority targets are checked first. budget caps the target's average
+    detection cost in milliseconds per second of run time: a target whose
+    checks cost more is checked less often than its period asks for.
+    """
+    def __init__(self, period=None, priority=0, budget=None):
+        if period is not None and period <= 0:
+            raise ValueError("Check period must be positive")
+        if budget is not None and budget <= 0:
+            raise ValueError("Cost budget must be positive")
+        self.period = period
+        self.priority = priority
+        self.budget = budget
+
+    def __eq__(self, other):
+        return (isinstance(other, TargetSchedule)
+                and (self.period, self.priority, self.budget) == (other.period, other.priority, other.budget))
+
+    def __repr__(self):
+        return f"TargetSchedule(period={self.period}, priority={self.priority}, budget={self.budget})"
+
+
+DEFAULT_SCHEDULE = TargetSchedule()
+
+
+def parse_schedule(text):
+    """Parse 'every=5 priority=2 budget=50' into a TargetSchedule, raising ValueError if invalid"""
+    options = {}
+    for token in text.split():
+        key, separator, value = token.partition('=')
+        if key not in SCHEDULE_KEYS:
+            raise ValueError(f"Unknown schedule option '{key}'")
+        if not separator or not value:
+            raise ValueError(f"Invalid schedule option '{token}', expected key=value")
+        try:
+            if key == 'every':
+                options['period'] = float(value)
+            elif key == 'priority':
+                options['priority'] = int(value)
+            else:
+                options['budget'] = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid schedule option '{token}', expected a number")
+    return TargetSchedule(**options) if options else DEFAULT_SCHEDULE
+
+
+class ScheduledTarget:
+    """Scheduler state of one target: when it is due and what its checks cost"""
+    __slots__ = ('kind', 'target', 'schedule', 'due', 'cost', 'checks', 'deferred')
+
+    def __init__(self, kind, target, schedule):
+        self.kind = kind
+        self.target = target
+        self.schedule = schedule
+        self.due = 0.0  # Everything is due at the start
+        self.cost = None  # Moving average of the check cost in seconds, unknown until first checked
+        self.checks = 0
+        self.deferred = 0  # Cycles it was due but left out to stay within the cycle budget
+
+
+class Scheduler:
+    """Choose the targets to check each cycle
+
+    A target is due once its period has passed since its last check. Due
+    targets are ordered by urgency, their priority plus how many periods they
+    are overdue, so low priority targets age instead of starving. With a cycle
+    budget, targets are taken in that order while their estimated costs fit;
+    the most urgent one always runs so every cycle makes progress.
+    """
+    SMOOTHING = 0.3  # Weight of the latest measurement in the cost average
+
+    def __init__(self, interval, cycle_budget=None):
+        self.interval = interval
+        self.cycle_budget = cycle_budget  # Seconds of detection per cycle, None for no limit
+        self.targets = []
+
+    def add(self, kind, target, schedule=None):
+        entry = ScheduledTarget(kind, target, schedule or DEFAULT_SCHEDULE)
+        self.targets.append(entry)
+        return entry
+
+    def period(self, entry):
+        """Effective check period: the target's own, stretched to keep its cost within its budget"""
+        period = entry.schedule.period or self.interval
+        if entry.schedule.budget and entry.cost:
+            period = max(period, entry.cost * 1000 / entry.schedule.budget)
+        return period
+
+    def plan(self, now):
+        """Return the targets to check this cycle, most urgent first"""
+        due = [entry for entry in self.targets if entry.due <= now]
+        due.sort(key=lambda entry: -(entry.schedule.priority + (now - entry.due) / self.period(entry)))
+        if self.cycle_budget is None:
+            return due
+
+        planned = []
+        spent = 0.0
+        for entry in due:
+            cost = entry.cost or 0.0
+            if planned and spent + cost > self.cycle_budget:
+                entry.deferred += 1
+                continue
+            planned.append(entry)
+            spent += cost
+        return planned
+
+    def record(self, entry, cost, now):
+        """Record a check of a target that cost the given seconds"""
+        entry.cost = cost if entry.cost is None else entry.cost + self.SMOOTHING * (cost - entry.cost)
+        entry.checks += 1
+        entry.due = now + self.period(entry)
+
+    def next_due(self):
+        """Earliest time any target is due"""
+        return min(entry.due for entry in self.targets)
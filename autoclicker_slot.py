@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Thread handoff for AutoClicker - A single slot holding only the most recent item
+"""
+
+import threading
+
+
+class LatestSlot:
+    """Single-slot handoff that only ever holds the most recent item
+
+    put() never blocks on the consumer: a newer item simply replaces one that
+    has not been taken yet.
+    """
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.item = None
+        self.replaced = 0  # Items overwritten before they were taken
+
+    def put(self, item):
+        with self.condition:
+            if self.item is not None:
+                self.replaced += 1
+            self.item = item
+            self.condition.notify()
+
+    def take(self, timeout=None):
+        """Remove and return the pending item, waiting up to timeout seconds for one"""
+        with self.condition:
+            if self.item is None and timeout:
+                self.condition.wait(timeout)
+            item, self.item = self.item, None
+            return item
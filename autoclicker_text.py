@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Text matching for AutoClicker - Phrase and fuzzy matching over OCR word boxes
+"""
+
+# Words further apart than this many line heights are not joined into one phrase
+MAX_WORD_GAP = 1.5
+
+
+def myers_search(pattern, text, max_distance, anchored=False):
+    """Find the best approximate occurrence of pattern in text with Myers' bit-parallel algorithm
+
+    Returns (distance, end index) of the occurrence with the fewest edits, the
+    earliest one on ties, or None if every occurrence needs more than
+    max_distance edits. One text character is processed per step with a few
+    integer operations; Python integers let the pattern be of any length. With
+    anchored=True the occurrence must start at text[0].
+    """
+    m = len(pattern)
+    if m == 0:
+        return (0, -1)
+
+    peq = {}  # Character -> bit mask of its positions in the pattern
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    carry = 1 if anchored else 0  # Horizontal delta of the top row: 0 lets an occurrence start anywhere
+
+    pv, mv = mask, 0  # Positive / negative vertical deltas of the current column
+    score = m
+    best = (m, -1) if anchored and m <= max_distance else None
+    for j, char in enumerate(text):
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | carry) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+        if score <= max_distance and (best is None or score < best[0]):
+            best = (score, j)
+    return best
+
+
+def allowed_errors(target, max_errors):
+    """Edit distance allowed for a target: at most max_errors and a quarter of its length"""
+    return min(max_errors, len(target) // 4)
+
+
+def group_lines(data):
+    """Group image_to_data word rows into text lines, each a left-to-right list of words
+
+    Words are (left, top, width, height, text) tuples. Adjacent words are joined
+    when they sit on the same line on screen; when Tesseract's block, paragraph
+    and line numbers are present they must match too. Lines are returned in
+    reading order.
+    """
+    numbered = all(key in data for key in ('block_num', 'par_num', 'line_num'))
+    words = []
+    for i, text in enumerate(data['text']):
+        text = str(text).strip()
+        if not text:
+            continue
+        key = (data['block_num'][i], data['par_num'][i], data['line_num'][i]) if numbered else None
+        words.append((data['left'][i], data['top'][i], data['width'][i], data['height'][i], text, key))
+
+    lines = []
+    for word in sorted(words, key=lambda word: word[0]):
+        left, top, width, height, _, key = word
+        for line in lines:
+            last_left, last_top, last_width, last_height, _, last_key = line[-1]
+            gap = left - (last_left + last_width)
+            overlap = min(top + height, last_top + last_height) - max(top, last_top)
+            if (key == last_key and gap <= MAX_WORD_GAP * max(height, last_height)
+                    and overlap >= min(height, last_height) / 2):
+                line.append(word)
+                break
+        else:
+            lines.append([word])
+
+    lines.sort(key=lambda line: (min(word[1] for word in line), line[0][0]))
+    return [[word[:5] for word in line] for line in lines]
+
+
+def find_phrase(data, target, max_errors=0):
+    """Find a word or phrase in image_to_data results
+
+    The target is matched case-insensitively anywhere inside a line, so it may
+    span several words or be part of one. Up to allowed_errors(target,
+    max_errors) inserted, deleted or substituted characters are tolerated.
+    Returns (left, top, width, height, distance) of the words covering the best
+    match, the first in reading order on ties, or None.
+    """
+    target = ' '.join(target.lower().split())
+    if not target:
+        return None
+    max_distance = allowed_errors(target, max_errors)
+
+    best = None
+    for line in group_lines(data):
+        spans = []  # (start, end) character range of each word in the line text
+        position = 0
+        for word in line:
+            spans.append((position, position + len(word[4])))
+            position += len(word[4]) + 1
+        text = ' '.join(word[4] for word in line).lower()
+
+        if max_distance == 0:
+            start = text.find(target)
+            if start < 0:
+                continue
+            distance, end = 0, start + len(target) - 1
+        else:
+            found = myers_search(target, text, max_distance)
+            if found is None or (best is not None and found[0] >= best[4]):
+                continue
+            distance, end = found
+            # Searching backwards from the end, anchored there, gives the shortest occurrence
+            prefix = text[:end + 1][::-1]
+            start = end - myers_search(target[::-1], prefix, distance, anchored=True)[1]
+
+        covered = [word for word, (first, last) in zip(line, spans) if first <= end and last > start]
+        left = min(word[0] for word in covered)
+        top = min(word[1] for word in covered)
+        right = max(word[0] + word[2] for word in covered)
+        bottom = max(word[1] + word[3] for word in covered)
+        best = (left, top, right - left, bottom - top, distance)
+        if distance == 0:
+            break
+    return best
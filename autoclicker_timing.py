@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Precise timing for AutoClicker click patterns - Hybrid sleep/spin deadlines and timing error histograms
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+# Upper bounds in microseconds of the timing error histogram buckets; the last bucket is open-ended
+BUCKET_LIMITS_US = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class DeadlineTimer:
+    """Wait for deadlines on the perf_counter_ns clock: sleep coarsely, then spin for the last stretch
+
+    time.sleep() can overshoot by a scheduler tick or more on a loaded system,
+    so it is only used until spin_ns before the deadline; the rest is a busy
+    wait, which wakes up within microseconds.
+    """
+    SPIN_NS = 2_000_000
+
+    def __init__(self, spin_ns=SPIN_NS):
+        if spin_ns < 0:
+            raise ValueError("Spin time must be non-negative")
+        self.spin_ns = spin_ns
+        self.origin = None
+
+    def start(self):
+        """Make now offset zero"""
+        self.origin = time.perf_counter_ns()
+
+    def wait_until(self, offset_ns):
+        """Wait until offset_ns after start(); return how late we are in nanoseconds (never negative)"""
+        deadline = self.origin + offset_ns
+        remaining = deadline - time.perf_counter_ns()
+        if remaining > self.spin_ns:
+            time.sleep((remaining - self.spin_ns) / 1e9)
+        now = time.perf_counter_ns()
+        while now < deadline:
+            now = time.perf_counter_ns()
+        return now - deadline
+
+
+class TimingHistogram:
+    """Distribution of timing errors for one pattern step, bucketed by BUCKET_LIMITS_US"""
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_LIMITS_US) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, error_ns):
+        index = 0
+        while index < len(BUCKET_LIMITS_US) and error_ns > BUCKET_LIMITS_US[index] * 1000:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ns += error_ns
+        self.max_ns = max(self.max_ns, error_ns)
+
+    @property
+    def mean_us(self):
+        return self.total_ns / self.count / 1000 if self.count else 0.0
+
+    def percentile_us(self, percent):
+        """Upper bound in microseconds of the bucket holding the given percentile"""
+        if not self.count:
+            return 0.0
+        needed = self.count * percent / 100
+        seen = 0
+        for limit, count in zip(BUCKET_LIMITS_US, self.counts):
+            seen += count
+            if seen >= needed:
+                return float(limit)
+        return self.max_ns / 1000
+
+    def format(self):
+        """Render non-empty buckets as '<=10us:5 <=50us:2 >10000us:1'"""
+        labels = [f"<={limit}us" for limit in BUCKET_LIMITS_US] + [f">{BUCKET_LIMITS_US[-1]}us"]
+        return ' '.join(f"{label}:{count}" for label, count in zip(labels, self.counts) if count)
+
+
+@contextmanager
+def realtime(cpu=None, fifo_priority=None, logger=None):
+    """Pin the calling thread to a CPU and/or run it under SCHED_FIFO, restoring both afterwards
+
+    Either setting is skipped with a logged message where the platform or the
+    process's privileges do not allow it.
+    """
+    old_affinity = None
+    old_policy = None
+    if cpu is not None:
+        try:
+            old_affinity = os.sched_getaffinity(0)
+            os.sched_setaffinity(0, {cpu})
+        except (AttributeError, OSError, ValueError) as e:
+            old_affinity = None
+            if logger:
+                logger(f"Could not pin pattern playback to CPU {cpu}: {e}")
+    if fifo_priority is not None:
+        try:
+            old_policy = (os.sched_getscheduler(0), os.sched_getparam(0))
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(fifo_priority))
+        except (AttributeError, OSError, ValueError) as e:
+            old_policy = None
+            if logger:
+                logger(f"Could not use SCHED_FIFO for pattern playback: {e}")
+    try:
+        yield
+    finally:
+        if old_policy is not None:
+            try:
+                os.sched_setscheduler(0, old_policy[0], old_policy[1])
+            except OSError:
+                pass
+        if old_affinity is not None:
+            try:
+                os.sched_setaffinity(0, old_affinity)
+            except OSError:
+                pass
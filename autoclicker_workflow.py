@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Workflow compiler for AutoClicker - Validates state machine definitions whose states watch their own targets
+"""
+
+import os
+
+from autoclicker_patterns import compile_pattern, load_pattern_file
+
+
+class Rule:
+    """Detector of a state with what to do when it matches
+
+    kind and target name the image or text to look for. On a match the
+    position is clicked unless click is False, then the optional pattern runs
+    with its positions relative to the match, and the workflow moves to goto
+    (None stays in the current state).
+    """
+    def __init__(self, kind, target, click=True, pattern=None, goto=None):
+        self.kind = kind
+        self.target = target
+        self.click = click
+        self.pattern = pattern
+        self.goto = goto
+
+    def __repr__(self):
+        return f"Rule({self.kind}={self.target!r}, goto={self.goto!r})"
+
+
+class State:
+    """Workflow state: its rules in priority order and an optional timeout
+
+    A state without rules or timeout is final: entering it ends the workflow.
+    """
+    def __init__(self, name, rules, timeout=None, on_timeout=None):
+        self.name = name
+        self.rules = rules
+        self.timeout = timeout
+        self.on_timeout = on_timeout
+
+    @property
+    def final(self):
+        return not self.rules and self.timeout is None
+
+    @property
+    def targets(self):
+        """The (kind, target) pairs this state evaluates each cycle"""
+        return [(rule.kind, rule.target) for rule in self.rules]
+
+
+class Workflow:
+    """Validated workflow: states by name and the state to start in"""
+    def __init__(self, name, states, start):
+        self.name = name
+        self.states = states
+        self.start = start
+
+    def __repr__(self):
+        return f"Workflow(name={self.name!r}, states={len(self.states)}, start={self.start!r})"
+
+
+def _compile_rule(rule, where, base_dir):
+    if not isinstance(rule, dict):
+        raise ValueError(f"{where}: must be a mapping")
+    unknown = set(rule) - {'image', 'text', 'click', 'steps', 'goto'}
+    if unknown:
+        raise ValueError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+    kinds = [kind for kind in ('image', 'text') if kind in rule]
+    if len(kinds) != 1:
+        raise ValueError(f"{where}: needs exactly one of image and text")
+    kind = kinds[0]
+    target = rule[kind]
+    if not isinstance(target, str) or not target.strip():
+        raise ValueError(f"{where}: {kind} must be a non-empty string")
+    target = target.strip()
+    if kind == 'image' and base_dir and not os.path.isabs(target):
+        target = os.path.join(base_dir, target)
+
+    click = rule.get('click', True)
+    if not isinstance(click, bool):
+        raise ValueError(f"{where}: click must be true or false")
+    pattern = None
+    if 'steps' in rule:
+        try:
+            # Positions in the steps are offsets from the match, like an anchored pattern
+            pattern = compile_pattern({'name': where, 'anchor': {kind: target}, 'steps': rule['steps']},
+                                      base_dir=base_dir)
+        except ValueError as e:
+            raise ValueError(f"{where}: {e}")
+    goto = rule.get('goto')
+    if goto is not None and not isinstance(goto, str):
+        raise ValueError(f"{where}: goto must be a state name")
+    return Rule(kind, target, click, pattern, goto)
+
+
+def compile_workflow(definition, base_dir=None):
+    """Validate a workflow definition and compile it into a Workflow
+
+    A workflow is a mapping with an optional 'name', optional 'start' (the
+    first state by default) and 'states', a mapping of state names to:
+      rules: [...]           checked in order each cycle, the first match wins
+      timeout: seconds       leave the state after this long without a match
+      on_timeout: "state"    where to go on timeout (required with timeout)
+    Each rule holds 'image' or 'text', 'click' (default true: click the match),
+    optional pattern 'steps' with positions relative to the match, and 'goto'
+    (default: stay). Relative image paths are taken from base_dir. Raises
+    ValueError naming the first invalid state or rule.
+    """
+    if not isinstance(definition, dict):
+        raise ValueError("Workflow must be a mapping with 'states'")
+    unknown = set(definition) - {'name', 'start', 'states'}
+    if unknown:
+        raise ValueError(f"Unknown workflow field(s): {', '.join(sorted(unknown))}")
+    name = definition.get('name', 'Unnamed')
+    if not isinstance(name, str):
+        raise ValueError("Workflow name must be a string")
+    states = definition.get('states')
+    if not isinstance(states, dict) or not states:
+        raise ValueError("Workflow states must be a non-empty mapping")
+
+    compiled = {}
+    for state_name, state in states.items():
+        where = f"State '{state_name}'"
+        if not isinstance(state, dict):
+            raise ValueError(f"{where}: must be a mapping")
+        unknown = set(state) - {'rules', 'timeout', 'on_timeout'}
+        if unknown:
+            raise ValueError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+        rules = state.get('rules', [])
+        if not isinstance(rules, (list, tuple)):
+            raise ValueError(f"{where}: rules must be a list")
+        rules = [_compile_rule(rule, f"{where} rule {index}", base_dir) for index, rule in enumerate(rules, 1)]
+
+        timeout = state.get('timeout')
+        if timeout is not None and (not isinstance(timeout, (int, float)) or isinstance(timeout, bool)
+                                    or timeout <= 0):
+            raise ValueError(f"{where}: timeout must be a positive number of seconds")
+        on_timeout = state.get('on_timeout')
+        if (timeout is None) != (on_timeout is None):
+            raise ValueError(f"{where}: timeout and on_timeout go together")
+        compiled[state_name] = State(state_name, rules, timeout, on_timeout)
+
+    for state in compiled.values():
+        for goto in [rule.goto for rule in state.rules] + [state.on_timeout]:
+            if goto is not None and goto not in compiled:
+                raise ValueError(f"State '{state.name}': unknown state '{goto}'")
+    start = definition.get('start', next(iter(compiled)))
+    if start not in compiled:
+        raise ValueError(f"Unknown start state '{start}'")
+    return Workflow(name, compiled, start)
+
+
+def load_workflow(path):
+    """Load and compile a workflow from a JSON or YAML file; image paths are relative to the file"""
+    return compile_workflow(load_pattern_file(path), os.path.dirname(os.path.abspath(path)))
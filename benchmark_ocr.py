@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark for AutoClicker OCR backends - Per-call cost of pytesseract versus persistent Tesseract
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import cv2
+import numpy as np
+
+from autoclicker_ocr import create_backend
+
+CALLS = 20
+WORDS = ["OK", "Cancel", "Submit", "Settings", "Refresh"]
+
+
+def sample_image():
+    """Grayscale toolbar-like image with a few words, similar to one find_text pass"""
+    image = np.full((200, 800), 255, dtype=np.uint8)
+    for i, word in enumerate(WORDS):
+        cv2.putText(image, word, (20 + i * 150, 110), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2, cv2.LINE_AA)
+    return image
+
+
+def main():
+    image = sample_image()
+    print("⏱️  AutoClicker OCR backend benchmark")
+    print(f"   {CALLS} image_to_data calls on a {image.shape[1]}x{image.shape[0]} image\n")
+
+    results = {}
+    for name in ('pytesseract', 'tesserocr', 'capi'):
+        try:
+            start = time.perf_counter()
+            backend = create_backend(name)
+            backend.image_to_data(image)  # First call includes loading the language model
+            startup = time.perf_counter() - start
+        except Exception as e:
+            print(f"   {name:<12} unavailable ({e})")
+            continue
+
+        try:
+            start = time.perf_counter()
+            for _ in range(CALLS):
+                data = backend.image_to_data(image)
+            per_call = (time.perf_counter() - start) / CALLS
+        finally:
+            backend.close()
+
+        found = sum(1 for word in WORDS if word in data['text'])
+        results[name] = per_call
+        print(f"   {name:<12} {per_call * 1000:8.1f} ms/call  (first call {startup * 1000:.0f} ms, "
+              f"{found}/{len(WORDS)} words found)")
+
+    if 'pytesseract' in results:
+        for name, per_call in results.items():
+            if name != 'pytesseract':
+                print(f"\n   {name} removes {(results['pytesseract'] - per_call) * 1000:.1f} ms of per-call overhead "
+                      f"({results['pytesseract'] / per_call:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
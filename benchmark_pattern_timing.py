@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark for AutoClicker pattern timing - Deadline error of plain sleeps versus sleep-then-spin
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from autoclicker_timing import DeadlineTimer, TimingHistogram
+
+STEPS = 200
+STEP_NS = 10_000_000  # 10 ms between actions
+
+
+class SleepTimer(DeadlineTimer):
+    """Deadlines met with time.sleep() alone, as a plain sleep-based executor would"""
+    def wait_until(self, offset_ns):
+        deadline = self.origin + offset_ns
+        remaining = deadline - time.perf_counter_ns()
+        if remaining > 0:
+            time.sleep(remaining / 1e9)
+        return max(0, time.perf_counter_ns() - deadline)
+
+
+def measure(timer):
+    histogram = TimingHistogram()
+    timer.start()
+    for step in range(1, STEPS + 1):
+        histogram.add(timer.wait_until(step * STEP_NS))
+    return histogram
+
+
+def main():
+    print("⏱️  AutoClicker pattern timing benchmark")
+    print(f"   {STEPS} actions {STEP_NS // 1_000_000} ms apart\n")
+
+    for name, timer in (('sleep', SleepTimer()), ('sleep+spin', DeadlineTimer())):
+        histogram = measure(timer)
+        print(f"   {name:<11} mean {histogram.mean_us:7.1f} us   p99 <= {histogram.percentile_us(99):7.0f} us   "
+              f"max {histogram.max_ns / 1000:7.1f} us")
+        print(f"               {histogram.format()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+#!/bin/bash
+# AutoClicker Startup Benchmark Script
+# Measures module import time with `python -X importtime`
+
+cd "$(dirname "$0")"
+
+echo "⏱️  AutoClicker Startup Benchmark"
+echo "================================="
+echo ""
+
+for module in autoclicker autoclicker_gui; do
+    echo "Importing $module (10 slowest imports, cumulative microseconds):"
+    python3 -X importtime -c "import $module" 2>&1 >/dev/null \
+        | grep '^import time:' | grep -v 'cumulative' \
+        | sort -t'|' -k2 -n -r | head -10 \
+        | awk -F'|' '{ gsub(/^ +| +$/, "", $2); gsub(/^ +/, "", $3); printf "  %10s us  %s\n", $2, $3 }'
+    echo ""
+done
+
+echo "CLI --help wall time:"
+start=$(date +%s%N)
+python3 autoclicker.py --help >/dev/null
+end=$(date +%s%N)
+echo "  $(( (end - start) / 1000000 )) ms"
+echo ""
+
+for module in autoclicker autoclicker_gui; do
+    echo "Heavy dependencies loaded by 'import $module' (should be none):"
+    python3 -c "
+import sys
+import $module
+heavy = ['cv2', 'numpy', 'pytesseract', 'pygame', 'pynput', 'pyautogui', 'keyboard', 'PIL']
+loaded = [name for name in heavy if name in sys.modules and not type(sys.modules[name]).__name__ == '_LazyModule']
+print('  ' + (', '.join(loaded) if loaded else 'none'))
+"
+done
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark for AutoClicker text-region proposals - OCR pixels saved and words kept on synthetic dashboards
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import cv2
+import numpy as np
+
+from autoclicker_ocr import propose_text_regions, RegionMosaic, create_backend
+
+SCREENS = 20
+SIZE = (1080, 1920)
+WORDS = ["OK", "Cancel", "Submit", "Settings", "Refresh", "Status", "Running", "Errors", "CPU", "Memory",
+         "Network", "Deploy", "Queue", "Latency", "Uptime", "Logs", "Alerts", "Export", "Filter", "Save"]
+
+
+def dashboard(rng):
+    """Synthetic dashboard: panels, charts and gradients with labels; returns (image, word boxes)"""
+    height, width = SIZE
+    image = np.full((height, width, 3), rng.choice([235, 245, 40]), dtype=np.uint8)
+    words = []
+
+    # One panel per cell of a 4x3 grid so labels are never hidden by other panels
+    for cell in range(12):
+        w, h = rng.randrange(200, 440), rng.randrange(120, 330)
+        x = (cell % 4) * width // 4 + rng.randrange(10, width // 4 - w - 10)
+        y = (cell // 4) * height // 3 + rng.randrange(10, height // 3 - h - 10)
+        color = [rng.randrange(0, 256) for _ in range(3)]
+        cv2.rectangle(image, (x, y), (x + w, y + h), color, -1)
+        # Chart or gradient in the lower half of the panel
+        if rng.random() < 0.5:
+            points = np.array([[x + i * w // 20, y + h - rng.randrange(10, h // 2)] for i in range(21)], np.int32)
+            cv2.polylines(image, [points], False, (255 - color[0], 255 - color[1], 255 - color[2]), 2)
+        else:
+            ramp = np.linspace(0, 255, w, dtype=np.uint8)
+            image[y + h // 2:y + h, x:x + w] = ramp[None, :, None]
+
+        # Panel title and a few labels, dark on light or light on dark
+        ink = (0, 0, 0) if sum(color) > 380 else (255, 255, 255)
+        for j in range(rng.randrange(1, 4)):
+            word = rng.choice(WORDS)
+            scale = rng.choice([0.5, 0.6, 0.8, 1.0])
+            (tw, th), baseline = cv2.getTextSize(word, cv2.FONT_HERSHEY_SIMPLEX, scale, 1)
+            tx, ty = x + 8, y + 10 + th + j * (th + 14)
+            if ty + baseline >= y + h // 2:
+                break
+            cv2.rectangle(image, (tx - 2, ty - th - 2), (tx + tw + 2, ty + baseline), color, -1)
+            cv2.putText(image, word, (tx, ty), cv2.FONT_HERSHEY_SIMPLEX, scale, ink, 1, cv2.LINE_AA)
+            words.append((word, (tx, ty - th, tw, th + baseline)))
+    return image, words
+
+
+def covered(box, proposals, minimum=0.9):
+    """Check whether a proposed region contains (almost) all of a word box"""
+    x, y, w, h = box
+    for px, py, pw, ph in proposals:
+        overlap_w = min(x + w, px + pw) - max(x, px)
+        overlap_h = min(y + h, py + ph) - max(y, py)
+        if overlap_w > 0 and overlap_h > 0 and overlap_w * overlap_h >= minimum * w * h:
+            return True
+    return False
+
+
+def main():
+    rng = random.Random(7)
+    corpus = [dashboard(rng) for _ in range(SCREENS)]
+
+    try:
+        backend = create_backend('auto')
+        backend.image_to_data(np.full((32, 32), 255, dtype=np.uint8))
+    except Exception as e:
+        backend = None
+        print(f"   (Tesseract unavailable, OCR hit rate skipped: {e})")
+
+    total_words = kept_words = 0
+    screen_pixels = mosaic_pixels = 0
+    proposal_time = 0.0
+    hits = {'full screen': 0, 'proposals': 0}
+    for image, words in corpus:
+        start = time.perf_counter()
+        proposals = propose_text_regions(image)
+        mosaic = RegionMosaic(image, proposals)
+        proposal_time += time.perf_counter() - start
+
+        total_words += len(words)
+        kept_words += sum(covered(box, proposals) for _, box in words)
+        screen_pixels += image.shape[0] * image.shape[1]
+        mosaic_pixels += mosaic.pixels
+
+        if backend:
+            full = backend.image_to_data(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))['text']
+            cropped = mosaic.to_screen(backend.image_to_data(cv2.cvtColor(mosaic.image, cv2.COLOR_BGR2GRAY)))['text']
+            hits['full screen'] += sum(word in full for word, _ in words)
+            hits['proposals'] += sum(word in cropped for word, _ in words)
+
+    print("⏱️  AutoClicker text-region proposal benchmark")
+    print(f"   {SCREENS} synthetic {SIZE[1]}x{SIZE[0]} dashboards, {total_words} labelled words\n")
+    print(f"   Words inside a proposed region: {kept_words}/{total_words} ({kept_words / total_words * 100:.1f}%)")
+    print(f"   OCR pixels: {mosaic_pixels / screen_pixels * 100:.1f}% of the full screen "
+          f"({screen_pixels / max(1, mosaic_pixels):.1f}x fewer)")
+    print(f"   Proposal + packing time: {proposal_time / SCREENS * 1000:.1f} ms/screen")
+    if backend:
+        for name, count in hits.items():
+            print(f"   OCR hit rate ({name}): {count}/{total_words}")
+        backend.close()
+
+
+if __name__ == '__main__':
+    main()
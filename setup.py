@@ -7,6 +7,7 @@ with open("requirements.txt") as f:
 # Include shell scripts and other files (excluding build/development files)
 excluded_files = [
     'autoclicker_settings.json',
+    'benchmark_startup.sh',
     'build_deb.sh',
     'diagnose.sh',
     'run.sh',
@@ -34,7 +35,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/superman2002/AutoClicker",
     packages=find_packages(),
-    py_modules=["autoclicker", "autoclicker_gui"],
+    py_modules=["autoclicker", "autoclicker_gui", "autoclicker_recording", "autoclicker_events", "autoclicker_preview", "autoclicker_slot", "autoclicker_config", "autoclicker_ocr", "autoclicker_text", "autoclicker_patterns", "autoclicker_timing", "autoclicker_macro", "autoclicker_workflow", "autoclicker_schedule", "autoclicker_daemon", "autoclicker_fleet", "autoclicker_input", "autoclicker_damage"],
     include_package_data=True,
     install_requires=requirements,
     data_files=data_files,
@@ -42,6 +43,8 @@ setup(
         'console_scripts': [
             'autoclicker=autoclicker:main',
             'autoclicker-gui=autoclicker_gui:main',
+            'autoclicker-daemon=autoclicker_daemon:main',
+            'autoclicker-fleet=autoclicker_fleet:main',
         ],
     },
     classifiers=[
@@ -6,15 +6,23 @@ Unit tests for AutoClicker core functionality
 import unittest
 import tempfile
 import os
+import subprocess
 import sys
-from unittest.mock import Mock, patch, MagicMock
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock, patch, MagicMock, call
 import numpy as np
 import cv2
 
 # Add the current directory to the path so we can import autoclicker
 sys.path.insert(0, os.path.dirname(__file__))
 
-from autoclicker import AutoClicker
+import autoclicker
+import autoclicker_input
+from autoclicker import AutoClicker, SoundFeedback, DebugScreenshotWriter
+from autoclicker_ocr import parse_profile
+from autoclicker_schedule import parse_schedule
 
 class TestAutoClicker(unittest.TestCase):
     """Test cases for AutoClicker class"""
@@ -45,6 +53,39 @@ class TestAutoClicker(unittest.TestCase):
         self.assertEqual(clicker.region, (100, 100, 800, 600))
         self.assertEqual(clicker.screenshot_cache_duration, 1.0)
 
+    def test_hotkeys_share_one_listener_released_on_close(self):
+        """Test 1,000 clicker start/close cycles share the process-wide listener without thread growth"""
+        class ThreadListener(threading.Thread):
+            def __init__(self, on_press):
+                super().__init__(daemon=True)
+                self.on_press = on_press
+                self.stopped = threading.Event()
+
+            def run(self):
+                self.stopped.wait()
+
+            def stop(self):
+                self.stopped.set()
+
+        hooks = autoclicker_input.InputHooks(ThreadListener)
+        with patch.object(autoclicker_input, 'HOOKS', hooks):
+            first, second = AutoClicker(), AutoClicker()
+            hooks.listener.on_press(SimpleNamespace(name='f8'))
+            self.assertTrue(first.pause_flag and second.pause_flag)
+            hooks.listener.on_press(SimpleNamespace(name='f7'))
+            self.assertTrue(first.stop_flag and second.stop_flag)
+            first.close()
+            second.close()
+            self.assertIsNone(hooks.listener)
+
+            before = threading.active_count()
+            for _ in range(1000):
+                clicker = AutoClicker()
+                clicker.close()
+                clicker.close()  # Closing twice is harmless
+            self.assertEqual(threading.active_count(), before)
+            self.assertEqual(hooks.subscribers, {})
+
     def test_validation_confidence(self):
         """Test confidence validation"""
         with self.assertRaises(ValueError):
@@ -119,6 +160,26 @@ class TestAutoClicker(unittest.TestCase):
         self.assertEqual(stats['success_rate'], 0)
         self.assertEqual(stats['elapsed_time'], 10.0)
 
+    def test_stats_snapshot(self):
+        """Test the live stats snapshot is a detached copy of the counters"""
+        clicker = AutoClicker()
+        clicker.cycle_count = 5
+        clicker.capture_count = 3
+        clicker.click_count = 2
+
+        with patch.object(clicker, 'find_text', return_value=(10, 20)) as mock_find_text:
+            self.assertEqual(clicker.find_target('text', 'OK'), (10, 20))
+        mock_find_text.assert_called_once_with('OK')
+
+        snapshot = clicker.stats_snapshot()
+        clicker.match_latency['Cancel'] = 0.5
+
+        self.assertEqual(snapshot['cycles'], 5)
+        self.assertEqual(snapshot['captures'], 3)
+        self.assertEqual(snapshot['clicks'], 2)
+        self.assertEqual(list(snapshot['match_latency']), ['OK'])
+        self.assertGreaterEqual(snapshot['match_latency']['OK'], 0)
+
     @patch('pyautogui.size')
     def test_region_default(self, mock_size):
         """Test default region setting"""
@@ -200,9 +261,10 @@ class TestAutoClicker(unittest.TestCase):
         self.assertFalse(result)
         self.assertEqual(clicker.click_count, 0)
 
+    @patch('pygame.mixer.get_init', return_value=None)
     @patch('pygame.mixer.init')
     @patch('pygame.sndarray.make_sound')
-    def test_sound_feedback_enabled(self, mock_make_sound, mock_mixer_init):
+    def test_sound_feedback_enabled(self, mock_make_sound, mock_mixer_init, mock_get_init):
         """Test sound feedback when enabled"""
         mock_sound = Mock()
         mock_make_sound.return_value = mock_sound
@@ -210,11 +272,43 @@ class TestAutoClicker(unittest.TestCase):
         clicker = AutoClicker(sound_feedback=True)
 
         clicker.play_sound_feedback()
+        clicker.sound_player.close()  # Waits for the worker to play pending sounds
 
         mock_mixer_init.assert_called_once()
-        mock_make_sound.assert_called_once()
+        self.assertEqual(mock_make_sound.call_count, len(SoundFeedback.SOUNDS))
         mock_sound.play.assert_called_once()
 
+    def test_failed_init_starts_no_worker_threads(self):
+        """Test a clicker that cannot load PyAutoGUI leaves no sound or screenshot worker behind"""
+        with patch.object(autoclicker, 'load_pyautogui', return_value=False), \
+             patch.object(autoclicker, 'SoundFeedback') as mock_player, \
+             patch.object(autoclicker, 'DebugScreenshotWriter') as mock_writer, \
+             patch('builtins.print'):
+            with self.assertRaises(RuntimeError):
+                AutoClicker(sound_feedback=True, screenshot_debug=True)
+
+        mock_player.assert_not_called()
+        mock_writer.assert_not_called()
+
+    @patch('pygame.mixer.get_init', return_value=None)
+    @patch('pygame.mixer.init')
+    @patch('pygame.sndarray.make_sound')
+    def test_sound_feedback_coalesces_bursts(self, mock_make_sound, mock_mixer_init, mock_get_init):
+        """Test a burst of sound requests plays each sound once"""
+        sounds = {name: Mock() for name in SoundFeedback.SOUNDS}
+        mock_make_sound.side_effect = list(sounds.values())
+
+        player = SoundFeedback()
+        for _ in range(20):
+            player.play('success')
+        player.play('safety')
+        player.start()
+        player.close()
+
+        sounds['success'].play.assert_called_once()
+        sounds['safety'].play.assert_called_once()
+        sounds['miss'].play.assert_not_called()
+
     @patch('pygame.mixer.init')
     @patch('pygame.sndarray.make_sound')
     def test_sound_feedback_disabled(self, mock_make_sound, mock_mixer_init):
@@ -306,6 +400,70 @@ class TestAutoClicker(unittest.TestCase):
         # Should return center of matched region: (100 + 25, 100 + 25) = (125, 125)
         self.assertEqual(result, (125, 125))
 
+    @patch('cv2.matchTemplate')
+    @patch('cv2.minMaxLoc')
+    @patch('cv2.imread')
+    @patch('os.path.exists')
+    def test_find_image_uses_predecoded_template(self, mock_exists, mock_imread, mock_minmax, mock_match):
+        """Test templates decoded ahead of the run are not read from disk again"""
+        mock_exists.return_value = True
+        mock_match.return_value = np.array([[0.9]])
+        mock_minmax.return_value = (0, 0.9, (0, 0), (10, 10))
+        template = np.zeros((20, 20, 3), dtype=np.uint8)
+        screen = np.zeros((100, 100, 3), dtype=np.uint8)
+
+        clicker = AutoClicker(templates={"/path/to/template.png": template})
+
+        with patch.object(clicker, 'capture_screen', return_value=screen):
+            self.assertEqual(clicker.find_image("/path/to/template.png"), (20, 20))
+        mock_imread.assert_not_called()
+        self.assertIs(mock_match.call_args[0][1], template)
+
+    @patch('cv2.matchTemplate')
+    @patch('cv2.minMaxLoc')
+    @patch('cv2.imread')
+    @patch('os.path.exists')
+    def test_find_image_feeds_preview(self, mock_exists, mock_imread, mock_minmax, mock_match):
+        """Test match boxes are collected per cycle and handed to the preview"""
+        mock_exists.return_value = True
+        mock_imread.return_value = np.zeros((50, 40, 3), dtype=np.uint8)
+        mock_match.return_value = np.array([[0.9]])
+        mock_minmax.return_value = (0, 0.9, (0, 0), (100, 120))
+        screen = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        preview = Mock()
+
+        clicker = AutoClicker(preview=preview)
+        clicker.last_screenshot = screen
+
+        with patch.object(clicker, 'capture_screen', return_value=screen):
+            clicker.find_image("/path/to/template.png")
+        clicker.publish_preview()
+
+        frame, boxes = preview.publish.call_args[0]
+        self.assertIs(frame, screen)
+        self.assertEqual(boxes, [('image', (100, 120, 40, 50), 'template.png 0.90', True)])
+        self.assertEqual(clicker.preview_boxes, [])
+
+    def test_pattern_run_publishes_preview_each_cycle(self):
+        """Test boxes found by pattern steps are handed to the preview and reset every cycle"""
+        preview = Mock()
+        clicker = AutoClicker(preview=preview)
+        clicker.last_screenshot = np.zeros((10, 10, 3), dtype=np.uint8)
+
+        def execute(pattern, index):
+            clicker.preview_boxes.append(('image', (0, 0, 5, 5), 'ok.png 0.90', True))
+            if clicker.cycle_count == 3:
+                clicker.stop()
+
+        with patch.object(clicker, 'execute_click_pattern', side_effect=execute), \
+             patch('time.sleep'):
+            clicker.run_pattern_clicker([{'steps': [{'key': 'enter'}]}])
+
+        self.assertEqual(preview.publish.call_count, 3)
+        for call in preview.publish.call_args_list:
+            self.assertEqual(len(call.args[1]), 1)
+        self.assertEqual(clicker.preview_boxes, [])
+
     @patch('cv2.matchTemplate')
     @patch('cv2.minMaxLoc')
     @patch('cv2.imread')
@@ -376,6 +534,86 @@ class TestAutoClicker(unittest.TestCase):
 
         self.assertIsNone(result)
 
+    def test_find_text_in_proposed_regions(self):
+        """Test text regions are OCR'd as one mosaic and matches map back to the screen"""
+        screen = np.full((600, 900, 3), 255, dtype=np.uint8)
+        cv2.putText(screen, "Submit", (400, 300), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+        clicker = AutoClicker(text_regions=True)
+        clicker.last_screenshot = screen
+        ocr = Mock()
+        clicker.ocr = ocr
+
+        def image_to_data(image, profile):
+            # The mosaic is much smaller than the screen and holds the single proposed crop
+            self.assertLess(image.shape[0] * image.shape[1], screen.shape[0] * screen.shape[1] // 10)
+            mx, my = clicker.text_region_cache[1].placements[0][:2]
+            return {'text': ['Submit'], 'left': [mx + 4], 'top': [my + 2], 'width': [80], 'height': [20]}
+        ocr.image_to_data.side_effect = image_to_data
+
+        with patch.object(clicker, 'capture_screen', return_value=screen.copy()):
+            position = clicker.find_text("Submit")
+            clicker.find_text("Cancel")
+
+        bx, by = clicker.text_region_cache[1].placements[0][2:4]
+        self.assertEqual(position, (bx + 4 + 40, by + 2 + 10))
+        self.assertTrue(390 <= position[0] <= 490 and 275 <= position[1] <= 305)
+
+    def test_find_text_skips_ocr_without_text_regions(self):
+        """Test a screen with nothing text-like is not sent to OCR"""
+        screen = np.full((200, 300, 3), 128, dtype=np.uint8)
+        clicker = AutoClicker(text_regions=True)
+        clicker.ocr = Mock()
+
+        with patch.object(clicker, 'capture_screen', return_value=screen):
+            self.assertIsNone(clicker.find_text("OK"))
+        clicker.ocr.image_to_data.assert_not_called()
+
+    def test_find_text_reuses_cached_tiles(self):
+        """Test an unchanged screen is answered from the OCR tile cache"""
+        screen = np.full((200, 600, 3), 255, dtype=np.uint8)
+        clicker = AutoClicker(ocr_cache=True)
+        clicker.ocr = Mock()
+        clicker.ocr.image_to_data.return_value = {'text': [], 'left': [], 'top': [], 'width': [], 'height': [],
+                                                  'conf': []}
+
+        with patch.object(clicker, 'capture_screen', return_value=screen):
+            clicker.find_text("OK", use_preprocessing=False)
+            clicker.find_text("OK", use_preprocessing=False)
+
+        clicker.ocr.image_to_data.assert_called_once()
+        stats = clicker.get_statistics()
+        self.assertEqual(stats['ocr_cache_hit_rate'], 50.0)
+        self.assertEqual(stats['ocr_pixels_saved'], 200 * 600)
+
+    def test_find_text_fuzzy_phrase_on_first_pass(self):
+        """Test a misread multi-word target matches without trying more preprocessing"""
+        clicker = AutoClicker(text_max_errors=1)
+        clicker.ocr = Mock()
+        clicker.ocr.image_to_data.return_value = {'text': ['Save', 'chanqes'], 'left': [10, 60], 'top': [10, 10],
+                                                  'width': [40, 70], 'height': [20, 20]}
+
+        with patch.object(clicker, 'capture_screen', return_value=np.zeros((100, 200, 3), dtype=np.uint8)):
+            position = clicker.find_text("Save changes")
+
+        self.assertEqual(position, (70, 20))
+        clicker.ocr.image_to_data.assert_called_once()
+
+    def test_find_text_uses_target_profile(self):
+        """Test a target's OCR profile sets the preprocessing, scale and Tesseract settings"""
+        profile = parse_profile("psm=7 scale=2 preprocess=threshold")
+        clicker = AutoClicker(ocr_profiles={'42': profile})
+        clicker.ocr = Mock()
+        clicker.ocr.image_to_data.return_value = {'text': ['42'], 'left': [100], 'top': [40], 'width': [40], 'height': [20]}
+
+        with patch.object(clicker, 'capture_screen', return_value=np.zeros((100, 200, 3), dtype=np.uint8)):
+            position = clicker.find_text("42")
+
+        image, used_profile = clicker.ocr.image_to_data.call_args[0]
+        self.assertEqual(image.shape, (200, 400))
+        self.assertIs(used_profile, profile)
+        self.assertEqual(position, (60, 25))  # Boxes are mapped back from the upscaled image
+        clicker.ocr.image_to_data.assert_called_once()
+
     def test_simulate_keyboard_input_string(self):
         """Test keyboard input simulation with string"""
         clicker = AutoClicker()
@@ -412,7 +650,218 @@ class TestAutoClicker(unittest.TestCase):
 
         mock_click.assert_called_once_with((100, 200))
         mock_keyboard.assert_called_once_with('enter')
-        mock_sleep.assert_called_once_with(0.5)
+        # Only the step's own delay is waited, measured from the start of the pattern
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 0.5, delta=0.05)
+
+    def test_execute_click_pattern_schedules_from_start(self):
+        """Test time spent on an action is taken off the next wait and PyAutoGUI's pause is lifted"""
+        clicker = AutoClicker(pattern_spin_ms=2.0)
+        pattern = {'name': 'Timed', 'steps': [{'click': [1, 1], 'wait': 1.0}, {'key': 'a'}]}
+        clock = [100 * 10**9]  # Fake perf_counter_ns: sleeps and clicks advance it, each read adds 1 us
+        pauses = []
+        sleeps = []
+
+        def now():
+            clock[0] += 1000
+            return clock[0]
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += int(seconds * 1e9)
+
+        def click(position):
+            pauses.append(autoclicker.pyautogui.PAUSE)
+            clock[0] += 300 * 10**6  # The click takes 300 ms
+
+        with patch.object(clicker, 'click_at', side_effect=click), \
+             patch.object(clicker, 'simulate_keyboard_input') as mock_keyboard, \
+             patch('time.perf_counter_ns', side_effect=now), \
+             patch('time.sleep', side_effect=sleep):
+
+            clicker.execute_click_pattern(pattern)
+
+        mock_keyboard.assert_called_once_with('a')
+        self.assertEqual(len(sleeps), 1)
+        self.assertAlmostEqual(sleeps[0], 0.698, places=3)  # 1 s - 300 ms click - 2 ms spun
+        self.assertEqual(pauses, [0])
+        self.assertEqual(autoclicker.pyautogui.PAUSE, 0.5)
+
+        timing = clicker.pattern_timing[(None, 'Timed')]
+        self.assertEqual([step.count for step in timing], [1, 1])
+        self.assertLess(timing[1].max_ns, 10_000)  # Started within 10 us of its deadline
+
+    def test_unnamed_pattern_timings_kept_apart(self):
+        """Test patterns without a name get their own timing histograms and report lines by index"""
+        clicker = AutoClicker(logger=self.logger)
+
+        with patch.object(clicker, 'perform_action'):
+            clicker.execute_click_pattern([{'key': 'a'}], 0)
+            clicker.execute_click_pattern([{'key': 'b'}, {'key': 'c'}], 1)
+            clicker.execute_click_pattern([{'key': 'a'}], 0)
+        clicker.report_pattern_timing()
+
+        self.assertEqual([step.count for step in clicker.pattern_timing[(0, 'Unnamed')]], [2])
+        self.assertEqual([step.count for step in clicker.pattern_timing[(1, 'Unnamed')]], [1, 1])
+        messages = [c.args[0] for c in self.logger.call_args_list]
+        self.assertTrue(any(m.startswith("Pattern 'Unnamed #1' timing error") and m.endswith("over 2 actions")
+                            for m in messages))
+        self.assertTrue(any(m.startswith("Pattern 'Unnamed #2' timing error") and m.endswith("over 2 actions")
+                            for m in messages))
+
+    def test_execute_recorded_mouse_actions(self):
+        """Test moves, drags and right clicks from recorded patterns reach PyAutoGUI"""
+        clicker = AutoClicker(safety_zones=[(0, 0, 20, 20)])
+        pattern = [{'move': [50, 60]}, {'down': [50, 60]}, {'up': [90, 60]}, {'click': [30, 30], 'button': 'right'},
+                   {'down': [5, 5]}]
+
+        with patch('autoclicker.pyautogui.moveTo') as mock_move, \
+             patch('autoclicker.pyautogui.mouseDown') as mock_down, \
+             patch('autoclicker.pyautogui.mouseUp') as mock_up, \
+             patch('autoclicker.pyautogui.click') as mock_click:
+
+            clicker.execute_click_pattern(pattern)
+
+        self.assertEqual(mock_move.call_args_list[0], call(50, 60))
+        mock_down.assert_called_once_with(50, 60, button='left')  # The press in the safety zone is skipped
+        mock_up.assert_called_once_with(90, 60, button='left')
+        mock_click.assert_called_once_with(button='right')
+
+    def test_execute_anchored_pattern(self):
+        """Test one anchor detection resolves every step and verification only looks near each step"""
+        clicker = AutoClicker()
+        rng = np.random.default_rng(5)
+        button = rng.integers(0, 256, (20, 40, 3), dtype=np.uint8)
+        screen = np.full((600, 800, 3), 200, dtype=np.uint8)
+        screen[330:350, 300:340] = button  # Centered 80 px left of and 40 px below the anchor at (400, 300)
+        clicker.templates['no.png'] = button
+        pattern = {'anchor': {'text': 'Save changes?'},
+                   'steps': [{'click': [-80, 40], 'verify': {'image': 'no.png'}}, {'click': [80, 40]}]}
+
+        with patch.object(clicker, 'find_target', return_value=(400, 300)) as mock_find, \
+             patch.object(clicker, 'capture_screen', return_value=screen), \
+             patch.object(clicker, 'click_at') as mock_click, \
+             patch('os.path.exists', return_value=True), \
+             patch('cv2.matchTemplate', wraps=cv2.matchTemplate) as mock_match:
+
+            self.assertTrue(clicker.execute_click_pattern(pattern))
+            mock_find.assert_called_once_with('text', 'Save changes?')
+            self.assertEqual(mock_click.call_args_list, [call((320, 340)), call((480, 340))])
+            self.assertEqual(mock_match.call_args[0][0].shape, (52, 72, 3))  # Template plus margins only
+
+            screen[330:350, 300:340] = 200  # The button is gone: nothing is clicked
+            mock_click.reset_mock()
+            self.assertFalse(clicker.execute_click_pattern(pattern))
+            mock_click.assert_not_called()
+
+            mock_find.return_value = None
+            self.assertFalse(clicker.execute_click_pattern(pattern))
+
+    def test_run_workflow_evaluates_only_the_active_state(self):
+        """Test each cycle looks for the active state's targets only and follows matches and timeouts"""
+        clicker = AutoClicker()
+        workflow = autoclicker.autoclicker_workflow.compile_workflow({'states': {
+            'dialog': {'rules': [{'text': 'Error', 'goto': 'failed'}, {'text': 'Continue', 'goto': 'loading'}]},
+            'loading': {'rules': [{'text': 'Ready', 'click': False, 'steps': [{'key': 'enter'}], 'goto': 'done'}],
+                        'timeout': 10, 'on_timeout': 'failed'},
+            'done': {}, 'failed': {}}})
+        searched = []
+        on_screen = {2: 'Continue', 4: 'Ready'}  # Cycle -> text visible in that cycle
+        clock = [0.0]
+
+        def find_target(kind, target):
+            searched.append((clicker.cycle_count, target))
+            return (50, 60) if on_screen.get(clicker.cycle_count) == target else None
+
+        def sleep(seconds):
+            clock[0] += 4.0
+
+        with patch.object(clicker, 'find_target', side_effect=find_target), \
+             patch.object(clicker, 'click_at') as mock_click, \
+             patch.object(clicker, 'simulate_keyboard_input') as mock_keyboard, \
+             patch('time.sleep', side_effect=sleep), \
+             patch('time.monotonic', side_effect=lambda: clock[0]):
+
+            clicker.run_workflow(workflow)
+
+        self.assertEqual(searched, [(1, 'Error'), (1, 'Continue'), (2, 'Error'), (2, 'Continue'),
+                                    (3, 'Ready'), (4, 'Ready')])
+        mock_click.assert_called_once_with((50, 60))
+        mock_keyboard.assert_called_once_with('enter')
+        self.assertIsNone(clicker.workflow_state)
+
+        # Without a match the state times out
+        searched.clear()
+        clicker.cycle_count = 0
+        on_screen = {1: 'Continue'}
+        with patch.object(clicker, 'find_target', side_effect=find_target), \
+             patch.object(clicker, 'click_at'), \
+             patch.object(clicker, 'enter_state', wraps=clicker.enter_state) as mock_enter, \
+             patch('time.sleep', side_effect=sleep), \
+             patch('time.monotonic', side_effect=lambda: clock[0]):
+
+            clicker.run_workflow(workflow)
+
+        self.assertEqual([c.args[1] for c in mock_enter.call_args_list], ['dialog', 'loading', 'failed'])
+        self.assertEqual(len(searched), 2 + 3)  # Two targets in the dialog, then 'Ready' until 10 s passed
+
+    def test_run_loops_log_events_with_name_fields(self):
+        """Test the target_found and pattern_started events, which carry a 'name' field, are logged"""
+        clicker = AutoClicker(logger=self.logger)
+
+        with patch.object(clicker, 'find_target', return_value=(10, 20)), \
+             patch.object(clicker, 'click_at', side_effect=lambda position: clicker.stop()), \
+             patch.object(clicker, 'execute_click_pattern', side_effect=lambda pattern, index: clicker.stop()), \
+             patch('os.path.exists', return_value=True):
+            clicker.run_image_clicker(['images/ok.png'])
+            clicker.stop_flag = False
+            clicker.run_mixed_clicker(['ok.png'])
+            clicker.stop_flag = False
+            clicker.run_pattern_clicker([{'name': 'Login', 'steps': [{'key': 'enter'}]}])
+
+        messages = [c.args[0] for c in self.logger.call_args_list]
+        self.assertIn("Found target 'ok.png' at (10, 20), clicking...", messages)
+        self.assertIn("Found image 'ok.png' at (10, 20), clicking...", messages)
+        self.assertIn("Executing pattern: Login", messages)
+
+    def test_scheduled_run_checks_cheap_urgent_targets_more_often(self):
+        """Test targets are checked on their own periods within the cycle budget"""
+        schedules = {'close.png': parse_schedule("every=0.5 priority=2"), 'Update': parse_schedule("every=5")}
+        clicker = AutoClicker(target_schedules=schedules, cycle_budget_ms=100)
+        clock = [0.0]
+        checks = []
+        cycles = []
+
+        def find_target(kind, target):
+            checks.append(target)
+            cycles.append((clicker.cycle_count, kind))
+            clock[0] += 0.01 if kind == 'image' else 0.2  # OCR is expensive
+            clicker.match_latency[target] = 0.01 if kind == 'image' else 0.2
+            if clock[0] > 20:
+                clicker.stop()
+            return None
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        with patch.object(clicker, 'find_target', side_effect=find_target), \
+             patch('time.sleep', side_effect=sleep), \
+             patch('time.monotonic', side_effect=lambda: clock[0]):
+
+            clicker.run_text_clicker(['Update'])
+            clicker.stop_flag = False
+            clock[0] = 0.0
+            checks.clear()
+            cycles.clear()
+            clicker.run_mixed_clicker(['close.png', 'Update', 'OK'])
+
+        self.assertEqual(checks[:3], ['close.png', 'Update', 'OK'])  # Everything is due at the start
+        self.assertGreaterEqual(checks.count('close.png'), 25)  # Close to every 0.5 s over 20 s
+        self.assertTrue(12 <= checks.count('OK') <= 20)  # The interval, 1 s
+        self.assertLessEqual(checks.count('Update'), 5)
+        # After the first cycle no cycle runs two OCR checks, which would exceed the 100 ms budget
+        later = [cycle for cycle, kind in cycles[3:] if kind == 'text']
+        self.assertEqual(len(later), len(set(later)))
 
     def test_execute_click_pattern_with_stop(self):
         """Test click pattern execution with stop flag"""
@@ -433,6 +882,254 @@ class TestAutoClicker(unittest.TestCase):
         mock_click.assert_not_called()
         mock_keyboard.assert_not_called()
 
+    def test_capture_screen_records_frames_and_repeats(self):
+        """Test frame recording of fresh captures and cached repeats"""
+        clicker = AutoClicker()
+        clicker.recorder = Mock()
+        screen = np.zeros((100, 100, 3), dtype=np.uint8)
+
+        with patch.object(clicker, 'capture_screen_flicker_free', return_value=screen):
+            clicker.capture_screen()
+            clicker.capture_screen()  # Served from cache
+
+        clicker.recorder.record_frame.assert_called_once_with(screen)
+        clicker.recorder.record_repeat.assert_called_once()
+
+    def test_shared_capture_templates_and_ocr(self):
+        """Test a clicker can take frames, templates and its OCR engine from a daemon without owning them"""
+        screen = np.zeros((100, 100, 3), dtype=np.uint8)
+        capture_source = Mock(return_value=screen)
+        templates = {}
+        ocr = Mock()
+        clicker = AutoClicker(capture_source=capture_source, template_cache=templates, ocr_engine=ocr,
+                              templates={'ok.png': screen})
+
+        np.testing.assert_array_equal(clicker.capture_screen(), screen)
+        capture_source.assert_called_once_with(clicker.capture_screen_flicker_free)
+        self.assertIs(clicker.templates, templates)
+        self.assertIn('ok.png', templates)
+        self.assertIs(clicker.get_ocr(), ocr)
+
+        clicker.finish_run()
+        ocr.close.assert_not_called()
+        self.assertIs(clicker.ocr, ocr)
+
+    def test_damage_events_limit_search_to_changes(self):
+        """Test damage mode waits for changes, captures only changed frames and searches only damaged areas"""
+        frame = np.zeros((100, 100, 3), dtype=np.uint8)
+        template = np.random.RandomState(0).randint(0, 255, (10, 10, 3)).astype(np.uint8)
+        frame[60:70, 40:50] = template
+        monitor = Mock(frame=frame, version=1, reports=2, pixels_grabbed=64)
+        monitor.wait.side_effect = [[], [(45, 65, 8, 8)], [(0, 0, 8, 8)], []]
+        clicker = AutoClicker(damage_events=True, interval=0.01, templates={'ok.png': template})
+        clicker.damage = monitor
+
+        with patch('os.path.exists', return_value=True):
+            self.assertEqual(clicker.find_image('ok.png'), (45, 65))  # First cycle searches the whole screen
+            clicker.wait_for_next_cycle()  # Waits through a timeout until the next change
+            self.assertEqual(clicker.search_areas, [(45, 65, 8, 8)])
+            self.assertEqual(clicker.find_image('ok.png'), (45, 65))  # Overlaps the change
+            clicker.wait_for_next_cycle()
+            self.assertIsNone(clicker.find_image('ok.png'))  # Unchanged, so not looked at
+
+            clicker.click_count += 1
+            clicker.wait_for_next_cycle(until=time.monotonic())
+            self.assertIsNone(clicker.search_areas)  # The whole screen again after a click
+
+        self.assertEqual(monitor.wait.call_count, 4)
+        self.assertEqual(clicker.capture_count, 1)
+        with self.assertRaises(ValueError):
+            AutoClicker(damage_events=True, cycle_budget_ms=10)
+
+        clicker.finish_run()
+        monitor.close.assert_called_once()
+        self.assertIsNone(clicker.damage)
+
+    def test_main_replay_runs_offline_and_always_closes(self):
+        """Test --replay=FILE skips the display check and the clicker is closed when a run fails"""
+        argv = ['autoclicker.py', '--mode', 'image', '--target', 'ok.png', '--replay=frames.rec']
+        with patch.object(sys, 'argv', argv), \
+             patch.object(autoclicker, 'load_pyautogui') as mock_load, \
+             patch.object(autoclicker, 'AutoClicker') as mock_class:
+            mock_class.return_value.run_image_clicker.side_effect = RuntimeError("capture failed")
+            with self.assertRaises(RuntimeError):
+                autoclicker.main()
+
+        mock_load.assert_not_called()
+        self.assertEqual(mock_class.call_args.kwargs['replay_path'], 'frames.rec')
+        mock_class.return_value.close.assert_called_once()
+        mock_class.return_value.events.close.assert_called_once()
+
+    def test_close_closes_frame_recording(self):
+        """Test closing the clicker closes its recording file, once"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            clicker = AutoClicker(record_path=os.path.join(temp_dir, 'frames.rec'))
+            clicker.close()
+            clicker.close()
+
+            self.assertTrue(clicker.recorder.file.closed)
+
+    def test_capture_screen_replay_stops_when_exhausted(self):
+        """Test replay serves recorded frames and stops at the end of the recording"""
+        clicker = AutoClicker()
+        frame = np.ones((10, 10, 3), dtype=np.uint8)
+        clicker.replay = Mock()
+        clicker.replay.next_frame.side_effect = [frame, None]
+        clicker.replay.__len__ = Mock(return_value=1)
+
+        with patch.object(clicker, 'capture_screen_flicker_free') as mock_capture:
+            first = clicker.capture_screen()
+            second = clicker.capture_screen()
+
+        mock_capture.assert_not_called()
+        np.testing.assert_array_equal(first, frame)
+        np.testing.assert_array_equal(second, frame)
+        self.assertTrue(clicker.stop_flag)
+
+    def test_debug_screenshot_patch_crop(self):
+        """Test failed matches queue a template-sized patch at the best match"""
+        clicker = AutoClicker(screenshot_debug=True, debug_crop='patch')
+        clicker.screenshot_writer = Mock()
+        screen = np.zeros((100, 100, 3), dtype=np.uint8)
+
+        clicker.save_debug_screenshot(screen, "failed_match_button.png", patch=(10, 20, 30, 15))
+
+        clicker.screenshot_writer.submit.assert_called_once_with(screen, "failed_match_button.png",
+                                                                 crop=(10, 20, 30, 15))
+
+
+class TestDebugScreenshotWriter(unittest.TestCase):
+    """Test cases for the background debug screenshot writer"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = self.tmpdir.name
+        self.screen = np.zeros((200, 300, 3), dtype=np.uint8)
+
+    def tearDown(self):
+        """Remove written screenshots"""
+        self.tmpdir.cleanup()
+
+    def saved_files(self):
+        return sorted(os.listdir(self.directory))
+
+    def test_writes_cropped_patch_in_background(self):
+        """Test a cropped screenshot is written by the worker thread"""
+        logger = Mock()
+        writer = DebugScreenshotWriter(directory=self.directory, logger=logger)
+        writer.start()
+
+        self.assertTrue(writer.submit(self.screen, "failed_match_ok.png", crop=(10, 20, 50, 40)))
+        writer.close()
+
+        files = self.saved_files()
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].startswith("debug_screenshot_"))
+        self.assertTrue(files[0].endswith("_failed_match_ok.png.png"))
+        saved = cv2.imread(os.path.join(self.directory, files[0]))
+        self.assertEqual(saved.shape, (40, 50, 3))
+        self.assertEqual(writer.saved, 1)
+        logger.assert_called_once()
+
+    def test_rate_limit_per_suffix(self):
+        """Test repeated screenshots for the same target are rate limited"""
+        writer = DebugScreenshotWriter(directory=self.directory, min_interval=60)
+
+        self.assertTrue(writer.submit(self.screen, "failed_ocr_OK"))
+        self.assertFalse(writer.submit(self.screen, "failed_ocr_OK"))
+        self.assertTrue(writer.submit(self.screen, "failed_ocr_Cancel"))
+        self.assertEqual(writer.rate_limited, 1)
+
+    def test_drop_newest_when_queue_full(self):
+        """Test the default drop policy discards new screenshots when the queue is full"""
+        writer = DebugScreenshotWriter(directory=self.directory, max_queue=2, min_interval=0)
+
+        results = [writer.submit(self.screen, f"target_{i}") for i in range(3)]
+
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(writer.dropped, 1)
+        self.assertTrue(writer.queue.queue[0][0].endswith("_target_0.png"))
+
+    def test_drop_oldest_when_queue_full(self):
+        """Test the oldest queued screenshot is discarded with the 'oldest' policy"""
+        writer = DebugScreenshotWriter(directory=self.directory, max_queue=2, min_interval=0,
+                                       drop_policy='oldest')
+
+        results = [writer.submit(self.screen, f"target_{i}") for i in range(3)]
+
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual(writer.dropped, 1)
+        self.assertTrue(writer.queue.queue[0][0].endswith("_target_1.png"))
+
+    def test_disk_quota(self):
+        """Test screenshots stop once the disk quota is reached"""
+        logger = Mock()
+        writer = DebugScreenshotWriter(directory=self.directory, disk_quota=10, min_interval=0, logger=logger)
+        writer.start()
+
+        writer.submit(self.screen, "first")
+        writer.close()
+
+        self.assertEqual(self.saved_files(), [])
+        self.assertTrue(writer.quota_exceeded)
+        self.assertFalse(writer.submit(self.screen, "second"))
+
+
+class TestStartupTime(unittest.TestCase):
+    """Import-time budget for the command line and GUI entry points"""
+
+    # Dependencies that must only load once the mode that needs them runs
+    DEFERRED_MODULES = ['cv2', 'numpy', 'pytesseract', 'pygame', 'pynput', 'pyautogui', 'keyboard', 'PIL']
+    # Cumulative import time allowed per entry point; the GUI also loads tkinter
+    STARTUP_BUDGETS_US = {'autoclicker': 150000, 'autoclicker_gui': 250000}
+
+    def run_python(self, *args):
+        """Run the interpreter in the project directory"""
+        return subprocess.run([sys.executable] + list(args), capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=60)
+
+    def import_times(self, module):
+        """Return {module: cumulative import time in microseconds} from python -X importtime"""
+        result = self.run_python('-X', 'importtime', '-c', f'import {module}')
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            _, cumulative, name = line.split('|')
+            try:
+                times[name.strip()] = int(cumulative)
+            except ValueError:
+                continue  # Column header
+        return times
+
+    def test_import_defers_heavy_dependencies(self):
+        """Test importing autoclicker or the GUI loads none of the heavy dependencies"""
+        for entry_point in self.STARTUP_BUDGETS_US:
+            times = self.import_times(entry_point)
+
+            loaded = {name.split('.')[0] for name in times}
+            for module in self.DEFERRED_MODULES:
+                self.assertNotIn(module, loaded, entry_point)
+
+    def test_import_within_startup_budget(self):
+        """Test importing autoclicker or the GUI stays within its startup budget"""
+        for entry_point, budget in self.STARTUP_BUDGETS_US.items():
+            # Best of three runs to smooth out cold caches and scheduler noise
+            best = min(self.import_times(entry_point)[entry_point] for _ in range(3))
+
+            self.assertLess(best, budget, entry_point)
+
+    def test_help_skips_pygame_banner(self):
+        """Test --help does not load pygame or print its banner"""
+        result = self.run_python('autoclicker.py', '--help')
+
+        self.assertEqual(result.returncode, 0)
+        self.assertIn('--mode', result.stdout)
+        self.assertNotIn('pygame', result.stdout)
+
 
 if __name__ == '__main__':
     unittest.main()
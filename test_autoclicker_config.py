@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker run configuration compiling
+"""
+
+import unittest
+import tempfile
+import random
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+import numpy as np
+import cv2
+
+# Add the current directory to the path so we can import autoclicker_config
+sys.path.insert(0, os.path.dirname(__file__))
+
+import autoclicker_config
+from autoclicker_config import (ConfigCompiler, SafetyZoneIndex, parse_safety_zone, parse_lines, split_target,
+                                split_target_options)
+from autoclicker_schedule import TargetSchedule
+
+class TestRunConfig(unittest.TestCase):
+    """Test cases for SafetyZoneIndex and ConfigCompiler"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.template_path = os.path.join(self.directory.name, 'button.png')
+        cv2.imwrite(self.template_path, np.full((20, 30, 3), 128, dtype=np.uint8))
+
+    def tearDown(self):
+        """Remove temporary templates"""
+        self.directory.cleanup()
+
+    def test_parse_lines_skips_comments(self):
+        """Test comments and blank lines are dropped"""
+        self.assertEqual(parse_lines("# comment\n OK \n\nCancel"), ['OK', 'Cancel'])
+
+    def test_parse_safety_zone(self):
+        """Test zone parsing and validation messages"""
+        self.assertEqual(parse_safety_zone("10, 20, 30, 40"), (10, 20, 30, 40))
+        with self.assertRaisesRegex(ValueError, "Invalid safety zone format"):
+            parse_safety_zone("10,20,30")
+        with self.assertRaisesRegex(ValueError, "Invalid safety zone coordinates"):
+            parse_safety_zone("10,20,0,40")
+        with self.assertRaisesRegex(ValueError, "Error parsing safety zone"):
+            parse_safety_zone("a,b,c,d")
+
+    def test_split_target_profile(self):
+        """Test OCR options after ' | ' are split off only when they look like a profile"""
+        target, profile = split_target("Total | psm=7 whitelist=0123456789")
+        self.assertEqual((target, profile.psm, profile.whitelist), ("Total", 7, "0123456789"))
+        self.assertEqual(split_target("Save | Cancel"), ("Save | Cancel", None))
+        self.assertEqual(split_target("OK"), ("OK", None))
+        with self.assertRaises(ValueError):
+            split_target("Total | psm=99")
+
+    def test_split_target_schedule(self):
+        """Test schedule options are split off for any target, alongside an OCR profile"""
+        target, profile, schedule = split_target_options("Total | psm=7 every=5 priority=2")
+        self.assertEqual((target, profile.psm, schedule), ("Total", 7, TargetSchedule(5.0, 2)))
+        self.assertEqual(split_target_options("close.png | budget=20"), ("close.png", None, TargetSchedule(budget=20.0)))
+        self.assertEqual(split_target_options("Save | every day"), ("Save | every day", None, None))
+        with self.assertRaises(ValueError):
+            split_target_options("OK | every=0")
+
+    def test_zone_index_matches_linear_scan(self):
+        """Test indexed lookups agree with checking every zone"""
+        rng = random.Random(1)
+        zones = [(rng.randrange(2000), rng.randrange(1200), rng.randrange(1, 300), rng.randrange(1, 300))
+                 for _ in range(500)]
+        zones.append((0, 0, 5000, 5000))  # Large zone kept outside the grid
+        index = SafetyZoneIndex(zones[:-1])
+        large_index = SafetyZoneIndex(zones)
+
+        self.assertEqual(len(large_index.large_zones), 1)
+        for _ in range(2000):
+            x, y = rng.randrange(2400), rng.randrange(1600)
+            expected = any(zx <= x <= zx + zw and zy <= y <= zy + zh for zx, zy, zw, zh in zones[:-1])
+            self.assertEqual(index.contains(x, y), expected)
+            self.assertTrue(large_index.contains(x, y))
+
+    def test_zone_index_includes_edges(self):
+        """Test zone edges count as inside, matching the original check"""
+        index = SafetyZoneIndex([(100, 100, 28, 28)])
+        self.assertTrue(index.contains(128, 128))
+        self.assertFalse(index.contains(129, 128))
+
+    def test_compile_validates_and_decodes(self):
+        """Test targets, templates, zones and errors in a compiled configuration"""
+        compiler = ConfigCompiler()
+
+        config = compiler.compile(f"# targets\nOK\n{self.template_path}\n", "0,0,10,10\nbad zone")
+
+        self.assertEqual(config.targets, ['OK', self.template_path])
+        self.assertEqual(config.existing, {self.template_path})
+        self.assertEqual(config.templates[self.template_path].shape, (20, 30, 3))
+        self.assertEqual(config.zones, [(0, 0, 10, 10)])
+        self.assertTrue(config.zone_index.contains(5, 5))
+        self.assertEqual(config.errors, ["Invalid safety zone format: bad zone"])
+
+    def test_compile_profiles(self):
+        """Test per-target OCR profiles are compiled and invalid ones reported"""
+        compiler = ConfigCompiler()
+
+        config = compiler.compile(f"Total | psm=7\nOK | scale=0\n{self.template_path} | psm=7", "")
+
+        self.assertEqual(config.targets, ['Total', self.template_path])
+        self.assertEqual(config.profiles['Total'].psm, 7)
+        self.assertNotIn(self.template_path, config.profiles)
+        self.assertEqual(len(config.errors), 2)
+
+    def test_compile_schedules(self):
+        """Test per-target schedules are compiled for images and texts"""
+        config = ConfigCompiler().compile(f"Total | every=10\n{self.template_path} | priority=3\nOK", "")
+
+        self.assertEqual(config.schedules, {'Total': TargetSchedule(period=10.0),
+                                            self.template_path: TargetSchedule(priority=3)})
+        self.assertEqual(config.errors, [])
+
+    def test_recompile_reuses_templates(self):
+        """Test unchanged templates are not decoded again after an edit"""
+        compiler = ConfigCompiler()
+
+        with patch.object(autoclicker_config, 'load_template', wraps=autoclicker_config.load_template) as mock_load:
+            compiler.compile(self.template_path, "")
+            config = compiler.compile(self.template_path + "\nOK", "")
+
+        mock_load.assert_called_once_with(self.template_path)
+        self.assertIn(self.template_path, config.templates)
+
+    def test_current_and_get(self):
+        """Test a compiled configuration is only reused for identical contents"""
+        compiler = ConfigCompiler()
+        config = compiler.compile("OK", "")
+
+        self.assertIs(compiler.current("OK", ""), config)
+        self.assertIsNone(compiler.current("Cancel", ""))
+        self.assertIs(compiler.get("OK", ""), config)
+        self.assertEqual(compiler.get("Cancel", "").targets, ['Cancel'])
+
+    def test_background_compile(self):
+        """Test submitted contents are compiled on the worker thread"""
+        compiler = ConfigCompiler()
+        compiler.start()
+        try:
+            compiler.submit("OK", "1,1,5,5")
+            deadline = time.monotonic() + 2
+            while compiler.current("OK", "1,1,5,5") is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            compiler.close()
+
+        self.assertEqual(compiler.current("OK", "1,1,5,5").zones, [(1, 1, 5, 5)])
+
+
+    def test_import_defers_opencv(self):
+        """Test importing the compiler, as the GUI does at startup, loads neither OpenCV nor the preview"""
+        result = subprocess.run([sys.executable, '-c', "import sys, autoclicker_config; "
+                                 "print(sorted({'cv2', 'autoclicker_preview'} & set(sys.modules)))"],
+                                capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.stdout.strip(), '[]', result.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the AutoClicker daemon
+"""
+
+import unittest
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+# Add the current directory to the path so we can import autoclicker_daemon
+sys.path.insert(0, os.path.dirname(__file__))
+
+import autoclicker
+from autoclicker_daemon import (ClickerDaemon, SharedCapture, RpcError, call, INVALID_PARAMS, JOB_NOT_FOUND,
+                                METHOD_NOT_FOUND, PARSE_ERROR)
+from autoclicker_events import EventLog
+
+
+class FakeClicker:
+    """Stands in for AutoClicker: loops until stopped, taking frames from the shared capture"""
+    instances = []
+
+    def __init__(self, event_sinks=None, **settings):
+        self.settings = settings
+        self.events = EventLog(event_sinks)
+        self.stop_flag = False
+        self.pause_flag = False
+        self.cycle_count = 0
+        FakeClicker.instances.append(self)
+
+    def run(self, targets):
+        self.targets = targets
+        self.events.info('run_started', "Started")
+        while not self.stop_flag:
+            if not self.pause_flag:
+                self.settings['capture_source'](lambda: 'frame')
+                self.cycle_count += 1
+            time.sleep(0.005)
+        self.events.info('run_stopped', "Stopped")
+
+    run_image_clicker = run_text_clicker = run_mixed_clicker = run_pattern_clicker = run_workflow = run
+
+    def toggle_pause(self):
+        self.pause_flag = not self.pause_flag
+
+    def stop(self):
+        self.stop_flag = True
+
+    def close(self):
+        pass
+
+    def get_statistics(self):
+        return {'total_clicks': 0}
+
+    def stats_snapshot(self):
+        return {'cycles': self.cycle_count, 'paused': self.pause_flag}
+
+
+class TestDaemon(unittest.TestCase):
+    """Test cases for the shared capture stream and the JSON-RPC job API"""
+
+    def setUp(self):
+        FakeClicker.instances = []
+        self.directory = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.directory, 'daemon.sock')
+        self.daemon = ClickerDaemon(self.socket_path, frame_age=60, clicker_class=FakeClicker)
+        self.daemon.start()
+
+    def tearDown(self):
+        self.daemon.close()
+        shutil.rmtree(self.directory)
+
+    def wait_for(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return condition()
+
+    def test_shared_capture_takes_one_frame_for_concurrent_jobs(self):
+        """Test jobs asking for a frame together share one capture until it is too old"""
+        shared = SharedCapture(max_age=60)
+        grabs = []
+
+        def grab():
+            time.sleep(0.02)
+            grabs.append(1)
+            return 'frame'
+
+        threads = [threading.Thread(target=shared, args=(grab,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual((len(grabs), shared.captures, shared.reused), (1, 1, 7))
+
+        shared.max_age = 0
+        self.assertEqual(shared(grab), 'frame')
+        self.assertEqual(len(grabs), 2)
+
+    def test_submit_pause_resume_stop_and_query(self):
+        """Test a job is controlled over the socket and shares the daemon's capture, templates and OCR"""
+        job = call('submit', self.socket_path, mode='text', targets=['OK, Cancel | every=2'],
+                   options={'interval': 0.5, 'region': [0, 0, 100, 50]}, name='dialogs')
+        self.assertEqual((job['job'], job['name'], job['state']), (1, 'dialogs', 'running'))
+
+        clicker = FakeClicker.instances[0]
+        self.assertEqual(clicker.targets, ['OK', 'Cancel'])
+        self.assertEqual(clicker.settings['region'], (0, 0, 100, 50))
+        self.assertEqual(clicker.settings['target_schedules']['Cancel'].period, 2.0)
+        self.assertIs(clicker.settings['capture_source'], self.daemon.capture)
+        self.assertIs(clicker.settings['template_cache'], self.daemon.templates)
+        self.assertIs(clicker.settings['ocr_engine'], self.daemon.ocr)
+
+        self.assertEqual(call('pause', self.socket_path, job=1)['state'], 'paused')
+        self.assertEqual(call('resume', self.socket_path, job=1)['state'], 'running')
+        call('submit', self.socket_path, mode='image', targets=['button.png'])
+        self.assertTrue(self.wait_for(lambda: all(c.cycle_count > 2 for c in FakeClicker.instances)))
+
+        call('stop', self.socket_path, job=1)
+        self.assertTrue(self.wait_for(lambda: call('query', self.socket_path, job=1)['state'] == 'finished'))
+        status = call('query', self.socket_path, job=1, log=True)
+        self.assertEqual([record['event'] for record in status['log']], ['run_started', 'run_stopped'])
+
+        overview = call('query', self.socket_path)
+        self.assertEqual([job['state'] for job in overview['jobs']], ['finished', 'running'])
+        self.assertEqual(overview['shared']['captures'], 1)  # Both jobs got the one fresh frame
+        self.assertGreater(overview['shared']['frames_reused'], 4)
+
+    def test_overlapping_pattern_jobs_take_turns(self):
+        """Test pattern jobs running together never split each other's drags and leave PAUSE as it was"""
+        daemon = ClickerDaemon(os.path.join(self.directory, 'patterns.sock'))
+        calls = []
+
+        def record(action):
+            def mouse(x, y, button='left'):
+                calls.append((action, x, autoclicker.pyautogui.PAUSE))
+                time.sleep(0.002)  # Leave the other job time to cut in
+            return mouse
+
+        def drag(x):
+            return {'steps': [{'down': [x, 10]}, {'move': [x + 5, 10], 'wait': 0.005}, {'up': [x + 10, 10]}]}
+
+        with patch.object(autoclicker.pyautogui, 'PAUSE', 0.5), \
+             patch.object(autoclicker.pyautogui, 'mouseDown', side_effect=record('down')), \
+             patch.object(autoclicker.pyautogui, 'moveTo', side_effect=record('move')), \
+             patch.object(autoclicker.pyautogui, 'mouseUp', side_effect=record('up')):
+            try:
+                daemon.submit('pattern', [drag(100)], {'interval': 0.001})
+                daemon.submit('pattern', [drag(500)], {'interval': 0.001})
+                self.assertTrue(self.wait_for(lambda: {x for _, x, _ in calls} >= {100, 500} and len(calls) > 60))
+            finally:
+                daemon.close()
+            self.assertEqual(autoclicker.pyautogui.PAUSE, 0.5)
+
+        self.assertEqual({pause for _, _, pause in calls}, {0})
+        for i in range(0, len(calls) - 2, 3):  # Each drag's down, move and up run back to back
+            drag_calls = calls[i:i + 3]
+            self.assertEqual([action for action, _, _ in drag_calls], ['down', 'move', 'up'])
+            self.assertEqual(len({x // 100 for _, x, _ in drag_calls}), 1)
+
+    def test_errors(self):
+        """Test invalid requests get JSON-RPC errors and leave the daemon serving"""
+        for method, params, code in [('launch', {}, METHOD_NOT_FOUND),
+                                     ('submit', {'mode': 'draw', 'targets': ['x']}, INVALID_PARAMS),
+                                     ('submit', {'mode': 'text', 'targets': ['x'], 'options': {'dpi': 2}},
+                                      INVALID_PARAMS),
+                                     ('submit', {'mode': 'text'}, INVALID_PARAMS),
+                                     ('pause', {'job': 42}, JOB_NOT_FOUND)]:
+            with self.assertRaises(RpcError, msg=method) as raised:
+                call(method, self.socket_path, **params)
+            self.assertEqual(raised.exception.code, code, msg=(method, params))
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(self.socket_path)
+            client.sendall(b'not json\n')
+            self.assertEqual(json.loads(client.makefile('rb').readline())['error']['code'], PARSE_ERROR)
+        self.assertEqual(call('query', self.socket_path)['jobs'], [])
+
+    def test_shutdown_and_stale_socket(self):
+        """Test shutdown stops running jobs and a socket left behind is replaced"""
+        call('submit', self.socket_path, mode='mixed', targets=['a.png, Start'])
+        self.assertEqual(call('shutdown', self.socket_path), {'stopping': True})
+        self.assertTrue(self.daemon.wait(1))
+
+        with self.assertRaises(RuntimeError):  # The running daemon keeps its socket
+            ClickerDaemon(self.socket_path, clicker_class=FakeClicker).start()
+
+        self.daemon.close()
+        self.assertTrue(FakeClicker.instances[0].stop_flag)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)  # Bound but nobody listening, as after a crash
+        stale.close()
+        self.daemon = ClickerDaemon(self.socket_path, clicker_class=FakeClicker)
+        self.daemon.start()
+        self.assertEqual(call('query', self.socket_path)['jobs'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
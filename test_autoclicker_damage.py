@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker damage tracking
+"""
+
+import unittest
+import collections
+import importlib.util
+import inspect
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+import numpy as np
+
+# Add the current directory to the path so we can import autoclicker_damage
+sys.path.insert(0, os.path.dirname(__file__))
+
+from autoclicker_damage import DamageMonitor, clip_rect, expand_rect, merge_rects
+
+
+class FakeConnection:
+    """Stands in for a python-xlib Display with the DAMAGE extension: events arrive through a pipe"""
+    FIRST_EVENT = 91
+
+    def __init__(self, width=64, height=48):
+        self.pixels = np.zeros((height, width, 4), dtype=np.uint8)
+        self.events = collections.deque()
+        self.read_fd, self.write_fd = os.pipe()
+        self.grabs = []
+        self.subtracted = 0
+        self.closed = False
+        self.root = FakeRoot(self, width, height)
+
+    def has_extension(self, extension):
+        return extension == 'DAMAGE'
+
+    def damage_query_version(self):
+        pass
+
+    def query_extension(self, name):
+        return SimpleNamespace(first_event=self.FIRST_EVENT)
+
+    def screen(self):
+        return SimpleNamespace(root=self.root)
+
+    def flush(self):
+        pass
+
+    def fileno(self):
+        return self.read_fd
+
+    def pending_events(self):
+        return len(self.events)
+
+    def next_event(self):
+        os.read(self.read_fd, 1)
+        return self.events.popleft()
+
+    def post(self, event_type, **fields):
+        self.events.append(SimpleNamespace(type=event_type, **fields))
+        os.write(self.write_fd, b'.')
+
+    def draw(self, x, y, width, height, value):
+        """Paint a rectangle and report it as damage"""
+        self.pixels[y:y + height, x:x + width, :3] = value
+        self.post(self.FIRST_EVENT, area=SimpleNamespace(x=x, y=y, width=width, height=height))
+
+    def damage_subtract(self, damage, repair=0, parts=0):
+        self.subtracted += 1
+
+    def damage_destroy(self, damage):
+        pass
+
+    def close(self):
+        self.closed = True
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+
+class FakeRoot:
+    """Stands in for the root window of a FakeConnection"""
+
+    def __init__(self, connection, width, height):
+        self.connection = connection
+        self.width = width
+        self.height = height
+
+    def get_geometry(self):
+        return SimpleNamespace(width=self.width, height=self.height)
+
+    def damage_create(self, level):
+        return 'damage'
+
+    def get_image(self, x, y, width, height, format, plane_mask):
+        self.connection.grabs.append((x, y, width, height))
+        return SimpleNamespace(data=self.connection.pixels[y:y + height, x:x + width].tobytes())
+
+
+class TestRects(unittest.TestCase):
+    """Test cases for damage rectangle helpers"""
+
+    def test_clip_expand_and_merge(self):
+        """Test rectangles are clipped, grown within bounds and merged"""
+        bounds = (0, 0, 100, 50)
+        self.assertEqual(clip_rect((90, 40, 20, 20), bounds), (90, 40, 10, 10))
+        self.assertIsNone(clip_rect((100, 0, 5, 5), bounds))
+        self.assertEqual(expand_rect((5, 5, 10, 10), 8, 2, bounds), (0, 3, 23, 14))
+
+        self.assertEqual(merge_rects([(0, 0, 10, 10), (5, 5, 10, 10), (50, 0, 5, 5)]),
+                         [(0, 0, 15, 15), (50, 0, 5, 5)])
+        self.assertEqual(merge_rects([(i * 10, 0, 2, 2) for i in range(5)], limit=4), [(0, 0, 42, 2)])
+
+
+@unittest.skipUnless(importlib.util.find_spec('Xlib'), "python-xlib not installed")
+class TestDamageMonitor(unittest.TestCase):
+    """Test cases for waiting on X DAMAGE events"""
+
+    def setUp(self):
+        self.connection = FakeConnection()
+        self.monitor = DamageMonitor(region=(8, 8, 40, 32), connection=self.connection, settle=0.005)
+
+    def tearDown(self):
+        self.monitor.close()
+
+    def test_fakes_match_python_xlib(self):
+        """Test the fake X connection takes the same arguments as python-xlib's"""
+        from Xlib import display
+        from Xlib.ext import damage
+        from Xlib.xobject import drawable
+
+        real = {
+            (FakeConnection, 'has_extension'): display.Display.has_extension,
+            (FakeConnection, 'query_extension'): display.Display.query_extension,
+            (FakeConnection, 'damage_query_version'): damage.query_version,
+            (FakeConnection, 'damage_subtract'): damage.damage_subtract,
+            (FakeConnection, 'damage_destroy'): damage.damage_destroy,
+            (FakeRoot, 'damage_create'): damage.damage_create,
+            (FakeRoot, 'get_image'): drawable.Drawable.get_image,
+            (FakeRoot, 'get_geometry'): drawable.Drawable.get_geometry,
+        }
+        for (fake, name), method in real.items():
+            self.assertEqual(inspect.signature(getattr(fake, name)), inspect.signature(method), name)
+
+    def test_wait_returns_damage_within_region(self):
+        """Test only damaged rectangles in the region are reported and grabbed into the frame"""
+        self.assertEqual(self.connection.grabs, [(8, 8, 40, 32)])
+        self.connection.draw(10, 10, 4, 4, 200)
+        self.connection.draw(40, 30, 20, 10, 100)  # Partly outside the region
+        self.connection.draw(0, 0, 4, 4, 50)  # Outside the region
+        self.connection.post(self.connection.FIRST_EVENT + 1)  # Another extension's event
+
+        changed = self.monitor.wait(1.0)
+
+        self.assertEqual(changed, [(10, 10, 4, 4), (40, 30, 8, 10)])
+        self.assertEqual(self.connection.grabs[1:], changed)
+        self.assertEqual((self.monitor.reports, self.monitor.version, self.connection.subtracted), (3, 1, 1))
+        self.assertEqual(self.monitor.frame.shape, (40, 48, 3))
+        self.assertEqual(self.monitor.frame[11, 11].tolist(), [200] * 3)
+        self.assertEqual(self.monitor.frame[35, 45].tolist(), [100] * 3)
+        self.assertEqual(self.monitor.frame[2, 2].tolist(), [0] * 3)
+
+    def test_idle_wait_blocks_without_polling(self):
+        """Test a wait without damage sleeps in select() until its timeout"""
+        started, cpu = time.monotonic(), time.process_time()
+        self.assertEqual(self.monitor.wait(0.2), [])
+        self.assertGreaterEqual(time.monotonic() - started, 0.19)
+        self.assertLess(time.process_time() - cpu, 0.05)
+        self.assertEqual((self.monitor.version, self.connection.subtracted), (0, 0))
+
+    def test_damage_wakes_wait_promptly(self):
+        """Test damage arriving during a long wait is reported within the settle time"""
+        posted = []
+
+        def draw():
+            time.sleep(0.05)
+            posted.append(time.monotonic())
+            self.connection.draw(20, 20, 2, 2, 255)
+
+        thread = threading.Thread(target=draw)
+        thread.start()
+        changed = self.monitor.wait(5.0)
+        latency = time.monotonic() - posted[0]
+        thread.join()
+
+        self.assertEqual(changed, [(20, 20, 2, 2)])
+        self.assertLess(latency, 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
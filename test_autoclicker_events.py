@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker structured event logging
+"""
+
+import unittest
+import tempfile
+import io
+import json
+import os
+import sys
+from unittest.mock import Mock
+
+# Add the current directory to the path so we can import autoclicker_events
+sys.path.insert(0, os.path.dirname(__file__))
+
+from autoclicker_events import (EventLog, CallbackSink, StreamSink, JsonLinesSink, parse_level,
+                                DEBUG, INFO, WARNING, ERROR)
+
+class CountingValue:
+    """Field value that counts how often it is rendered"""
+    def __init__(self):
+        self.renders = 0
+
+    def __format__(self, spec):
+        self.renders += 1
+        return "value"
+
+class TestEventLog(unittest.TestCase):
+    """Test cases for EventLog and its sinks"""
+
+    def test_levels_filter_per_sink(self):
+        """Test each sink only receives events at or above its level"""
+        info_callback = Mock()
+        debug_callback = Mock()
+        events = EventLog([CallbackSink(info_callback, level=INFO), CallbackSink(debug_callback, level=DEBUG)])
+
+        events.debug('no_targets', "No targets found, waiting...")
+        events.warning('click_failed', "Click failed at {position}", position=(1, 2))
+
+        info_callback.assert_called_once_with("Click failed at (1, 2)")
+        self.assertEqual(debug_callback.call_count, 2)
+
+    def test_disabled_events_are_never_formatted(self):
+        """Test message formatting is deferred until a sink accepts the event"""
+        value = CountingValue()
+        events = EventLog([CallbackSink(Mock(), level=WARNING)])
+
+        self.assertFalse(events.debug_enabled)
+        events.debug('ocr_match', "Found {value}", value=value)
+        events.info('target_found', "Found {value}", value=value)
+        self.assertEqual(value.renders, 0)
+
+        events.error('failed', "Failed {value}", value=value)
+        self.assertEqual(value.renders, 1)
+
+    def test_message_rendered_once_for_many_sinks(self):
+        """Test an event is formatted once however many sinks receive it"""
+        value = CountingValue()
+        events = EventLog([CallbackSink(Mock()), CallbackSink(Mock()), StreamSink(io.StringIO())])
+
+        events.info('target_found', "Found {value}", value=value)
+
+        self.assertEqual(value.renders, 1)
+
+    def test_debug_enabled_tracks_sinks(self):
+        """Test debug_enabled follows the lowest sink level"""
+        events = EventLog()
+        self.assertFalse(events.debug_enabled)
+        self.assertFalse(events.enabled(ERROR))
+
+        sink = CallbackSink(Mock(), level='debug')
+        events.add_sink(sink)
+        self.assertTrue(events.debug_enabled)
+
+        events.remove_sink(sink)
+        self.assertFalse(events.debug_enabled)
+
+    def test_stream_sink(self):
+        """Test the stream sink prefixes non-info levels"""
+        stream = io.StringIO()
+        events = EventLog([StreamSink(stream, level=DEBUG)])
+
+        events.info('paused', "Autoclicker paused")
+        events.warning('safety_zone', "Safety zone violation at {position}", position=(5, 5))
+
+        lines = stream.getvalue().splitlines()
+        self.assertTrue(lines[0].endswith("] Autoclicker paused"))
+        self.assertTrue(lines[1].endswith("] WARNING: Safety zone violation at (5, 5)"))
+
+    def test_json_lines_sink(self):
+        """Test the JSON lines sink writes typed fields"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'events.jsonl')
+            events = EventLog([JsonLinesSink(path)])
+
+            events.info('target_found', "Found text '{target}' at {position}", target='OK', position=(10, 20))
+            events.warning('click_failed', "Click failed: {error}", error=RuntimeError("boom"))
+            events.close()
+
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+
+        self.assertEqual(records[0]['event'], 'target_found')
+        self.assertEqual(records[0]['level'], 'info')
+        self.assertEqual(records[0]['message'], "Found text 'OK' at (10, 20)")
+        self.assertEqual(records[0]['position'], [10, 20])
+        self.assertEqual(records[1]['error'], 'boom')
+
+    def test_fields_may_share_parameter_names(self):
+        """Test fields called 'name' or 'template' do not clash with the event's own"""
+        callback = Mock()
+        events = EventLog([CallbackSink(callback, level=DEBUG)])
+
+        events.info('pattern_started', "Executing pattern: {name}", name='Login')
+        events.emit(WARNING, 'ocr_profile', "Bad {template}", template='psm=99')
+
+        self.assertEqual([c.args[0] for c in callback.call_args_list], ["Executing pattern: Login", "Bad psm=99"])
+
+    def test_logger_adapter(self):
+        """Test plain logger callbacks are routed through the event log"""
+        callback = Mock()
+        events = EventLog([CallbackSink(callback, level=WARNING)])
+
+        events.logger('sound_feedback', WARNING)("Sound feedback error: no device")
+        events.logger('debug_screenshot', INFO)("Debug screenshot saved")
+
+        callback.assert_called_once_with("Sound feedback error: no device")
+
+    def test_parse_level(self):
+        """Test level names and numbers"""
+        self.assertEqual(parse_level('debug'), DEBUG)
+        self.assertEqual(parse_level('WARNING'), WARNING)
+        self.assertEqual(parse_level(ERROR), ERROR)
+        with self.assertRaises(ValueError):
+            parse_level('verbose')
+
+
+if __name__ == '__main__':
+    unittest.main()
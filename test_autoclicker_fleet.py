@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the AutoClicker fleet supervisor
+"""
+
+import unittest
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+# Add the current directory to the path so we can import autoclicker_fleet
+sys.path.insert(0, os.path.dirname(__file__))
+
+from autoclicker_fleet import compile_fleet, FleetSupervisor, RemoteOcr, ocr_server, CONFIG_ERROR
+
+
+class FakeEngine:
+    """OCR engine that 'reads' the image it is given"""
+    name = 'fake'
+
+    def __init__(self, backend):
+        pass
+
+    def image_to_data(self, image, profile):
+        if image == 'unreadable':
+            raise ValueError("cannot read")
+        return {'text': [f'{image} read by {os.getpid()}']}
+
+    def close(self):
+        pass
+
+
+def fake_ocr_server(backend, requests, responses):
+    ocr_server(backend, requests, responses, create=FakeEngine)
+
+
+def fake_worker(spec, ocr_requests, ocr_responses, stats, stop, log_level):
+    """Worker that crashes on its first start when asked to, then OCRs through the pool and reports stats"""
+    marker = os.path.join(spec.cwd, spec.name)
+    if spec.mode == 'mixed':
+        sys.exit(CONFIG_ERROR)
+    if spec.name == 'crashy' and not os.path.exists(marker):
+        open(marker, 'w').close()
+        os._exit(1)
+    text = RemoteOcr(ocr_requests, ocr_responses, spec.display).image_to_data(spec.display)['text'][0]
+    stats.put((spec.display, os.getpid(), {'cycles': 5, 'captures': 4, 'clicks': 1, 'successful_clicks': 1,
+                                           'match_latency': {text: 0.01}}))
+    stop.wait()
+
+
+class TestFleet(unittest.TestCase):
+    """Test cases for fleet definitions, the shared OCR pool and worker supervision"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_compile_fleet(self):
+        """Test fleet definitions are validated and relative paths are taken from the fleet file"""
+        fleet = compile_fleet({'ocr_workers': 3, 'workers': [
+            {'display': ':1', 'mode': 'text', 'targets': 'OK', 'options': {'interval': 0.5}},
+            {'display': 'host:2.0', 'mode': 'workflow', 'targets': ['export.json'], 'name': 'exporter'}]},
+            base_dir='/fleets')
+        self.assertEqual((fleet.ocr_workers, fleet.ocr_backend), (3, 'pytesseract'))
+        self.assertEqual([(w.display, w.name, w.targets, w.cwd) for w in fleet.workers],
+                         [(':1', ':1', ['OK'], '/fleets'), ('host:2.0', 'exporter', ['export.json'], '/fleets')])
+
+        worker = {'display': ':1', 'mode': 'text', 'targets': ['OK']}
+        for definition in ({'workers': []},
+                           {'workers': [worker], 'ocr_workers': -1},
+                           {'workers': [dict(worker, display='1')]},
+                           {'workers': [worker, worker]},
+                           {'workers': [dict(worker, mode='draw')]},
+                           {'workers': [dict(worker, options={'dpi': 2})]},
+                           {'workers': [worker], 'hosts': []}):
+            with self.assertRaises(ValueError, msg=definition):
+                compile_fleet(definition)
+
+    def test_ocr_pool_answers_the_asking_worker(self):
+        """Test pool answers reach the worker that asked, stale ones are dropped and errors are raised"""
+        requests = queue.Queue()
+        responses = {':1': queue.Queue(), ':2': queue.Queue()}
+        server = threading.Thread(target=ocr_server, args=('fake', requests, responses, FakeEngine))
+        server.start()
+        try:
+            responses[':1'].put(((0, 99), True, {'text': ['left over from a crashed worker']}))
+            first = RemoteOcr(requests, responses[':1'], ':1')
+            second = RemoteOcr(requests, responses[':2'], ':2')
+            self.assertTrue(first.image_to_data('one')['text'][0].startswith('one read by'))
+            self.assertTrue(second.image_to_data('two')['text'][0].startswith('two read by'))
+            with self.assertRaises(RuntimeError):
+                first.image_to_data('unreadable')
+        finally:
+            requests.put(None)
+            server.join()
+
+    def test_supervisor_restarts_crashed_workers_and_aggregates_stats(self):
+        """Test a crashed worker is restarted, a misconfigured one is not, and stats add up across processes"""
+        fleet = compile_fleet({'ocr_workers': 1, 'stats_interval': 1, 'workers': [
+            {'display': ':1', 'mode': 'text', 'targets': ['OK'], 'name': 'steady'},
+            {'display': ':2', 'mode': 'text', 'targets': ['OK'], 'name': 'crashy'},
+            {'display': ':3', 'mode': 'mixed', 'targets': ['OK'], 'name': 'broken'}]}, base_dir=self.directory)
+        supervisor = FleetSupervisor(fleet, worker_target=fake_worker, ocr_target=fake_ocr_server, restart_delay=0)
+        supervisor.start()
+        try:
+            deadline = time.monotonic() + 60
+            while time.monotonic() < deadline:
+                supervisor.check()
+                stats = supervisor.stats()
+                if stats['cycles'] == 10 and stats['displays'][':3']['state'] == 'failed':
+                    break
+                time.sleep(0.05)
+        finally:
+            supervisor.close()
+
+        stats = supervisor.stats()
+        self.assertEqual((stats['cycles'], stats['clicks'], stats['restarts']), (10, 2, 1))
+        self.assertEqual({display: (worker['state'], worker['restarts']) for display, worker in stats['displays'].items()},
+                         {':1': ('finished', 0), ':2': ('finished', 1), ':3': ('failed', 0)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker GUI helpers that run without a display
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from unittest.mock import Mock, patch
+
+# Add the current directory to the path so we can import autoclicker_gui
+sys.path.insert(0, os.path.dirname(__file__))
+
+import autoclicker_gui
+
+# who output with two local X sessions, an SSH login and a text console
+WHO_OUTPUT = """alice    :0           2024-05-01 09:12 (:0)
+bob      pts/1        2024-05-01 10:03 (192.168.1.20)
+carol    pts/2        2024-05-01 11:40 (:1)
+dave     tty2         2024-05-01 08:00
+"""
+
+
+class TestDisplayDetection(unittest.TestCase):
+    """Test cases for finding a working X display"""
+
+    def test_probe_displays_prefers_candidate_order(self):
+        """Test a slower working display ranked first wins over a faster one ranked later"""
+        probed = []
+
+        def probe(display):
+            probed.append(display)
+            if display == ':1':
+                time.sleep(0.05)
+            return display != ':0'
+
+        with patch.object(autoclicker_gui, 'probe_display', side_effect=probe):
+            self.assertEqual(autoclicker_gui.probe_displays([':0', ':1', ':0', ':2'], timeout=2), ':1')
+        self.assertEqual(sorted(probed), [':0', ':1', ':2'])  # Duplicates are probed once
+
+    def test_probe_displays_gives_up_on_hung_probes(self):
+        """Test a probe that never returns cannot block startup past the timeout"""
+        hung = threading.Event()
+        with patch.object(autoclicker_gui, 'probe_display', side_effect=lambda display: hung.wait(5)):
+            started = time.monotonic()
+            self.assertIsNone(autoclicker_gui.probe_displays([':0', ':1'], timeout=0.1))
+            self.assertLess(time.monotonic() - started, 1)
+        hung.set()
+
+    def test_who_displays_parses_local_sessions(self):
+        """Test displays are taken from the line or host column of who output"""
+        self.assertEqual(autoclicker_gui.parse_who_displays(WHO_OUTPUT), [':0', ':1'])
+        self.assertEqual(autoclicker_gui.parse_who_displays("user :0 (192.168.1.1)\n"), [':0'])
+
+        with patch('subprocess.run', return_value=Mock(returncode=0, stdout=WHO_OUTPUT)):
+            self.assertEqual(autoclicker_gui.who_displays(), [':0', ':1'])
+        with patch('subprocess.run', side_effect=FileNotFoundError):
+            self.assertEqual(autoclicker_gui.who_displays(), [])
+
+    def test_local_x_displays_from_sockets(self):
+        """Test X server sockets map to display names"""
+        with patch('os.listdir', return_value=['X1', '.lock', 'X0', 'Xfoo', 'X10']):
+            self.assertEqual(autoclicker_gui.local_x_displays(), [':0', ':1', ':10'])
+        with patch('os.listdir', side_effect=FileNotFoundError):
+            self.assertEqual(autoclicker_gui.local_x_displays(), [])
+
+    def test_cached_display_round_trip(self):
+        """Test the last working display is saved and read back"""
+        with tempfile.TemporaryDirectory() as temp_dir, \
+             patch.object(autoclicker_gui, 'DISPLAY_CACHE_FILE', os.path.join(temp_dir, 'cache', 'last_display')):
+            self.assertIsNone(autoclicker_gui.load_cached_display())
+            autoclicker_gui.save_cached_display(':3')
+            self.assertEqual(autoclicker_gui.load_cached_display(), ':3')
+
+    def test_detect_display_tries_current_then_cached(self):
+        """Test candidates are ranked current, cached, well-known, local, and the winner is remembered"""
+        with patch.dict(os.environ, {'DISPLAY': ':5'}), \
+             patch.object(autoclicker_gui, 'load_cached_display', return_value=':3'), \
+             patch.object(autoclicker_gui, 'local_x_displays', return_value=[':7']), \
+             patch.object(autoclicker_gui, 'probe_displays', return_value=':3') as mock_probe, \
+             patch.object(autoclicker_gui, 'save_cached_display') as mock_save, \
+             patch('builtins.print'):
+            self.assertTrue(autoclicker_gui.detect_display())
+            self.assertEqual(os.environ['DISPLAY'], ':3')
+
+        candidates = mock_probe.call_args.args[0]
+        self.assertEqual(candidates[:3], [':5', ':3', ':0'])
+        self.assertEqual(candidates[-1], ':7')
+        mock_save.assert_not_called()  # Already cached
+
+
+class FakeText:
+    """Stands in for a Tk Text widget: the calls the log makes, applied to a plain string"""
+
+    def __init__(self):
+        self.text = ''  # Content before Tk's implicit final newline
+        self.marks = {}
+
+    def offset(self, index):
+        if index in ('end', 'end-1c'):
+            return len(self.text)
+        if index in self.marks:
+            return self.marks[index]
+        line, column = map(int, index.split('.'))
+        return sum(len(text) + 1 for text in self.text.split('\n')[:line - 1]) + column
+
+    def index(self, index):
+        before = self.text[:self.offset(index)]
+        return f"{before.count(chr(10)) + 1}.{len(before) - before.rfind(chr(10)) - 1}"
+
+    def insert(self, index, chars):
+        offset = self.offset(index)
+        self.text = self.text[:offset] + chars + self.text[offset:]
+        for name, mark in self.marks.items():  # Left gravity: a mark at the insert point stays put
+            if mark > offset:
+                self.marks[name] = mark + len(chars)
+
+    def delete(self, start, end):
+        first, last = self.offset(start), self.offset(end)
+        self.text = self.text[:first] + self.text[last:]
+        for name, mark in self.marks.items():
+            if mark > first:
+                self.marks[name] = max(first, mark - (last - first))
+
+    def mark_set(self, name, index):
+        self.marks[name] = self.offset(index)
+
+    def mark_gravity(self, name, gravity):
+        pass
+
+    def see(self, index):
+        pass
+
+    def config(self, **options):
+        pass
+
+    def messages(self):
+        """Shown lines without their timestamps"""
+        return [line.split('] ', 1)[1] for line in self.text.splitlines()]
+
+
+class TestLogBatching(unittest.TestCase):
+    """Test cases for the batched, deduplicated log widget updates"""
+
+    def setUp(self):
+        self.gui = autoclicker_gui.AutoClickerGUI.__new__(autoclicker_gui.AutoClickerGUI)
+        self.gui.root = Mock()
+        self.gui.log_text = FakeText()
+        self.gui.log_queue = deque(maxlen=autoclicker_gui.AutoClickerGUI.LOG_MAX_LINES)
+        self.gui.last_log_message = None
+        self.gui.last_log_count = 0
+
+    def log_batch(self, *messages):
+        self.gui._log_batch([(1700000000.0, message) for message in messages])
+
+    def test_repeats_collapse_within_and_across_batches(self):
+        """Test consecutive duplicates become one line with a count, updated by later batches"""
+        self.log_batch('No targets', 'No targets', 'Clicked')
+        self.assertEqual(self.gui.log_text.messages(), ['No targets (x2)', 'Clicked'])
+
+        self.log_batch('Clicked', 'Clicked', 'No targets')
+        self.assertEqual(self.gui.log_text.messages(), ['No targets (x2)', 'Clicked (x3)', 'No targets'])
+
+        self.log_batch('No targets')
+        self.assertEqual(self.gui.log_text.messages(), ['No targets (x2)', 'Clicked (x3)', 'No targets (x2)'])
+
+    def test_widget_trimmed_to_line_cap(self):
+        """Test the oldest lines are dropped beyond the cap and the last line can still be rewritten"""
+        self.gui.LOG_MAX_LINES = 5
+        self.log_batch(*[f"Cycle {i}" for i in range(4)])
+        self.log_batch(*[f"Cycle {i}" for i in range(4, 8)])
+        self.assertEqual(self.gui.log_text.messages(), [f"Cycle {i}" for i in range(3, 8)])
+
+        self.log_batch('Cycle 7')
+        self.assertEqual(self.gui.log_text.messages(), ['Cycle 3', 'Cycle 4', 'Cycle 5', 'Cycle 6', 'Cycle 7 (x2)'])
+
+    def test_flush_drains_queue_and_reschedules(self):
+        """Test a flush writes every queued message in one batch and always schedules the next flush"""
+        for message in ('Started', 'Waiting', 'Waiting'):
+            self.gui.log(message)
+
+        self.gui.flush_log()
+        self.gui.flush_log()  # Nothing queued
+
+        self.assertEqual(self.gui.log_text.messages(), ['Started', 'Waiting (x2)'])
+        self.assertEqual(len(self.gui.log_queue), 0)
+        self.assertEqual(self.gui.root.after.call_count, 2)
+        self.gui.root.after.assert_called_with(self.gui.LOG_FLUSH_INTERVAL, self.gui.flush_log)
+
+
+if __name__ == '__main__':
+    unittest.main()
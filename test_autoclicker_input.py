@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker input hooks
+"""
+
+import unittest
+import os
+import queue
+import sys
+import threading
+
+# Add the current directory to the path so we can import autoclicker_input
+sys.path.insert(0, os.path.dirname(__file__))
+
+from autoclicker_input import InputHooks
+
+
+class FakeListener(threading.Thread):
+    """Stands in for pynput's listener: a real thread delivering pressed keys until stopped"""
+    started = 0
+
+    def __init__(self, on_press):
+        super().__init__(daemon=True)
+        self.on_press = on_press
+        self.keys = queue.Queue()
+        FakeListener.started += 1
+
+    def run(self):
+        for key, handled in iter(self.keys.get, None):
+            self.on_press(key)
+            handled.set()
+
+    def press(self, key):
+        """Deliver a key on the listener thread and wait until it is handled"""
+        handled = threading.Event()
+        self.keys.put((key, handled))
+        handled.wait(2)
+
+    def stop(self):
+        self.keys.put(None)
+
+
+class TestInputHooks(unittest.TestCase):
+    """Test cases for the process-wide keyboard listener service"""
+
+    def setUp(self):
+        FakeListener.started = 0
+        self.errors = []
+        self.hooks = InputHooks(FakeListener, logger=self.errors.append)
+
+    def test_keys_fan_out_to_subscribers(self):
+        """Test one listener serves every subscriber and a failing subscriber does not block the others"""
+        first, second = [], []
+
+        def failing(key):
+            raise RuntimeError("broken hotkey handler")
+
+        tokens = [self.hooks.subscribe(first.append), self.hooks.subscribe(failing),
+                  self.hooks.subscribe(second.append)]
+        listener = self.hooks.listener
+        listener.press('f7')
+        self.hooks.unsubscribe(tokens[0])
+        listener.press('f8')
+
+        self.assertEqual((first, second), (['f7'], ['f7', 'f8']))
+        self.assertEqual(len(self.errors), 2)
+        self.assertEqual(FakeListener.started, 1)
+        self.assertTrue(listener.is_alive())
+
+        self.hooks.unsubscribe(tokens[1])
+        self.hooks.unsubscribe(tokens[2])
+        self.hooks.unsubscribe(tokens[2])  # Ending a subscription twice is harmless
+        self.assertIsNone(self.hooks.listener)
+        self.assertFalse(listener.is_alive())
+
+    def test_unsubscribe_from_callback(self):
+        """Test a subscriber can end its subscription while handling a key"""
+        tokens = []
+        tokens.append(self.hooks.subscribe(lambda key: self.hooks.unsubscribe(tokens[0])))
+        listener = self.hooks.listener
+        listener.press('f7')
+        listener.join(2)
+
+        self.assertFalse(listener.is_alive())
+        self.assertIsNone(self.hooks.listener)
+
+    def test_start_stop_cycles_do_not_grow_threads(self):
+        """Test 1,000 subscribe/unsubscribe cycles leave no listener threads behind"""
+        before = threading.active_count()
+        for _ in range(1000):
+            token = self.hooks.subscribe(lambda key: None)
+            self.hooks.unsubscribe(token)
+
+        self.assertEqual(threading.active_count(), before)
+        self.assertEqual(FakeListener.started, 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker macro recording
+"""
+
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add the current directory to the path so we can import autoclicker_macro
+sys.path.insert(0, os.path.dirname(__file__))
+
+from autoclicker_macro import MacroRecorder, build_steps, key_name, simplify_path
+from autoclicker_patterns import compile_pattern
+
+MS = 1_000_000
+
+class TestMacroRecording(unittest.TestCase):
+    """Test cases for turning recorded input into click patterns"""
+
+    def test_simplify_path_keeps_corners(self):
+        """Test points on a straight line are dropped while corners and ends are kept"""
+        path = [(i * MS, i * 10, 0) for i in range(11)] + [(11 * MS + i * MS, 100, i * 10) for i in range(1, 11)]
+        path[3] = (3 * MS, 30, 2)  # Jitter within the tolerance
+
+        self.assertEqual(simplify_path(path, 3.0), [(0, 0, 0), (10 * MS, 100, 0), (21 * MS, 100, 100)])
+        self.assertIn((3 * MS, 30, 2), simplify_path(path, 1.0))  # The jitter is kept at a tighter tolerance
+
+    def test_clicks_drags_and_moves(self):
+        """Test clicks in place, drags and simplified moves become pattern steps"""
+        events = [(i * 10 * MS, 'move', 10 + i * 10, 50) for i in range(10)]
+        events += [(100 * MS, 'press', 100, 50, 'left'), (101 * MS, 'move', 101, 51),
+                   (150 * MS, 'release', 101, 51, 'left'),
+                   (300 * MS, 'press', 200, 50, 'right'), (320 * MS, 'release', 200, 50, 'right'),
+                   (500 * MS, 'press', 10, 10, 'left'), (510 * MS, 'move', 60, 60), (520 * MS, 'move', 110, 110),
+                   (530 * MS, 'move', 150, 110), (540 * MS, 'release', 150, 110, 'left')]
+
+        steps = build_steps(events, duration_ns=1000 * MS)
+
+        self.assertEqual(steps, [
+            {'at': 0.0, 'move': [10, 50]},
+            {'at': 0.1, 'click': [100, 50]},
+            {'at': 0.3, 'click': [200, 50], 'button': 'right'},
+            {'at': 0.5, 'down': [10, 10]},
+            {'at': 0.52, 'move': [110, 110]},
+            {'at': 0.54, 'up': [150, 110], 'wait': 0.46}
+        ])
+        self.assertEqual(compile_pattern(steps).duration, 1.0)
+
+    def test_keys_hotkeys_and_typing(self):
+        """Test typed characters are joined and modifier combinations become hotkeys"""
+        events = [(0, 'key_down', 'shift'), (1 * MS, 'key_down', 'H'), (2 * MS, 'key_up', 'H'), (3 * MS, 'key_up', 'shift'),
+                  (4 * MS, 'key_down', 'i'), (5 * MS, 'key_up', 'i'),
+                  (10 * MS, 'key_down', 'enter'), (11 * MS, 'key_up', 'enter'),
+                  (20 * MS, 'key_down', 'ctrl'), (21 * MS, 'key_down', 's'), (22 * MS, 'key_down', 's'),
+                  (23 * MS, 'key_up', 's'), (24 * MS, 'key_up', 'ctrl'),
+                  (30 * MS, 'key_down', 'win'), (31 * MS, 'key_up', 'win')]
+
+        self.assertEqual(build_steps(events), [
+            {'at': 0.001, 'type': 'Hi'},
+            {'at': 0.01, 'key': 'enter'},
+            {'at': 0.021, 'hotkey': ['ctrl', 's']},
+            {'at': 0.022, 'hotkey': ['ctrl', 's']},  # Auto-repeat
+            {'at': 0.031, 'key': 'win'}
+        ])
+
+    def test_key_names_follow_pyautogui(self):
+        """Test pynput key names are translated to the names PyAutoGUI presses"""
+        for pynput_name, name in [('ctrl_l', 'ctrl'), ('cmd', 'win'), ('page_up', 'pageup'), ('caps_lock', 'capslock'),
+                                  ('media_volume_up', 'volumeup'), ('\x13', 's'), ('a', 'a')]:
+            self.assertEqual(key_name(pynput_name), name)
+
+    def test_recorder_coalesces_moves_and_stops_on_key(self):
+        """Test bursts of mouse moves keep only their last position and the stop key ends the recording"""
+        recorder = MacroRecorder(stop_key='f9', coalesce_ms=10)
+        recorder.origin = 0
+        clock = iter([1 * MS, 4 * MS, 8 * MS, 12 * MS, 13 * MS, 20 * MS, 30 * MS])
+        with patch('time.perf_counter_ns', side_effect=lambda: next(clock)):
+            for x in (1, 2, 3, 4):
+                recorder.on_move(x, 0)
+            recorder.on_press(SimpleNamespace(char='a'))
+            recorder.on_release(SimpleNamespace(char='a'))
+            recorder.on_press(SimpleNamespace(name='f9'))
+
+        self.assertEqual(recorder.events, [(8 * MS, 'move', 3, 0), (12 * MS, 'move', 4, 0),
+                                           (13 * MS, 'key_down', 'a'), (20 * MS, 'key_up', 'a')])
+        self.assertTrue(recorder.wait(0))
+        self.assertEqual(recorder.to_pattern('demo')['steps'], [{'at': 0.008, 'move': [3, 0]}, {'at': 0.012, 'move': [4, 0]},
+                                                                {'at': 0.013, 'type': 'a', 'wait': 0.017}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker OCR backends
+"""
+
+import unittest
+import os
+import sys
+import threading
+from unittest.mock import patch
+import numpy as np
+
+# Add the current directory to the path so we can import autoclicker_ocr
+sys.path.insert(0, os.path.dirname(__file__))
+
+from autoclicker_ocr import (parse_tsv, image_bytes, create_backend, EnginePool, PytesseractBackend,
+                             CapiBackend, propose_text_regions, RegionMosaic, TileOcrCache, merge_seam_words,
+                             parse_profile, DEFAULT_PROFILE)
+import cv2
+
+TSV = ("level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+       "1\t1\t0\t0\t0\t0\t0\t0\t800\t200\t-1\t\n"
+       "5\t1\t1\t1\t1\t1\t20\t90\t40\t25\t95.5\tOK\n")
+
+class TestOcrBackends(unittest.TestCase):
+    """Test cases for OCR backend selection and output parsing"""
+
+    def test_parse_tsv_matches_pytesseract_layout(self):
+        """Test TSV rows become pytesseract-style column lists"""
+        data = parse_tsv(TSV)
+
+        self.assertEqual(data['text'], ['', 'OK'])
+        self.assertEqual(data['left'], [0, 20])
+        self.assertEqual(data['conf'], [-1.0, 95.5])
+        self.assertEqual(data['word_num'], [0, 1])
+
+    def test_parse_tsv_without_header(self):
+        """Test C API output, which has no header row, parses the same"""
+        self.assertEqual(parse_tsv(TSV.split('\n', 1)[1]), parse_tsv(TSV))
+
+    def test_image_bytes_layout(self):
+        """Test grayscale and BGR images are passed with the right strides"""
+        _, width, height, bpp, bpl = image_bytes(np.zeros((10, 30), dtype=np.uint8))
+        self.assertEqual((width, height, bpp, bpl), (30, 10, 1, 30))
+
+        bgr = np.zeros((10, 30, 3), dtype=np.uint8)
+        bgr[..., 0] = 255  # Blue
+        buffer, width, height, bpp, bpl = image_bytes(bgr)
+        self.assertEqual((bpp, bpl), (3, 90))
+        self.assertEqual(tuple(buffer[0, 0]), (0, 0, 255))  # Converted to RGB
+
+    @patch('pytesseract.image_to_data')
+    def test_pytesseract_backend(self, mock_image_to_data):
+        """Test the default backend delegates to pytesseract"""
+        mock_image_to_data.return_value = {'text': ['OK']}
+        backend = create_backend('pytesseract')
+
+        self.assertIsInstance(backend, PytesseractBackend)
+        self.assertEqual(backend.image_to_data(np.zeros((5, 5), dtype=np.uint8)), {'text': ['OK']})
+        self.assertEqual(mock_image_to_data.call_args[1]['lang'], 'eng')
+
+    def test_unknown_backend(self):
+        """Test backend names are validated"""
+        with self.assertRaises(ValueError):
+            create_backend('easyocr')
+
+    def test_capi_requires_library(self):
+        """Test the C API backend reports a missing libtesseract"""
+        with patch('autoclicker_ocr.ctypes.util.find_library', return_value=None):
+            with self.assertRaises(RuntimeError):
+                CapiBackend()
+
+    def test_auto_falls_back_to_pytesseract(self):
+        """Test auto selection when no persistent engine is installed"""
+        with patch.dict(sys.modules, {'tesserocr': None}), \
+             patch('autoclicker_ocr.ctypes.util.find_library', return_value=None):
+            self.assertIsInstance(create_backend('auto'), PytesseractBackend)
+
+    def test_parse_profile(self):
+        """Test profiles compile to a Tesseract config once per distinct text"""
+        profile = parse_profile("psm=7 whitelist=0123456789 lang=deu scale=2 preprocess=original,threshold")
+
+        self.assertEqual(profile.config, "--psm 7 -c tessedit_char_whitelist=0123456789")
+        self.assertEqual((profile.language, profile.scale, profile.preprocess), ('deu', 2.0, ('original', 'threshold')))
+        self.assertIs(parse_profile("psm=7 whitelist=0123456789 lang=deu scale=2 preprocess=original,threshold"), profile)
+        self.assertIs(parse_profile(""), DEFAULT_PROFILE)
+        self.assertEqual(DEFAULT_PROFILE.config, "")
+
+    def test_invalid_profiles(self):
+        """Test unknown options and out-of-range values are rejected"""
+        for text in ("psm=20", "psm=seven", "color=red", "scale=0", "preprocess=sharpen", "lang=../eng", "psm"):
+            with self.assertRaises(ValueError, msg=text):
+                parse_profile(text)
+
+    @patch('pytesseract.image_to_data')
+    def test_pytesseract_backend_applies_profile(self, mock_image_to_data):
+        """Test profile settings reach the tesseract command line"""
+        create_backend('pytesseract').image_to_data(np.zeros((5, 5), dtype=np.uint8), parse_profile("psm=8 lang=fra"))
+
+        self.assertEqual(mock_image_to_data.call_args[1]['config'], "--psm 8")
+        self.assertEqual(mock_image_to_data.call_args[1]['lang'], 'fra')
+
+    def test_engine_pool_gives_each_caller_its_own_handle(self):
+        """Test pooled handles are never used by two threads at once"""
+        destroyed = []
+        pool = EnginePool(lambda: {'busy': False}, destroyed.append, 2)
+        errors = []
+
+        def use(handle):
+            if handle['busy']:
+                errors.append("handle shared")
+            handle['busy'] = True
+            threading.Event().wait(0.001)
+            handle['busy'] = False
+
+        threads = [threading.Thread(target=lambda: [pool.run(use) for _ in range(20)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        pool.close()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(destroyed), 2)
+
+
+class TestTextRegions(unittest.TestCase):
+    """Test cases for text region proposals and the OCR mosaic"""
+
+    def setUp(self):
+        """Draw a screen with two labels, a panel border and a photo-like block"""
+        rng = np.random.default_rng(3)
+        self.screen = np.full((600, 900, 3), 240, dtype=np.uint8)
+        cv2.rectangle(self.screen, (50, 50), (850, 550), (90, 90, 90), 2)
+        self.labels = []  # Word boxes as drawn
+        for word, (x, y), scale, thickness in [("Submit", (100, 120), 0.8, 2), ("Cancel", (600, 400), 0.6, 1)]:
+            cv2.putText(self.screen, word, (x, y), cv2.FONT_HERSHEY_SIMPLEX, scale, (0, 0, 0), thickness)
+            (w, h), baseline = cv2.getTextSize(word, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+            self.labels.append((x, y - h, w, h + baseline))
+        self.screen[200:350, 300:500] = rng.integers(0, 256, (150, 200, 3), dtype=np.uint8)
+
+    def test_proposals_cover_text_only(self):
+        """Test labels are proposed while borders and the noise block are not"""
+        proposals = propose_text_regions(self.screen)
+
+        for lx, ly, lw, lh in self.labels:
+            self.assertTrue(any(px <= lx and py <= ly and lx + lw <= px + pw and ly + lh <= py + ph
+                                for px, py, pw, ph in proposals), (lx, ly))
+        proposed = sum(w * h for _, _, w, h in proposals)
+        self.assertLess(proposed, 0.05 * self.screen.shape[0] * self.screen.shape[1])
+
+    def test_blank_screen_has_no_proposals(self):
+        """Test flat screens produce nothing to OCR"""
+        self.assertEqual(propose_text_regions(np.full((200, 300), 128, dtype=np.uint8)), [])
+
+    def test_mosaic_maps_words_back_to_screen(self):
+        """Test crops are packed together and word boxes map back to their screen position"""
+        mosaic = RegionMosaic(self.screen, self.labels)
+        (mx, my, bx, by, w, h) = mosaic.placements[0]
+
+        np.testing.assert_array_equal(mosaic.image[my:my + h, mx:mx + w], self.screen[by:by + h, bx:bx + w])
+        self.assertLess(mosaic.pixels, self.screen.shape[0] * self.screen.shape[1] // 10)
+
+        data = {'text': ['Word', 'Gap'], 'left': [mx + 2, 0], 'top': [my + 3, 0], 'width': [10, 2],
+                'height': [8, 2], 'conf': [90.0, 10.0]}
+        mapped = mosaic.to_screen(data)
+
+        self.assertEqual(mapped['text'], ['Word'])  # The row in the blank spacing is dropped
+        self.assertEqual((mapped['left'][0], mapped['top'][0]), (bx + 2, by + 3))
+
+
+class BlobOcr:
+    """Stand-in OCR engine reporting each dark blob as the word 'bar'"""
+    def __init__(self):
+        self.images = []
+
+    def image_to_data(self, image, profile=None):
+        self.images.append(image)
+        count, _, stats, _ = cv2.connectedComponentsWithStats((image < 128).astype(np.uint8))
+        data = {'text': [], 'left': [], 'top': [], 'width': [], 'height': [], 'conf': []}
+        for x, y, w, h, _ in stats[1:count]:
+            for key, value in zip(('text', 'left', 'top', 'width', 'height', 'conf'), ('bar', x, y, w, h, 90.0)):
+                data[key].append(value)
+        return data
+
+
+class TestTileCache(unittest.TestCase):
+    """Test cases for the incremental tile OCR cache"""
+
+    def setUp(self):
+        """Draw bars in different tiles, one of them across the seam at x=480"""
+        self.screen = np.full((300, 1000), 255, dtype=np.uint8)
+        self.bars = [(40, 20, 60, 20), (440, 60, 100, 20), (700, 200, 50, 20)]
+        for x, y, w, h in self.bars:
+            self.screen[y:y + h, x:x + w] = 0
+
+    def boxes(self, data):
+        return sorted(zip(data['left'], data['top'], data['width'], data['height']))
+
+    def test_unchanged_tiles_are_reused(self):
+        """Test only tiles whose pixels changed are OCR'd again"""
+        cache = TileOcrCache()
+        ocr = BlobOcr()
+
+        first = cache.image_to_data(ocr, self.screen)
+        self.assertEqual(self.boxes(first), self.bars)  # The bar across the seam comes back whole
+        self.assertEqual(first['text'], ['bar'] * 3)
+        self.assertEqual(cache.hit_rate, 0.0)
+
+        self.assertEqual(cache.image_to_data(ocr, self.screen), first)
+        self.assertEqual(len(ocr.images), 1)
+        self.assertEqual(cache.hit_rate, 50.0)
+
+        changed = self.screen.copy()
+        changed[20:40, 600:650] = 0
+        data = cache.image_to_data(ocr, changed)
+        self.assertEqual(self.boxes(data), sorted(self.bars + [(600, 20, 50, 20)]))
+        self.assertEqual((cache.hits, cache.misses), (17, 10))  # Only the changed tile was sent
+        self.assertLess(ocr.images[-1].size, self.screen.size // 3)
+        self.assertEqual(cache.pixels_saved, 2 * self.screen.size - 480 * 128)
+
+    def test_cache_is_bounded(self):
+        """Test the least recently used tiles are evicted"""
+        cache = TileOcrCache(max_entries=2)
+        cache.image_to_data(BlobOcr(), self.screen)
+        self.assertEqual(len(cache.entries), 2)
+
+    def test_seam_fragments_are_joined(self):
+        """Test fragments overlapping across a seam join while separate words do not"""
+        words = [(400, 10, 96, 20, 90.0, 'Subm'), (464, 12, 60, 20, 80.0, 'bmit'),
+                 (400, 60, 70, 20, 90.0, 'Save'), (482, 60, 30, 20, 90.0, 'As')]
+
+        merged = merge_seam_words(words, 480, 16)
+
+        self.assertEqual(merged, [(400, 10, 124, 22, 80.0, 'Submit'), (400, 60, 70, 20, 90.0, 'Save'),
+                                  (482, 60, 30, 20, 90.0, 'As')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker click pattern compiling
+"""
+
+import unittest
+import tempfile
+import json
+import os
+import sys
+
+# Add the current directory to the path so we can import autoclicker_patterns
+sys.path.insert(0, os.path.dirname(__file__))
+
+from autoclicker_patterns import Action, compile_pattern, parse_pattern, save_pattern_file
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+LOGIN = {
+    'name': 'Login Sequence',
+    'steps': [
+        {'click': [500, 300]},
+        {'type': 'myusername', 'wait': 0.25},
+        {'key': 'tab'},
+        {'hotkey': ['ctrl', 'v'], 'wait': 1.0},
+        {'at': 2.0, 'key': 'enter', 'wait': 0.5}
+    ]
+}
+
+class TestPatterns(unittest.TestCase):
+    """Test cases for pattern validation and compilation"""
+
+    def test_compile_flat_actions_with_offsets(self):
+        """Test steps become actions at absolute offsets"""
+        compiled = compile_pattern(LOGIN)
+
+        self.assertEqual(compiled.name, 'Login Sequence')
+        self.assertEqual(compiled.actions, [
+            Action(0.0, 'click', (500, 300)),
+            Action(0.0, 'type', 'myusername'),
+            Action(0.25, 'key', 'tab'),
+            Action(0.25, 'hotkey', ('ctrl', 'v')),
+            Action(2.0, 'key', 'enter')
+        ])
+        self.assertEqual(compiled.duration, 2.5)
+
+    def test_compile_original_step_format(self):
+        """Test position/keyboard/delay steps compile the same way as before"""
+        compiled = compile_pattern([{'position': (100, 200)}, {'keyboard': 'enter'}, {'delay': 0.5},
+                                    {'keyboard': ['ctrl', 'c']}])
+
+        self.assertEqual([(a.offset, a.kind) for a in compiled.actions],
+                         [(0.0, 'click'), (0.0, 'key'), (0.5, 'hotkey')])
+        self.assertEqual(compiled.name, 'Unnamed')
+
+    def test_validation_errors_name_the_step(self):
+        """Test invalid patterns are rejected with the offending step"""
+        invalid = [
+            ([{'click': [10]}], "Step 1: position"),
+            ([{'key': 'a'}, {'wait': -1}], "Step 2: wait"),
+            ([{'wait': 2}, {'at': 1, 'key': 'a'}], "Step 2: at=1s is before"),
+            ([{'key': ['ctrl', 'c']}], "Step 1: key must be a single key"),
+            ([{'click': [1, 2], 'sleep': 1}], "Step 1: unknown field"),
+            ({'steps': [], 'loop': True}, "Unknown pattern field"),
+            ("steps", "Pattern must be")
+        ]
+        for pattern, message in invalid:
+            with self.assertRaisesRegex(ValueError, message):
+                compile_pattern(pattern)
+
+    def test_mouse_buttons_moves_and_drags(self):
+        """Test move, down/up and button fields compile into mouse actions"""
+        compiled = compile_pattern([{'move': [5, 5]}, {'at': 0.1, 'down': [10, 10]}, {'at': 0.2, 'up': [50, 10]},
+                                    {'click': [7, 7], 'button': 'right'}])
+
+        self.assertEqual(compiled.actions, [Action(0.0, 'move', (5, 5)), Action(0.1, 'down', (10, 10)),
+                                            Action(0.2, 'up', (50, 10)), Action(0.2, 'click', (7, 7), 'right')])
+        for step, message in [({'click': [1, 1], 'button': 'side'}, "button must be one of"),
+                              ({'key': 'a', 'button': 'right'}, "button needs"),
+                              ({'down': [1, 1], 'click': [1, 1]}, "only one of click")]:
+            with self.assertRaisesRegex(ValueError, message):
+                compile_pattern([step])
+
+    def test_time_scale(self):
+        """Test every offset and the duration are scaled"""
+        compiled = compile_pattern(LOGIN, time_scale=0.5)
+
+        self.assertEqual([action.offset for action in compiled.actions], [0.0, 0.0, 0.125, 0.125, 1.0])
+        self.assertEqual(compiled.duration, 1.25)
+        self.assertEqual(compile_pattern(compile_pattern(LOGIN), time_scale=2.0).duration_ns, 5 * 10**9)
+        with self.assertRaisesRegex(ValueError, "Time scale"):
+            compile_pattern(LOGIN, time_scale=0)
+
+    def test_anchor_relative_steps(self):
+        """Test anchored patterns hold offsets that resolve against the detected anchor"""
+        compiled = compile_pattern({'anchor': {'text': 'Save changes?'},
+                                    'steps': [{'click': [-80, 40], 'verify': {'image': 'no.png'}}, {'key': 'tab'},
+                                              {'at': 0.5, 'click': [80, 40]}]}, base_dir='/patterns')
+
+        self.assertEqual(compiled.anchor, ('text', 'Save changes?'))
+        self.assertEqual(compiled.actions[0], Action(0.0, 'click', (-80, 40), 'left', ('image', '/patterns/no.png')))
+        resolved = compiled.resolve((400, 300))
+        self.assertEqual([action.value for action in resolved.actions], [(320, 340), 'tab', (480, 340)])
+        self.assertIsNone(resolved.anchor)
+        with self.assertRaisesRegex(ValueError, "off screen"):
+            compiled.resolve((50, 300))
+
+        for pattern, message in [({'anchor': 'ok.png', 'steps': []}, "Pattern anchor must be"),
+                                 ([{'key': 'a', 'verify': {'text': 'OK'}}], "verify needs a mouse position"),
+                                 ([{'click': [1, 1], 'verify': {'sound': 'x'}}], "Step 1: verify must be"),
+                                 ([{'click': [-1, 1]}], "must not be negative")]:
+            with self.assertRaisesRegex(ValueError, message):
+                compile_pattern(pattern)
+
+    def test_parse_inline_definitions(self):
+        """Test JSON and Python-literal targets parse, and code is never executed"""
+        self.assertEqual(len(parse_pattern(json.dumps(LOGIN))), 5)
+        self.assertEqual(len(parse_pattern("{'name': 'Save', 'steps': [{'position': (5, 5)}, {'keyboard': ['ctrl', 's']}]}")), 2)
+        with self.assertRaisesRegex(ValueError, "Invalid pattern format"):
+            parse_pattern("__import__('os').system('true')")
+
+    def test_parse_pattern_files(self):
+        """Test patterns load from JSON and YAML files"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'login.json')
+            with open(path, 'w') as f:
+                json.dump(LOGIN, f)
+            self.assertEqual(parse_pattern(path).duration, 2.5)
+
+            if yaml is not None:
+                path = os.path.join(directory, 'login.yaml')
+                with open(path, 'w') as f:
+                    yaml.safe_dump(LOGIN, f)
+                self.assertEqual(parse_pattern(path).actions, compile_pattern(LOGIN).actions)
+
+    def test_save_pattern_file_round_trips(self):
+        """Test saved patterns load back to the same actions"""
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ['login.json'] + (['login.yaml'] if yaml is not None else []):
+                path = os.path.join(directory, name)
+                save_pattern_file(path, LOGIN)
+                self.assertEqual(parse_pattern(path).actions, compile_pattern(LOGIN).actions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker live detection preview
+"""
+
+import unittest
+import base64
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+import cv2
+
+# Add the current directory to the path so we can import autoclicker_preview
+sys.path.insert(0, os.path.dirname(__file__))
+
+from autoclicker_preview import DetectionPreview
+from autoclicker_slot import LatestSlot
+
+class TestDetectionPreview(unittest.TestCase):
+    """Test cases for LatestSlot and DetectionPreview"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.frame = np.zeros((600, 960, 3), dtype=np.uint8)
+
+    def test_slot_keeps_only_latest(self):
+        """Test a newer item replaces one that was never taken"""
+        slot = LatestSlot()
+        slot.put('first')
+        slot.put('second')
+
+        self.assertEqual(slot.take(), 'second')
+        self.assertIsNone(slot.take())
+        self.assertEqual(slot.replaced, 1)
+
+    def test_render_downscales_and_draws_boxes(self):
+        """Test frames are scaled to the preview width with boxes in scaled coordinates"""
+        preview = DetectionPreview(max_width=480)
+
+        image = preview.render(self.frame, [('image', (100, 100, 200, 100), 'button.png 0.91', True)])
+
+        self.assertEqual(image.shape[:2], (300, 480))
+        self.assertEqual(tuple(image[50, 75]), (0, 200, 0))  # Top-left corner of the scaled box
+        self.assertFalse(self.frame.any())  # Source frame is left untouched
+
+    def test_render_keeps_small_frames(self):
+        """Test frames narrower than the preview are not upscaled"""
+        preview = DetectionPreview(max_width=480)
+        small = np.zeros((40, 60), dtype=np.uint8)
+
+        image = preview.render(small, [('ocr', (5, 5, 10, 10), 'OK', False)])
+
+        self.assertEqual(image.shape, (40, 60, 3))
+
+    def test_worker_renders_latest_frame(self):
+        """Test the background worker publishes an encoded image for the GUI"""
+        preview = DetectionPreview(max_width=120, max_fps=50)
+        preview.start()
+        try:
+            preview.publish(self.frame, [])
+            deadline = time.monotonic() + 2
+            data = None
+            while data is None and time.monotonic() < deadline:
+                data = preview.latest()
+                time.sleep(0.01)
+        finally:
+            preview.close()
+
+        self.assertIsNotNone(data)
+        decoded = cv2.imdecode(np.frombuffer(base64.b64decode(data), dtype=np.uint8), cv2.IMREAD_COLOR)
+        self.assertEqual(decoded.shape[:2], (75, 120))
+        self.assertIsNone(preview.latest())
+
+    def test_publish_ignored_when_not_running(self):
+        """Test publishing before start does not queue frames"""
+        preview = DetectionPreview()
+        preview.publish(self.frame, [])
+        self.assertIsNone(preview.pending.take())
+
+    def test_invalid_settings(self):
+        """Test preview size and rate validation"""
+        with self.assertRaises(ValueError):
+            DetectionPreview(max_width=0)
+        with self.assertRaises(ValueError):
+            DetectionPreview(max_fps=0)
+
+    def test_import_defers_opencv(self):
+        """Test importing the preview, as the GUI does at startup, does not load OpenCV"""
+        result = subprocess.run([sys.executable, '-c', "import sys, autoclicker_preview; print('cv2' in sys.modules)"],
+                                capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.stdout.strip(), 'False', result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker frame recording and replay
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+from unittest.mock import patch
+import numpy as np
+
+# Add the current directory to the path so we can import autoclicker_recording
+sys.path.insert(0, os.path.dirname(__file__))
+
+from autoclicker_recording import FrameRecorder, FrameReplay, read_recording
+
+class TestFrameRecording(unittest.TestCase):
+    """Test cases for FrameRecorder and FrameReplay"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        fd, self.path = tempfile.mkstemp(suffix='.acrec')
+        os.close(fd)
+        self.frame_a = np.zeros((40, 60, 3), dtype=np.uint8)
+        self.frame_b = np.full((40, 60, 3), 200, dtype=np.uint8)
+        self.frame_b[10:20, 10:30] = (0, 0, 255)
+
+    def tearDown(self):
+        """Remove the recording file"""
+        os.unlink(self.path)
+
+    def test_round_trip_is_lossless(self):
+        """Test frames replay exactly as they were recorded"""
+        with FrameRecorder(self.path) as recorder:
+            recorder.record_frame(self.frame_a)
+            recorder.record_frame(self.frame_b)
+
+        replay = FrameReplay(self.path, realtime=False)
+
+        self.assertEqual(len(replay), 2)
+        np.testing.assert_array_equal(replay.next_frame(), self.frame_a)
+        np.testing.assert_array_equal(replay.next_frame(), self.frame_b)
+        self.assertIsNone(replay.next_frame())
+
+    def test_duplicate_frames_are_stored_once(self):
+        """Test deduplication of identical frames and cache repeats"""
+        with FrameRecorder(self.path) as recorder:
+            recorder.record_frame(self.frame_a)
+            recorder.record_repeat()
+            recorder.record_frame(self.frame_b)
+            recorder.record_frame(self.frame_a.copy())
+
+        self.assertEqual(recorder.frame_count, 4)
+        self.assertEqual(recorder.unique_frames, 2)
+
+        frames, payloads, detections = read_recording(self.path)
+        self.assertEqual([frame_id for _, frame_id in frames], [0, 0, 1, 0])
+        self.assertEqual(len(payloads), 2)
+        self.assertEqual(detections, [])
+
+    def test_detections_reference_latest_frame(self):
+        """Test detection results are stored against the frame they were found in"""
+        with FrameRecorder(self.path) as recorder:
+            recorder.record_frame(self.frame_a)
+            recorder.record_detection('image', 'button.png', None, score=0.4)
+            recorder.record_frame(self.frame_b)
+            recorder.record_detection('text', 'OK', (20, 15), method='original')
+
+        replay = FrameReplay(self.path, realtime=False)
+
+        self.assertEqual(len(replay.detections), 2)
+        self.assertIsNone(replay.detections[0]['position'])
+        self.assertEqual(replay.detections[0]['score'], 0.4)
+        self.assertEqual(replay.detections_for_frame(1)[0]['position'], [20, 15])
+        self.assertEqual(replay.detections_for_frame(1)[0]['method'], 'original')
+
+    def test_replay_loop(self):
+        """Test looping replay restarts from the first frame"""
+        with FrameRecorder(self.path) as recorder:
+            recorder.record_frame(self.frame_a)
+
+        replay = FrameReplay(self.path, realtime=False, loop=True)
+
+        for _ in range(3):
+            np.testing.assert_array_equal(replay.next_frame(), self.frame_a)
+
+    def test_realtime_replay_waits_for_recorded_offsets(self):
+        """Test recorded-speed replay sleeps until each frame's timestamp"""
+        with patch('autoclicker_recording.time.monotonic', side_effect=[0.0, 0.0, 0.5]):
+            with FrameRecorder(self.path) as recorder:
+                recorder.record_frame(self.frame_a)
+                recorder.record_frame(self.frame_b)
+
+        replay = FrameReplay(self.path, realtime=True)
+
+        with patch('autoclicker_recording.time.monotonic', side_effect=[10.0, 10.0, 10.1]), \
+             patch('autoclicker_recording.time.sleep') as mock_sleep:
+            replay.next_frame()
+            replay.next_frame()
+
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 0.4)
+
+    def test_invalid_file_rejected(self):
+        """Test reading a file that is not a recording"""
+        with open(self.path, 'wb') as f:
+            f.write(b'not a recording')
+
+        with self.assertRaises(ValueError):
+            FrameReplay(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker target scheduling
+"""
+
+import unittest
+import os
+import sys
+
+# Add the current directory to the path so we can import autoclicker_schedule
+sys.path.insert(0, os.path.dirname(__file__))
+
+from autoclicker_schedule import Scheduler, TargetSchedule, parse_schedule, DEFAULT_SCHEDULE
+
+class TestScheduler(unittest.TestCase):
+    """Test cases for schedule parsing and the per-cycle target scheduler"""
+
+    def test_parse_schedule(self):
+        """Test schedule options parse and are validated"""
+        self.assertEqual(parse_schedule("every=5 priority=2 budget=50"), TargetSchedule(5.0, 2, 50.0))
+        self.assertIs(parse_schedule(""), DEFAULT_SCHEDULE)
+        for text in ("every=0", "priority=high", "budget=-1", "often=1", "every"):
+            with self.assertRaises(ValueError, msg=text):
+                parse_schedule(text)
+
+    def test_periods_and_priorities(self):
+        """Test targets come due on their own period and the higher priority one runs first"""
+        scheduler = Scheduler(interval=1.0)
+        urgent = scheduler.add('image', 'close.png', TargetSchedule(period=0.5, priority=5))
+        slow = scheduler.add('text', 'Update available', TargetSchedule(period=10))
+        default = scheduler.add('text', 'OK')
+
+        self.assertEqual(scheduler.plan(0.0), [urgent, slow, default])
+        for entry in (urgent, slow, default):
+            scheduler.record(entry, 0.01, 0.0)
+
+        self.assertEqual(scheduler.plan(0.6), [urgent])
+        self.assertEqual(scheduler.plan(1.0), [urgent, default])
+        self.assertEqual(scheduler.next_due(), 0.5)
+
+    def test_budget_stretches_expensive_targets(self):
+        """Test a target costing more than its budget allows is checked less often"""
+        scheduler = Scheduler(interval=1.0)
+        ocr = scheduler.add('text', 'Total', TargetSchedule(period=1.0, budget=100))
+
+        scheduler.record(ocr, 0.4, 0.0)  # 400 ms per check at 100 ms/s: every 4 s
+
+        self.assertEqual(ocr.due, 4.0)
+
+    def test_cycle_budget_defers_and_ages(self):
+        """Test only what fits the cycle budget runs and deferred targets catch up"""
+        scheduler = Scheduler(interval=1.0, cycle_budget=0.1)
+        cheap = scheduler.add('image', 'ok.png', TargetSchedule(priority=1))
+        heavy = scheduler.add('text', 'Error')
+        for entry, cost in ((cheap, 0.02), (heavy, 0.3)):
+            scheduler.record(entry, cost, 0.0)
+
+        self.assertEqual(scheduler.plan(1.0), [cheap])  # The heavy check does not fit after the cheap one
+        self.assertEqual(heavy.deferred, 1)
+        scheduler.record(cheap, 0.02, 1.0)
+        self.assertEqual(scheduler.plan(2.0), [cheap])  # One period overdue ties with priority 1
+        scheduler.record(cheap, 0.02, 2.0)
+        self.assertEqual(scheduler.plan(3.0), [heavy])  # Two periods overdue it outranks priority 1
+        self.assertEqual((heavy.deferred, cheap.deferred), (2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
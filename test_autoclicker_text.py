@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker text matching
+"""
+
+import unittest
+import random
+import os
+import sys
+
+# Add the current directory to the path so we can import autoclicker_text
+sys.path.insert(0, os.path.dirname(__file__))
+
+from autoclicker_text import myers_search, group_lines, find_phrase
+
+def edit_search(pattern, text):
+    """Reference dynamic programming search: (fewest edits, earliest end) of pattern anywhere in text"""
+    previous = list(range(len(pattern) + 1))
+    best = None
+    for j, char in enumerate(text):
+        current = [0]
+        for i in range(1, len(pattern) + 1):
+            current.append(min(previous[i] + 1, current[i - 1] + 1, previous[i - 1] + (pattern[i - 1] != char)))
+        previous = current
+        if best is None or current[-1] < best[0]:
+            best = (current[-1], j)
+    return best
+
+
+def words(*rows):
+    """Build image_to_data columns from (text, left, top, width, height, block, par, line) rows"""
+    data = {key: [] for key in ('text', 'left', 'top', 'width', 'height', 'block_num', 'par_num', 'line_num')}
+    for row in rows:
+        for key, value in zip(data, row):
+            data[key].append(value)
+    return data
+
+
+class TestTextMatching(unittest.TestCase):
+    """Test cases for phrase grouping and bounded edit-distance matching"""
+
+    def test_myers_matches_dynamic_programming(self):
+        """Test the bit-parallel search agrees with the reference on random strings"""
+        rng = random.Random(7)
+        for _ in range(500):
+            pattern = ''.join(rng.choice('abc ') for _ in range(rng.randint(1, 80)))
+            text = ''.join(rng.choice('abc ') for _ in range(rng.randint(1, 100)))
+            self.assertEqual(myers_search(pattern, text, len(pattern)), edit_search(pattern, text))
+
+    def test_myers_respects_bound(self):
+        """Test occurrences needing more edits than allowed are not reported"""
+        self.assertEqual(myers_search("submit", "please subnit now", 1), (1, 12))
+        self.assertIsNone(myers_search("submit", "please sbnut now", 1))
+
+    def test_group_lines_uses_tesseract_numbers(self):
+        """Test words are joined by line number and split across lines and large gaps"""
+        data = words(("Save", 10, 10, 40, 20, 1, 1, 1), ("changes", 60, 12, 70, 20, 1, 1, 1),
+                     ("Close", 10, 40, 50, 20, 1, 1, 2), ("Help", 600, 10, 40, 20, 1, 1, 1), ("", 0, 0, 900, 90, 0, 0, 0))
+
+        lines = [[word[4] for word in line] for line in group_lines(data)]
+
+        self.assertEqual(lines, [['Save', 'changes'], ['Help'], ['Close']])
+
+    def test_phrase_spans_words(self):
+        """Test a phrase matches across words and returns their combined box"""
+        data = words(("Save", 10, 10, 40, 20, 1, 1, 1), ("changes", 60, 12, 70, 20, 1, 1, 1))
+
+        self.assertEqual(find_phrase(data, "save  Changes"), (10, 10, 120, 22, 0))
+        self.assertEqual(find_phrase(data, "changes"), (60, 12, 70, 20, 0))
+        self.assertIsNone(find_phrase(data, "Discard changes"))
+
+    def test_fuzzy_phrase(self):
+        """Test misread characters are tolerated within the bound, never for short targets"""
+        data = words(("Save", 10, 10, 40, 20, 1, 1, 1), ("chanqes", 60, 12, 70, 20, 1, 1, 1), ("0K", 200, 10, 30, 20, 1, 1, 1))
+
+        self.assertIsNone(find_phrase(data, "Save changes"))
+        self.assertEqual(find_phrase(data, "Save changes", max_errors=1), (10, 10, 120, 22, 1))
+        self.assertEqual(find_phrase(data, "changes", max_errors=1), (60, 12, 70, 20, 1))
+        self.assertIsNone(find_phrase(data, "OK", max_errors=1))  # Two characters allow no errors
+
+    def test_exact_match_preferred(self):
+        """Test an exact occurrence wins over an earlier approximate one"""
+        data = words(("Submlt", 10, 10, 60, 20, 1, 1, 1), ("Submit", 10, 100, 60, 20, 2, 1, 1))
+
+        self.assertEqual(find_phrase(data, "Submit", max_errors=1)[:2], (10, 100))
+
+    def test_words_without_line_numbers(self):
+        """Test results without Tesseract layout columns are grouped by position"""
+        data = {'text': ['Save', 'changes'], 'left': [10, 60], 'top': [10, 10], 'width': [40, 70], 'height': [20, 20]}
+
+        self.assertEqual(find_phrase(data, "Save changes"), (10, 10, 120, 20, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
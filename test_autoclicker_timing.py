@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker pattern timing
+"""
+
+import unittest
+import os
+import sys
+import time
+
+# Add the current directory to the path so we can import autoclicker_timing
+sys.path.insert(0, os.path.dirname(__file__))
+
+from autoclicker_timing import DeadlineTimer, TimingHistogram, realtime
+
+class TestTiming(unittest.TestCase):
+    """Test cases for the deadline timer, timing histograms and real-time settings"""
+
+    def test_deadline_timer_is_precise(self):
+        """Test deadlines are met within a fraction of a millisecond by spinning"""
+        timer = DeadlineTimer()
+        timer.start()
+        errors = [timer.wait_until(offset * 3_000_000) for offset in range(1, 11)]
+
+        self.assertTrue(all(error >= 0 for error in errors))
+        self.assertLess(sorted(errors)[len(errors) // 2], 1_000_000)  # Median under 1 ms
+        self.assertGreaterEqual(time.perf_counter_ns() - timer.origin, 30_000_000)
+
+    def test_late_deadline_returns_lateness(self):
+        """Test a deadline already passed returns at once with how late it is"""
+        timer = DeadlineTimer()
+        timer.start()
+        timer.origin -= 5_000_000
+
+        self.assertGreaterEqual(timer.wait_until(0), 5_000_000)
+
+    def test_histogram(self):
+        """Test errors land in their buckets and summaries are computed"""
+        histogram = TimingHistogram()
+        for error_us in (5, 8, 40, 700, 20000):
+            histogram.add(error_us * 1000)
+
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.format(), "<=10us:2 <=50us:1 <=1000us:1 >10000us:1")
+        self.assertAlmostEqual(histogram.mean_us, 4150.6)
+        self.assertEqual(histogram.percentile_us(50), 50.0)
+        self.assertEqual(histogram.percentile_us(99), 20000.0)
+
+    def test_realtime_reports_refused_settings(self):
+        """Test settings the system refuses are logged and skipped"""
+        messages = []
+        with realtime(cpu=10**6, logger=messages.append):
+            pass
+
+        self.assertEqual(len(messages), 1)
+        self.assertIn("CPU", messages[0])
+
+    @unittest.skipUnless(hasattr(os, 'sched_getaffinity'), "CPU affinity not supported")
+    def test_realtime_restores_affinity(self):
+        """Test the thread's CPU set is restored afterwards"""
+        before = os.sched_getaffinity(0)
+        cpu = min(before)
+        with realtime(cpu=cpu):
+            self.assertEqual(os.sched_getaffinity(0), {cpu})
+        self.assertEqual(os.sched_getaffinity(0), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutoClicker workflow compiling
+"""
+
+import unittest
+import tempfile
+import json
+import os
+import sys
+
+# Add the current directory to the path so we can import autoclicker_workflow
+sys.path.insert(0, os.path.dirname(__file__))
+
+from autoclicker_workflow import compile_workflow, load_workflow
+
+INSTALLER = {
+    'name': 'Installer',
+    'states': {
+        'welcome': {'rules': [{'image': 'next.png', 'goto': 'license'}]},
+        'license': {
+            'rules': [{'text': 'I accept', 'steps': [{'click': [0, 40]}], 'click': False, 'goto': 'install'},
+                      {'text': 'Error', 'goto': 'failed'}],
+            'timeout': 30, 'on_timeout': 'failed'
+        },
+        'install': {'timeout': 5, 'on_timeout': 'done'},
+        'done': {},
+        'failed': {}
+    }
+}
+
+class TestWorkflows(unittest.TestCase):
+    """Test cases for workflow validation and compilation"""
+
+    def test_compile_states_and_rules(self):
+        """Test states keep their own targets, relative steps and transitions"""
+        workflow = compile_workflow(INSTALLER, base_dir='/flows')
+
+        self.assertEqual(workflow.start, 'welcome')
+        license = workflow.states['license']
+        self.assertEqual(license.targets, [('text', 'I accept'), ('text', 'Error')])
+        self.assertEqual((license.timeout, license.on_timeout), (30, 'failed'))
+        self.assertFalse(license.rules[0].click)
+        self.assertEqual(license.rules[0].pattern.resolve((100, 100)).actions[0].value, (100, 140))
+        self.assertEqual(workflow.states['welcome'].targets, [('image', '/flows/next.png')])
+        self.assertEqual([name for name, state in workflow.states.items() if state.final], ['done', 'failed'])
+
+    def test_validation_errors_name_the_state(self):
+        """Test invalid workflows are rejected with the offending state or rule"""
+        invalid = [
+            ({'states': {'a': {'rules': [{'text': 'OK', 'goto': 'b'}]}}}, "State 'a': unknown state 'b'"),
+            ({'states': {'a': {'rules': [{'text': 'OK', 'image': 'ok.png'}]}}}, "State 'a' rule 1: needs exactly one"),
+            ({'states': {'a': {'timeout': 5}}}, "timeout and on_timeout go together"),
+            ({'states': {'a': {'timeout': 0, 'on_timeout': 'a'}}}, "timeout must be a positive"),
+            ({'states': {'a': {'rules': [{'text': 'OK', 'steps': [{'click': [1]}]}]}}}, "rule 1: Step 1: position"),
+            ({'states': {'a': {}}, 'start': 'b'}, "Unknown start state"),
+            ({'states': {}}, "non-empty mapping")
+        ]
+        for definition, message in invalid:
+            with self.assertRaisesRegex(ValueError, message):
+                compile_workflow(definition)
+
+    def test_load_workflow_file(self):
+        """Test workflows load from files with image paths relative to the file"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'installer.json')
+            with open(path, 'w') as f:
+                json.dump(INSTALLER, f)
+            workflow = load_workflow(path)
+
+        self.assertEqual(workflow.states['welcome'].rules[0].target, os.path.join(directory, 'next.png'))
+
+
+if __name__ == '__main__':
+    unittest.main()